@@ -0,0 +1,156 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from random import Random, seed
+from timeit import Timer
+from lab1_genetic_algorithm import (DEFAULT_PARAMETERS, Board, Point, Population, evolve, pathfinding,
+                                    produce_offspring, read_config)
+
+
+def synthetic_board(width: int, height: int, net_count: int, style: str = 'random', board_seed: int = 0):
+    # 'random' - nets between random distinct points, 'bus' - zad3-like rows of two overlapping nets
+    rng = Random(board_seed)
+    if (style == 'random'):
+        if (2 * net_count > width * height):
+            raise ValueError('Board is too small for the given number of nets')
+        cells = rng.sample(range(width * height), 2 * net_count)
+        points = [Point(cell % width, cell // width) for cell in cells]
+        return Board(width, height, [(points[2 * i], points[2 * i + 1]) for i in range(net_count)])
+    if (style == 'bus'):
+        row_count = (net_count + 1) // 2
+        spacing = (height - 2) // (row_count + 1)
+        if (spacing < 1 or width < 8):
+            raise ValueError('Board is too small for the given number of nets')
+        pairs = []
+        for net in range(net_count):
+            y = (net // 2 + 1) * spacing
+            if (net % 2 == 0):
+                pairs.append((Point(width // 16, y), Point(width * 10 // 16, y)))
+            else:
+                pairs.append((Point(width * 5 // 16, y), Point(width * 15 // 16, y)))
+        return Board(width, height, pairs)
+    raise ValueError(f'Unknown board style: {style}')
+
+
+BOARDS = {'zad0': lambda: read_config(0),
+          'zad1': lambda: read_config(1),
+          'zad2': lambda: read_config(2),
+          'zad3': lambda: read_config(3),
+          'random-32x32-20': lambda: synthetic_board(32, 32, 20),
+          'random-64x64-50': lambda: synthetic_board(64, 64, 50),
+          'bus-64x64-50': lambda: synthetic_board(64, 64, 50, 'bus')}
+
+
+def hot_paths(board: Board, population: Population):
+    # name -> callable doing one operation, mutations work on copies so the population stays unchanged
+    rng = Random(0)
+    solutions = population.solutions
+
+    def pick():
+        return solutions[rng.randrange(len(solutions))]
+
+    def route():
+        start_point, end_point = board.point_pairs[rng.randrange(len(board.point_pairs))]
+        pathfinding(start_point, end_point, board)
+
+    def generation():
+        # one whole generation of evolve (offspring, replacement, best solution) from a copy of the
+        # population, so every call starts from the same state; copying is included in the time
+        for _ in evolve(board, population_size=len(solutions), iteration_count=1, initial_population=population.copy(),
+                        **DEFAULT_PARAMETERS):
+            pass
+
+    return {'pathfinding': route,
+            'calculate_fitness': lambda: pick().calculate_fitness(1, 20, 1000),
+            'copy': lambda: pick().copy(),
+            'mutate_shift': lambda: pick().copy().mutate_shift(board, only_shift=True),
+            'mutate_reroll': lambda: pick().copy().mutate_reroll(board),
+            'crossover_with_random_genes': lambda: pick().crossover_with_random_genes(pick()),
+            'crossover_with_even_genes_distribution': lambda: pick().crossover_with_even_genes_distribution(pick()),
+            'selection_roulette': population.selection_roulette,
+            'selection_tournament': lambda: population.selection_tournament(4),
+            'produce_offspring': lambda: produce_offspring(population, board, len(solutions), **DEFAULT_PARAMETERS),
+            'generation': generation}
+
+
+def measure(function, repeat: int = 5):
+    # best time of one call in seconds, number of calls per repeat calibrated like timeit's command line
+    timer = Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run_benchmarks(board_names: list = None, population_size: int = 100, repeat: int = 5, verbose: bool = True):
+    results = {}
+    for board_name in board_names or BOARDS:
+        board = BOARDS[board_name]()
+        seed(0)
+        population = Population(population_size)
+        population.initialize(board)
+        results[board_name] = {}
+        for name, function in hot_paths(board, population).items():
+            seed(1)
+            results[board_name][name] = measure(function, repeat)
+            if (verbose):
+                print(f'{board_name:>16} {name:>40} {results[board_name][name] * 1e6:12.1f} us')
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict, threshold: float):
+    # returns (board, benchmark, baseline time, current time) of every benchmark slower than threshold allows
+    regressions = []
+    print(f"{'board':>16} {'benchmark':>40} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for board_name, benchmarks in current.items():
+        for name, current_time in benchmarks.items():
+            baseline_time = baseline.get(board_name, {}).get(name)
+            if (baseline_time is None):
+                continue
+            ratio = current_time / baseline_time
+            flag = ''
+            if (ratio > 1 + threshold):
+                regressions.append((board_name, name, baseline_time, current_time))
+                flag = ' REGRESSION'
+            print(f'{board_name:>16} {name:>40} {baseline_time * 1e6:10.1f}us {current_time * 1e6:10.1f}us '
+                  f'{ratio:6.2f}x{flag}')
+    return regressions
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Time the hot paths of the genetic algorithm.')
+    parser.add_argument('--boards', nargs='+', choices=list(BOARDS), help='all boards by default')
+    parser.add_argument('--population-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='save the results as JSON')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON results of an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown against the baseline (0.25 = 25%%), exit code 1 above it')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    arguments = parse_arguments()
+    results = run_benchmarks(arguments.boards, arguments.population_size, arguments.repeat)
+    if (arguments.output):
+        with open(arguments.output, 'w') as file:
+            json.dump({'commit': git_commit(),
+                       'python': platform.python_version(),
+                       'machine': platform.machine(),
+                       'population_size': arguments.population_size,
+                       'results': results}, file, indent=2)
+    if (arguments.compare):
+        with open(arguments.compare) as file:
+            baseline = json.load(file)
+        if (baseline.get('population_size') != arguments.population_size):
+            print('Warning: baseline was measured with population size', baseline.get('population_size'))
+        if (compare(baseline['results'], results, arguments.threshold)):
+            sys.exit(1)
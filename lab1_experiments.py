@@ -0,0 +1,118 @@
+import argparse
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import mean, stdev
+from lab1_genetic_algorithm import genetic_algorithm, read_config
+import lab1_genetic_algorithm as ga
+
+
+# defaults of lab1_genetic_algorithm.main
+DEFAULT_PARAMETERS = {**ga.DEFAULT_PARAMETERS, 'population_size': ga.DEFAULT_POPULATION_SIZE,
+                      'iteration_count': ga.DEFAULT_ITERATION_COUNT}
+
+RECORD_FIELDS = ['seed', 'best', 'survived', 'time', 'generations', 'time_per_generation']
+
+
+def run_once(task_number: int, parameters: dict, random_seed: int):
+    board = read_config(task_number)
+    start = time.perf_counter()
+    best_solution, population = genetic_algorithm(board, **parameters, random_seed=random_seed,
+                                                  verbose=False, return_population=True)
+    run_time = time.perf_counter() - start
+    generations = parameters['iteration_count']
+    # survivability - the best solution found is still present in the last population
+    survived = any(solution.fitness == best_solution.fitness and solution == best_solution
+                   for solution in population)
+    return {'seed': random_seed,
+            'best': best_solution.fitness,
+            'survived': survived,
+            'time': run_time,
+            'generations': generations,
+            'time_per_generation': run_time / generations if generations else 0}
+
+
+def run_experiment(task_number: int = 1, parameters: dict = None, seeds=range(10), workers: int = None):
+    # every seed is one headless run, runs are spread over a process pool
+    parameters = {**DEFAULT_PARAMETERS, **(parameters or {})}
+    seeds = list(seeds)
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(run_once, [task_number] * len(seeds), [parameters] * len(seeds), seeds))
+
+
+def summarize(records: list):
+    fitness = [record['best'] for record in records]
+    return {'Best': min(fitness),
+            'Worst': max(fitness),
+            'Average': mean(fitness),
+            'Standard deviation': stdev(fitness) if len(fitness) > 1 else 0,
+            'Survivability': sum(record['survived'] for record in records) / len(records),
+            'Time': mean(record['time'] for record in records),
+            'Time per generation': mean(record['time_per_generation'] for record in records)}
+
+
+def markdown_row(label, summary: dict):
+    # same columns as the tables in readme.md
+    return (f"|{label}|{summary['Best']:.0f}|{summary['Worst']:.0f}|{summary['Average']:.0f}"
+            f"|{summary['Standard deviation']:.0f}|{summary['Survivability']:.0%}|")
+
+
+def write_csv(path: str, records: list):
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, RECORD_FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def write_json(path: str, task_number: int, parameters: dict, records: list, summary: dict):
+    with open(path, 'w') as file:
+        json.dump({'task': task_number,
+                   'parameters': {**DEFAULT_PARAMETERS, **parameters},
+                   'runs': records,
+                   'summary': summary}, file, indent=2)
+
+
+def parse_value(value: str):
+    if (value in ('True', 'False')):
+        return value == 'True'
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Run the genetic algorithm for several seeds and '
+                                                 'aggregate the results.')
+    parser.add_argument('--task', type=int, default=1, help='number of lab1_test_problems/zad<N>.txt')
+    parser.add_argument('--runs', type=int, default=10, help='number of seeds (0 .. runs - 1)')
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help='process count, all cores by default')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                        help='genetic_algorithm parameter, e.g. --set tournament_size=6')
+    parser.add_argument('--label', default='', help='first column of the printed table row')
+    parser.add_argument('--csv', help='write one line per run to this file')
+    parser.add_argument('--json', help='write runs and summary to this file')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    arguments = parse_arguments()
+    parameters = {}
+    for assignment in arguments.set:
+        name, value = assignment.split('=', 1)
+        if (name not in DEFAULT_PARAMETERS):
+            raise SystemExit(f'Unknown parameter: {name}')
+        parameters[name] = parse_value(value)
+    seeds = range(arguments.first_seed, arguments.first_seed + arguments.runs)
+    records = run_experiment(arguments.task, parameters, seeds, arguments.workers)
+    summary = summarize(records)
+    print('|Parameters|Best|Worst|Average|Standard deviation|Survivability|')
+    print('|---------:|:--:|:---:|:-----:|:----------------:|:-----------:|')
+    print(markdown_row(arguments.label or ' '.join(arguments.set) or 'default', summary))
+    print(f"Time per run: {summary['Time']:.2f}s, per generation: {summary['Time per generation'] * 1000:.1f}ms")
+    if (arguments.csv):
+        write_csv(arguments.csv, records)
+    if (arguments.json):
+        write_json(arguments.json, arguments.task, parameters, records, summary)
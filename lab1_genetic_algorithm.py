@@ -1,9 +1,17 @@
-import tkinter as tk
-from random import randint, random, randrange, uniform
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+import os
+import pickle
+from itertools import accumulate
+from random import Random, getstate, randint, random, randrange, seed, setstate, shuffle, uniform
+import struct
+import sys
 import time
-import pytest
-from copy import deepcopy
-from statistics import mean, stdev
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class Point:
@@ -47,211 +55,281 @@ class Segment:
         return self.start_point == other.start_point and self.end_point == other.end_point
 
 
-def pathfinding(start_point: Point, end_point: Point, board: Board,
-                direction_probability: float = 0.65, given_segments: list = None, cap: int = 13):
-    segments = given_segments if given_segments else []
-    segments_count = len(segments)
+def route(start_point: Point, end_point: Point, board: Board,
+          direction_probability: float = 0.65, vertices=None, cap: int = 13):
+    # vertices is a flat [x1, y1, x2, y2, ...] sequence (list or array) of already routed points,
+    # extended in place
+    vertices = [] if vertices is None else vertices
+    if (len(vertices) == 0):
+        vertices.extend((start_point.x, start_point.y))
+    end_x, end_y = end_point.x, end_point.y
+    segments_count = len(vertices) // 2 - 1
     total_length = 0
     last_horizontal = None
-    for segment in segments:
-        if (segment.start_point.x == segment.end_point.x):
-            total_length += abs(segment.start_point.y - segment.end_point.y)
+    for i in range(0, 2 * segments_count, 2):
+        if (vertices[i] == vertices[i + 2]):
+            total_length += abs(vertices[i + 1] - vertices[i + 3])
             last_horizontal = False
         else:
-            total_length += abs(segment.start_point.x - segment.end_point.x)
+            total_length += abs(vertices[i] - vertices[i + 2])
             last_horizontal = True
-    while (segments_count == 0 or segments[segments_count - 1].end_point != end_point):
-        current_start = start_point if segments_count == 0 else segments[segments_count - 1].end_point
+    while (segments_count == 0 or vertices[-2] != end_x or vertices[-1] != end_y):
+        start_x, start_y = vertices[-2], vertices[-1]
         axis_choice = random()
         direction_choice = random()
         if (segments_count >= cap):
-            if (last_horizontal and current_start.y != end_point.y):
-                current_end = Point(current_start.x, end_point.y)
-                segment_length = abs(current_start.y - end_point.y)
+            if (last_horizontal and start_y != end_y):
+                current_end = (start_x, end_y)
+                segment_length = abs(start_y - end_y)
                 last_horizontal = False
-            elif (not last_horizontal and current_start.x != end_point.x):
-                current_end = Point(end_point.x, current_start.y)
-                segment_length = abs(current_start.x - end_point.x)
+            elif (not last_horizontal and start_x != end_x):
+                current_end = (end_x, start_y)
+                segment_length = abs(start_x - end_x)
                 last_horizontal = True
             else:
                 # current start is actually treated as endpoint of previous segment
-                previous_start = segments[segments_count - 1].start_point
+                previous_x, previous_y = vertices[-4], vertices[-3]
                 if (last_horizontal):
-                    total_length -= abs(previous_start.x - current_start.x)
-                    current_start.x = end_point.x
-                    total_length += abs(previous_start.x - current_start.x)
+                    total_length -= abs(previous_x - start_x)
+                    vertices[-2] = end_x
+                    total_length += abs(previous_x - end_x)
                 else:
-                    total_length -= abs(previous_start.y - current_start.y)
-                    current_start.y = end_point.y
-                    total_length += abs(previous_start.y - current_start.y)
-                return segments, total_length
+                    total_length -= abs(previous_y - start_y)
+                    vertices[-1] = end_y
+                    total_length += abs(previous_y - end_y)
+                return vertices, total_length
 
         elif (segments_count == 0):
             if (direction_choice < direction_probability):
-                orientation_x = end_point.x - current_start.x
-                orientation_y = end_point.y - current_start.y
+                orientation_x = end_x - start_x
+                orientation_y = end_y - start_y
                 if (orientation_x != 0 and orientation_y != 0):
                     if (axis_choice < 0.5):
                         # X axis
                         if (orientation_x > 0):
                             # Right
-                            distance_to_edge = (board.width - 1) - current_start.x
+                            distance_to_edge = (board.width - 1) - start_x
                             segment_length = randrange(1, distance_to_edge + 1)
-                            current_end = Point(current_start.x + segment_length, current_start.y)
+                            current_end = (start_x + segment_length, start_y)
                         else:
                             # Left
-                            distance_to_edge = current_start.x
+                            distance_to_edge = start_x
                             segment_length = randrange(1, distance_to_edge + 1)
-                            current_end = Point(current_start.x - segment_length, current_start.y)
+                            current_end = (start_x - segment_length, start_y)
                         last_horizontal = True
                     else:
                         # Y axis
                         if (orientation_y > 0):
                             # Down
-                            distance_to_edge = (board.height - 1) - current_start.y
+                            distance_to_edge = (board.height - 1) - start_y
                             segment_length = randrange(1, distance_to_edge + 1)
-                            current_end = Point(current_start.x, current_start.y + segment_length)
+                            current_end = (start_x, start_y + segment_length)
                         else:
                             # Up
-                            distance_to_edge = current_start.y
+                            distance_to_edge = start_y
                             segment_length = randrange(1, distance_to_edge + 1)
-                            current_end = Point(current_start.x, current_start.y - segment_length)
+                            current_end = (start_x, start_y - segment_length)
                         last_horizontal = False
                 elif (orientation_x == 0):
                     # Y axis
-                    distance_to_end = abs(end_point.y - current_start.y)
+                    distance_to_end = abs(end_y - start_y)
                     segment_length = randrange(1, distance_to_end + 1)
                     if (orientation_y > 0):
                         # Down
-                        current_end = Point(current_start.x, current_start.y + segment_length)
+                        current_end = (start_x, start_y + segment_length)
                     else:
                         # Up
-                        current_end = Point(current_start.x, current_start.y - segment_length)
+                        current_end = (start_x, start_y - segment_length)
                     last_horizontal = False
                 else:
                     # X axis
-                    distance_to_end = abs(end_point.x - current_start.x)
+                    distance_to_end = abs(end_x - start_x)
                     segment_length = randrange(1, distance_to_end + 1)
                     if (orientation_x > 0):
                         # Right
-                        current_end = Point(current_start.x + segment_length, current_start.y)
+                        current_end = (start_x + segment_length, start_y)
                     else:
                         # Left
-                        current_end = Point(current_start.x - segment_length, current_start.y)
+                        current_end = (start_x - segment_length, start_y)
                     last_horizontal = True
             else:
-                if ((axis_choice < 0.25 and current_start.x != board.width - 1) or
-                        (axis_choice < 0.5 and current_start.x == 0)):
+                if ((axis_choice < 0.25 and start_x != board.width - 1) or
+                        (axis_choice < 0.5 and start_x == 0)):
                     # X axis right
-                    distance_to_edge = (board.width - 1) - current_start.x
+                    distance_to_edge = (board.width - 1) - start_x
                     segment_length = randrange(1, distance_to_edge + 1)
-                    current_end = Point(current_start.x + segment_length, current_start.y)
+                    current_end = (start_x + segment_length, start_y)
                     last_horizontal = True
-                elif (axis_choice < 0.5 and (current_start.x != 0 or current_start.x == board.width - 1)):
+                elif (axis_choice < 0.5 and (start_x != 0 or start_x == board.width - 1)):
                     # X axis left
-                    distance_to_edge = current_start.x
+                    distance_to_edge = start_x
                     segment_length = randrange(1, distance_to_edge + 1)
-                    current_end = Point(current_start.x - segment_length, current_start.y)
+                    current_end = (start_x - segment_length, start_y)
                     last_horizontal = True
-                elif ((axis_choice < 0.75 and current_start.y != board.height - 1) or current_start.y == 0):
+                elif ((axis_choice < 0.75 and start_y != board.height - 1) or start_y == 0):
                     # Y axis down
-                    distance_to_edge = (board.height - 1) - current_start.y
+                    distance_to_edge = (board.height - 1) - start_y
                     segment_length = randrange(1, distance_to_edge + 1)
-                    current_end = Point(current_start.x, current_start.y + segment_length)
+                    current_end = (start_x, start_y + segment_length)
                     last_horizontal = False
                 else:
                     # Y axis up
-                    distance_to_edge = current_start.y
+                    distance_to_edge = start_y
                     segment_length = randrange(1, distance_to_edge + 1)
-                    current_end = Point(current_start.x, current_start.y - segment_length)
+                    current_end = (start_x, start_y - segment_length)
                     last_horizontal = False
         else:
             if (direction_choice < direction_probability):
-                orientation_x = end_point.x - current_start.x
-                orientation_y = end_point.y - current_start.y
+                orientation_x = end_x - start_x
+                orientation_y = end_y - start_y
                 if (last_horizontal):
                     # Y axis
                     if (orientation_x == 0):
-                        distance_to_end = abs(end_point.y - current_start.y)
+                        distance_to_end = abs(end_y - start_y)
                         segment_length = randrange(1, distance_to_end + 1)
                         if (orientation_y > 0):
                             # Down
-                            current_end = Point(current_start.x, current_start.y + segment_length)
+                            current_end = (start_x, start_y + segment_length)
                         else:
                             # Up
-                            current_end = Point(current_start.x, current_start.y - segment_length)
+                            current_end = (start_x, start_y - segment_length)
                     elif (orientation_y > 0
-                            or (orientation_y == 0 and axis_choice < 0.5 and current_start.y != board.height - 1)
-                            or current_start.y == 0):
+                            or (orientation_y == 0 and axis_choice < 0.5 and start_y != board.height - 1)
+                            or start_y == 0):
                         # Down
-                        distance_to_edge = (board.height - 1) - current_start.y
+                        distance_to_edge = (board.height - 1) - start_y
                         segment_length = randrange(1, distance_to_edge + 1)
-                        current_end = Point(current_start.x, current_start.y + segment_length)
+                        current_end = (start_x, start_y + segment_length)
                     else:
                         # Up
-                        distance_to_edge = current_start.y
+                        distance_to_edge = start_y
                         segment_length = randrange(1, distance_to_edge + 1)
-                        current_end = Point(current_start.x, current_start.y - segment_length)
+                        current_end = (start_x, start_y - segment_length)
                     last_horizontal = False
                 else:
                     # X axis
                     if (orientation_y == 0):
-                        distance_to_end = abs(end_point.x - current_start.x)
+                        distance_to_end = abs(end_x - start_x)
                         segment_length = randrange(1, distance_to_end + 1)
                         if (orientation_x > 0):
                             # Right
-                            current_end = Point(current_start.x + segment_length, current_start.y)
+                            current_end = (start_x + segment_length, start_y)
                         else:
                             # Left
-                            current_end = Point(current_start.x - segment_length, current_start.y)
+                            current_end = (start_x - segment_length, start_y)
                     elif (orientation_x > 0
-                            or (orientation_x == 0 and axis_choice < 0.5 and current_start.x != board.width - 1)
-                            or current_start.x == 0):
+                            or (orientation_x == 0 and axis_choice < 0.5 and start_x != board.width - 1)
+                            or start_x == 0):
                         # Right
-                        distance_to_edge = (board.width - 1) - current_start.x
+                        distance_to_edge = (board.width - 1) - start_x
                         segment_length = randrange(1, distance_to_edge + 1)
-                        current_end = Point(current_start.x + segment_length, current_start.y)
+                        current_end = (start_x + segment_length, start_y)
                     else:
                         # Left
-                        distance_to_edge = current_start.x
+                        distance_to_edge = start_x
                         segment_length = randrange(1, distance_to_edge + 1)
-                        current_end = Point(current_start.x - segment_length, current_start.y)
+                        current_end = (start_x - segment_length, start_y)
                     last_horizontal = True
             else:
                 if (last_horizontal):
-                    if ((axis_choice < 0.5 and current_start.y != board.height - 1) or current_start.y == 0):
+                    if ((axis_choice < 0.5 and start_y != board.height - 1) or start_y == 0):
                         # Y axis down
-                        distance_to_edge = (board.height - 1) - current_start.y
+                        distance_to_edge = (board.height - 1) - start_y
                         segment_length = randrange(1, distance_to_edge + 1)
-                        current_end = Point(current_start.x, current_start.y + segment_length)
+                        current_end = (start_x, start_y + segment_length)
                     else:
                         # Y axis up
-                        distance_to_edge = current_start.y
+                        distance_to_edge = start_y
                         segment_length = randrange(1, distance_to_edge + 1)
-                        current_end = Point(current_start.x, current_start.y - segment_length)
+                        current_end = (start_x, start_y - segment_length)
                     last_horizontal = False
                 else:
-                    if ((axis_choice < 0.5 and current_start.x != board.width - 1) or current_start.x == 0):
+                    if ((axis_choice < 0.5 and start_x != board.width - 1) or start_x == 0):
                         # X axis down
-                        distance_to_edge = (board.width - 1) - current_start.x
+                        distance_to_edge = (board.width - 1) - start_x
                         segment_length = randrange(1, distance_to_edge + 1)
-                        current_end = Point(current_start.x + segment_length, current_start.y)
+                        current_end = (start_x + segment_length, start_y)
                     else:
                         # X axis left
-                        distance_to_edge = current_start.x
+                        distance_to_edge = start_x
                         segment_length = randrange(1, distance_to_edge + 1)
-                        current_end = Point(current_start.x - segment_length, current_start.y)
+                        current_end = (start_x - segment_length, start_y)
                     last_horizontal = True
-        segments.append(Segment(current_start, current_end))
+        vertices.extend(current_end)
         segments_count += 1
         total_length += segment_length
-    return segments, total_length
+    return vertices, total_length
+
+
+def vertices_to_segments(vertices) -> list:
+    # neighbouring segments share their Point objects, like the ones built by pathfinding
+    points = [Point(vertices[i], vertices[i + 1]) for i in range(0, len(vertices), 2)]
+    return [Segment(points[i], points[i + 1]) for i in range(len(points) - 1)]
+
+
+def segments_to_vertices(segments: list) -> list:
+    if (not segments):
+        return []
+    vertices = [segments[0].start_point.x, segments[0].start_point.y]
+    for segment in segments:
+        vertices.extend((segment.end_point.x, segment.end_point.y))
+    return vertices
+
+
+def pathfinding(start_point: Point, end_point: Point, board: Board,
+                direction_probability: float = 0.65, given_segments: list = None, cap: int = 13):
+    vertices, total_length = route(start_point, end_point, board, direction_probability,
+                                   segments_to_vertices(given_segments), cap)
+    return vertices_to_segments(vertices), total_length
+
+
+def shift_vertices(vertices, segment_i: int, shift_x: int, shift_y: int):
+    # Shifts one segment of a flat [x1, y1, x2, y2, ...] vertex sequence in place. Neighbouring segments
+    # which become points are removed and the remaining ones are merged if they are collinear.
+    def point(k):
+        return vertices[2 * k], vertices[2 * k + 1]
+
+    for k in (2 * segment_i, 2 * segment_i + 2):
+        vertices[k] += shift_x
+        vertices[k + 1] += shift_y
+    shifted_start = point(segment_i)
+    deletions = 0
+    if (point(segment_i - 1) == point(segment_i)):
+        if (segment_i - 3 >= 0 and point(segment_i + 1) == point(segment_i - 2)):
+            del vertices[2 * (segment_i - 2):2 * (segment_i + 2)]
+            deletions = 4
+        elif (segment_i - 2 >= 0 and point(segment_i + 1) == point(segment_i - 2)):
+            del vertices[2 * (segment_i - 1):2 * (segment_i + 2)]
+            deletions = 3
+        elif (segment_i - 2 >= 0):
+            shifted_start = point(segment_i - 2)
+            del vertices[2 * (segment_i - 1):2 * (segment_i + 1)]
+            deletions = 2
+        else:
+            del vertices[2 * (segment_i - 1):2 * segment_i]
+            deletions = 1
+
+    segment_i -= deletions
+    segments_count = len(vertices) // 2 - 1
+    if (point(segment_i + 1) == point(segment_i + 2)):
+        if (segment_i + 3 < segments_count and shifted_start == point(segment_i + 3)):
+            del vertices[2 * segment_i:2 * (segment_i + 4)]
+        elif (segment_i + 2 < segments_count and shifted_start == point(segment_i + 3)):
+            del vertices[2 * segment_i:2 * (segment_i + 3)]
+        elif (segment_i + 2 < segments_count):
+            del vertices[2 * (segment_i + 1):2 * (segment_i + 3)]
+        else:
+            del vertices[2 * (segment_i + 1):2 * (segment_i + 2)]
+    return vertices
 
 
 class Path:
+    # Paths are never modified after they are built (mutations create new ones), so solutions
+    # can share them freely.
     def __init__(self, segments: list = None):
         self.segments = segments
         self.length = None if segments is None else self.calculate_length()
+        self.key = None
 
     def create_random(self, start_point: Point, end_point: Point, board: Board, direction_probability: float = 0.75):
         segments, total_length = pathfinding(start_point, end_point, board, direction_probability)
@@ -267,103 +345,678 @@ class Path:
                 total_length += abs(segment.start_point.x - segment.end_point.x)
         return total_length
 
+    def coordinates(self):
+        return [(segment.start_point.x, segment.start_point.y, segment.end_point.x, segment.end_point.y)
+                for segment in self.segments]
+
+    @staticmethod
+    def from_vertices(vertices):
+        return Path(vertices_to_segments(vertices))
+
+    def to_vertices(self):
+        return segments_to_vertices(self.segments)
+
+    def shifted(self, segment_i: int, shift_x: int, shift_y: int):
+        return Path(vertices_to_segments(shift_vertices(self.to_vertices(), segment_i, shift_x, shift_y)))
+
+    def rerolled(self, mutation_start: int, board: Board):
+        start_point = self.segments[mutation_start].start_point
+        end_point = self.segments[len(self.segments) - 1].end_point
+        path = Path()
+        path.segments, path.length = pathfinding(start_point, end_point, board,
+                                                 given_segments=self.segments[:mutation_start])
+        return path
+
     def __str__(self):
         segments = ''
         for segment in self.segments:
             segments += str(segment)
         return segments
 
+    def __len__(self):
+        return len(self.segments)
+
     def __iter__(self):
         for segment in self.segments:
             yield segment
 
+    def canonical(self):
+        # hashable vertex sequence, the same for Path and CompactPath encoding the same gene
+        if (self.key is None):
+            self.key = tuple(self.to_vertices())
+        return self.key
+
     def __eq__(self, other):
         if not isinstance(other, Path):
             return NotImplemented
         return self.segments == other.segments and self.length == other.length
 
+    def __hash__(self):
+        return hash(self.canonical())
+
+
+class CompactPath:
+    # Same gene as Path, stored as a flat int16 array of vertices [x1, y1, x2, y2, ...] instead of
+    # Segment and Point objects. Segments are only built on demand.
+    __slots__ = ('vertices', 'length', 'key')
+
+    def __init__(self, vertices=None):
+        self.vertices = None if vertices is None else array('h', vertices)
+        self.length = None if vertices is None else self.calculate_length()
+        self.key = None
+
+    @staticmethod
+    def from_path(path: Path):
+        return CompactPath(path.to_vertices())
+
+    @staticmethod
+    def from_vertices(vertices):
+        return CompactPath(vertices)
+
+    def create_random(self, start_point: Point, end_point: Point, board: Board, direction_probability: float = 0.75):
+        self.vertices, self.length = route(start_point, end_point, board, direction_probability, array('h'))
+
+    def calculate_length(self):
+        vertices = self.vertices
+        total_length = 0
+        for i in range(0, len(vertices) - 2, 2):
+            if (vertices[i] == vertices[i + 2]):
+                total_length += abs(vertices[i + 1] - vertices[i + 3])
+            else:
+                total_length += abs(vertices[i] - vertices[i + 2])
+        return total_length
+
+    @property
+    def segments(self):
+        return vertices_to_segments(self.vertices)
+
+    def coordinates(self):
+        vertices = self.vertices
+        return [(vertices[i], vertices[i + 1], vertices[i + 2], vertices[i + 3])
+                for i in range(0, len(vertices) - 2, 2)]
+
+    def to_vertices(self):
+        return self.vertices.tolist()
+
+    def shifted(self, segment_i: int, shift_x: int, shift_y: int):
+        path = CompactPath()
+        path.vertices = shift_vertices(array('h', self.vertices), segment_i, shift_x, shift_y)
+        path.length = path.calculate_length()
+        return path
+
+    def rerolled(self, mutation_start: int, board: Board):
+        start_point = Point(self.vertices[2 * mutation_start], self.vertices[2 * mutation_start + 1])
+        end_point = Point(self.vertices[-2], self.vertices[-1])
+        path = CompactPath()
+        path.vertices, path.length = route(start_point, end_point, board,
+                                           vertices=self.vertices[:2 * mutation_start + 2])
+        return path
+
+    def __str__(self):
+        segments = ''
+        for segment in self.segments:
+            segments += str(segment)
+        return segments
+
+    def __len__(self):
+        return len(self.vertices) // 2 - 1
+
+    def __iter__(self):
+        for segment in self.segments:
+            yield segment
+
+    def canonical(self):
+        if (self.key is None):
+            self.key = tuple(self.vertices)
+        return self.key
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactPath):
+            return NotImplemented
+        return self.vertices == other.vertices
+
+    def __hash__(self):
+        return hash(self.canonical())
+
+
+def segment_intersection(S1: tuple, S2: tuple):
+    # segments are given as (x1, y1, x2, y2) coordinate tuples
+    Ax, Ay, Bx, By = S1
+    Cx, Cy, Dx, Dy = S2
+    if (Ax == Bx == Cx == Dx):
+        min1 = min(Ay, By)
+        max1 = max(Ay, By)
+
+        min2 = min(Cy, Dy)
+        max2 = max(Cy, Dy)
+
+        minIntersection = max(min1, min2)
+        maxIntersection = min(max1, max2)
+
+        if (minIntersection <= maxIntersection):
+            return abs(minIntersection - maxIntersection) + 1
+        else:
+            return 0
+    elif (Ay == By == Cy == Dy):
+        min1 = min(Ax, Bx)
+        max1 = max(Ax, Bx)
+
+        min2 = min(Cx, Dx)
+        max2 = max(Cx, Dx)
+
+        minIntersection = max(min1, min2)
+        maxIntersection = min(max1, max2)
+
+        if (minIntersection <= maxIntersection):
+            return abs(minIntersection - maxIntersection) + 1
+        else:
+            return 0
+    else:
+        dx0 = Bx - Ax
+        dx1 = Dx - Cx
+        dy0 = By - Ay
+        dy1 = Dy - Cy
+
+        p0 = dy1 * (Dx - Ax) - dx1 * (Dy - Ay)
+        p1 = dy1 * (Dx - Bx) - dx1 * (Dy - By)
+        p2 = dy0 * (Bx - Cx) - dx0 * (By - Cy)
+        p3 = dy0 * (Bx - Dx) - dx0 * (By - Dy)
+
+        return int((p0 * p1 <= 0) & (p2 * p3 <= 0))
+
+
+def empty_intersection_matrix(paths: list, path_ids: list, matrix: list):
+    # entries touching the given paths are zeroed, the rest of a given matrix is kept as it is
+    if (matrix is None):
+        return [[0] * len(paths) for _ in paths]
+    for path_id in path_ids:
+        for other_path_id in range(len(paths)):
+            matrix[path_id][other_path_id] = 0
+            matrix[other_path_id][path_id] = 0
+    return matrix
+
+
+def intersection_total(matrix: list):
+    return sum(sum(row[i:]) for i, row in enumerate(matrix))
+
+
+def pairwise_intersection_matrix(paths: list, path_ids: list = None, matrix: list = None):
+    path_ids = list(range(len(paths))) if path_ids is None else path_ids
+    matrix = empty_intersection_matrix(paths, path_ids, matrix)
+    coordinates = [path.coordinates() for path in paths]
+    recalculated = set()
+    for i in path_ids:
+        recalculated.add(i)
+        for j, segmentsB in enumerate(coordinates):
+            if (j in recalculated):
+                continue
+            intersections = 0
+            for segmentA in coordinates[i]:
+                for segmentB in segmentsB:
+                    intersections += segment_intersection(segmentA, segmentB)
+            matrix[i][j] = matrix[j][i] = intersections
+        for j, segmentA in enumerate(coordinates[i]):
+            for segmentB in coordinates[i][j+3:]:
+                matrix[i][i] += segment_intersection(segmentA, segmentB)
+    return matrix
+
+
+def pairwise_intersections(paths: list):
+    return intersection_total(pairwise_intersection_matrix(paths))
+
+
+class SegmentIndex:
+    # Horizontal segments are bucketed by row and vertical ones by column, so a query only
+    # visits segments lying on the rows/columns it covers. Degenerate (single point) segments
+    # do not fit either bucket and are compared one by one with segment_intersection.
+    def __init__(self):
+        self.horizontal = {}
+        self.vertical = {}
+        self.irregular = []
+        self.segments = []
+
+    def insert(self, segment: tuple, path_id: int, segment_id: int):
+        x1, y1, x2, y2 = segment
+        if (y1 == y2 and x1 != x2):
+            self.horizontal.setdefault(y1, []).append((min(x1, x2), max(x1, x2), path_id, segment_id))
+        elif (x1 == x2 and y1 != y2):
+            self.vertical.setdefault(x1, []).append((min(y1, y2), max(y1, y2), path_id, segment_id))
+        else:
+            self.irregular.append((segment, path_id, segment_id))
+        self.segments.append((segment, path_id, segment_id))
+
+    def query(self, segment: tuple):
+        # yields (path_id, segment_id, intersection count) for every indexed segment touching the given one
+        x1, y1, x2, y2 = segment
+        if (y1 == y2 and x1 != x2):
+            parallel, crossing, position = self.horizontal, self.vertical, y1
+            low, high = min(x1, x2), max(x1, x2)
+        elif (x1 == x2 and y1 != y2):
+            parallel, crossing, position = self.vertical, self.horizontal, x1
+            low, high = min(y1, y2), max(y1, y2)
+        else:
+            for other, path_id, segment_id in self.segments:
+                count = segment_intersection(segment, other)
+                if (count):
+                    yield path_id, segment_id, count
+            return
+
+        for other_low, other_high, path_id, segment_id in parallel.get(position, ()):
+            overlap = min(high, other_high) - max(low, other_low)
+            if (overlap >= 0):
+                yield path_id, segment_id, overlap + 1
+        if (len(crossing) < high - low + 1):
+            lines = [line for line in crossing if low <= line <= high]
+        else:
+            lines = [line for line in range(low, high + 1) if line in crossing]
+        for line in lines:
+            for other_low, other_high, path_id, segment_id in crossing[line]:
+                if (other_low <= position <= other_high):
+                    yield path_id, segment_id, 1
+        for other, path_id, segment_id in self.irregular:
+            count = segment_intersection(segment, other)
+            if (count):
+                yield path_id, segment_id, count
+
+
+def indexed_intersection_matrix(paths: list, path_ids: list = None, matrix: list = None):
+    # Only the rows of path_ids are (re)calculated: those paths are indexed first, then
+    # every other path is queried against them.
+    path_ids = list(range(len(paths))) if path_ids is None else path_ids
+    matrix = empty_intersection_matrix(paths, path_ids, matrix)
+    index = SegmentIndex()
+    for path_id in path_ids:
+        for segment_id, segment in enumerate(paths[path_id].coordinates()):
+            for other_path_id, other_segment_id, count in index.query(segment):
+                if (other_path_id != path_id):
+                    matrix[path_id][other_path_id] += count
+                    matrix[other_path_id][path_id] += count
+                # neighbouring segments of the same path always touch, so they are skipped
+                elif (segment_id - other_segment_id >= 3):
+                    matrix[path_id][path_id] += count
+            index.insert(segment, path_id, segment_id)
+    indexed = set(path_ids)
+    for path_id, path in enumerate(paths):
+        if (path_id in indexed):
+            continue
+        for segment in path.coordinates():
+            for other_path_id, _, count in index.query(segment):
+                matrix[path_id][other_path_id] += count
+                matrix[other_path_id][path_id] += count
+    return matrix
+
+
+def indexed_intersections(paths: list):
+    return intersection_total(indexed_intersection_matrix(paths))
+
+
+INTERSECTION_ENGINES = {
+    'pairwise': pairwise_intersection_matrix,
+    'indexed': indexed_intersection_matrix
+}
+
+
+def is_irregular(segment: tuple):
+    # single points (and anything not axis-aligned) are not rasterised by batch_fitness_components
+    x1, y1, x2, y2 = segment
+    return (x1 == x2) == (y1 == y2)
+
+
+def batch_fitness_components(solutions: list):
+    # Fitness components of many solutions at once: every path is rasterised into the cells its
+    # segments cover, so crossings and collinear overlaps between two paths are the cells both of them
+    # cover. Pairs of neighbouring segments within a path (which the fitness skips) are subtracted
+    # afterwards and irregular segments are counted one by one.
+    if (np is None):
+        raise ImportError('numpy is required for batch fitness evaluation')
+    vertices = []
+    vertex_counts = []
+    path_counts = []
+    for solution in solutions:
+        path_counts.append(len(solution.paths))
+        for path in solution:
+            # canonical() is kept by the path, so paths shared between solutions are converted once
+            path_vertices = path.canonical()
+            vertices.extend(path_vertices)
+            vertex_counts.append(len(path_vertices) // 2)
+    paths_per_solution = max(path_counts)
+    vertices = np.array(vertices, dtype=np.int64).reshape(-1, 2)
+    vertices -= vertices.min(axis=0)
+    width, height = (int(size) + 1 for size in vertices.max(axis=0))
+    vertex_counts = np.array(vertex_counts)
+    path_counts = np.array(path_counts)
+
+    solution_of_path = np.repeat(np.arange(len(solutions)), path_counts)
+    path_id = np.arange(len(vertex_counts)) - np.repeat(np.cumsum(path_counts) - path_counts, path_counts)
+    global_path_of_vertex = np.repeat(solution_of_path * paths_per_solution + path_id, vertex_counts)
+    segment_start = np.ones(len(vertices), dtype=bool)
+    segment_start[np.cumsum(vertex_counts) - 1] = False
+    path = global_path_of_vertex[segment_start]
+    solution_of_segment = path // paths_per_solution
+    x1, y1 = vertices[segment_start].T
+    x2, y2 = vertices[np.roll(segment_start, 1)].T
+    low_x, high_x = np.minimum(x1, x2), np.maximum(x1, x2)
+    low_y, high_y = np.minimum(y1, y2), np.maximum(y1, y2)
+    horizontal = (y1 == y2) & (x1 != x2)
+    vertical = (x1 == x2) & (y1 != y2)
+
+    total_lengths = np.bincount(solution_of_segment, np.where(x1 == x2, high_y - low_y, high_x - low_x),
+                                minlength=len(solutions))
+    segment_counts = np.bincount(solution_of_segment, minlength=len(solutions))
+
+    # horizontal segments are walked along a row and vertical ones along a column of cells (y * width + x)
+    regular = horizontal | vertical
+    first_cell = np.where(horizontal, y1 * width + low_x, low_y * width + x1)[regular]
+    lengths = np.where(horizontal, high_x - low_x + 1, high_y - low_y + 1)[regular]
+    steps = np.where(horizontal, 1, width)[regular]
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    cell_paths = np.repeat(path[regular], lengths)
+    cells = np.repeat(first_cell, lengths) + offsets * np.repeat(steps, lengths)
+
+    # two segments of one solution covering the same cell are a crossing or an overlap of their paths (on
+    # the diagonal when both belong to one path); cells covered once are dropped, the rest are grouped by
+    # sorting and the pairs within every group are enumerated, so the cost grows with the intersections
+    keys = (cell_paths // paths_per_solution) * (width * height) + cells
+    shared = np.bincount(keys)[keys] > 1
+    # int32 halves the memory traffic of the sort and the pair enumeration on any realistic board
+    index_type = np.int32 if len(solutions) * max(width * height, paths_per_solution ** 2) < 2 ** 31 else np.int64
+    keys = keys[shared].astype(index_type)
+    order = np.argsort(keys)
+    keys = keys[order]
+    cell_paths = cell_paths[shared][order].astype(index_type)
+    group_ends = np.append(np.flatnonzero(np.diff(keys)) + 1, len(keys))
+    partners = np.repeat(group_ends, np.diff(group_ends, prepend=0)) - np.arange(len(keys)) - 1
+    first = np.repeat(np.arange(len(keys)), partners)
+    second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(partners) - partners, partners)
+    first_path, second_path = cell_paths[first], cell_paths[second]
+    solution_base = (first_path // paths_per_solution) * paths_per_solution ** 2
+    first_path %= paths_per_solution
+    second_path %= paths_per_solution
+    different = first_path != second_path
+    pairs = np.concatenate([solution_base + first_path * paths_per_solution + second_path,
+                            (solution_base + second_path * paths_per_solution + first_path)[different]])
+    matrices = np.bincount(pairs, minlength=len(solutions) * paths_per_solution ** 2) \
+        .reshape(len(solutions), paths_per_solution, paths_per_solution)
+    diagonal = np.arange(paths_per_solution)
+
+    for distance in (1, 2):
+        neighbours = (path[:-distance] == path[distance:]) & regular[:-distance] & regular[distance:]
+        overlap_x = np.minimum(high_x[:-distance], high_x[distance:]) - np.maximum(low_x[:-distance], low_x[distance:]) + 1
+        overlap_y = np.minimum(high_y[:-distance], high_y[distance:]) - np.maximum(low_y[:-distance], low_y[distance:]) + 1
+        touching = np.clip(overlap_x, 0, None) * np.clip(overlap_y, 0, None) * neighbours
+        skipped = np.bincount(path[:-distance], touching, minlength=len(solutions) * paths_per_solution)
+        matrices[:, diagonal, diagonal] -= skipped.astype(np.int64).reshape(len(solutions), paths_per_solution)
+
+    matrices = [matrix[:count, :count].tolist() for matrix, count in zip(matrices, path_counts)]
+    for n in set(solution_of_segment[~regular].tolist()):
+        matrix = matrices[n]
+        coordinates = [path.coordinates() for path in solutions[n]]
+        for path_id, segments in enumerate(coordinates):
+            for segment_id, segment in enumerate(segments):
+                if (not is_irregular(segment)):
+                    continue
+                for other_path_id, other_segments in enumerate(coordinates):
+                    for other_segment_id, other_segment in enumerate(other_segments):
+                        # pairs of two irregular segments are counted once
+                        if ((other_path_id, other_segment_id) <= (path_id, segment_id) and
+                                is_irregular(other_segment)):
+                            continue
+                        if (other_path_id == path_id and abs(other_segment_id - segment_id) < 3):
+                            continue
+                        count = segment_intersection(segment, other_segment)
+                        matrix[path_id][other_path_id] += count
+                        if (other_path_id != path_id):
+                            matrix[other_path_id][path_id] += count
+    return total_lengths.tolist(), segment_counts.tolist(), matrices
+
+
+def batch_routes(start_point: Point, end_point: Point, board: Board, count: int, generator,
+                 direction_probability: float = 0.65, cap: int = 13):
+    # count independent routes of route() at once, random values come from the numpy generator;
+    # every step applies the same rules as route() to all unfinished routes
+    # returns a list of flat vertex lists
+    end_x, end_y = end_point.x, end_point.y
+    right_edge, lower_edge = board.width - 1, board.height - 1
+    vertices = np.zeros((count, 2 * (cap + 3)), dtype=np.int64)
+    vertices[:, 0] = start_point.x
+    vertices[:, 1] = start_point.y
+    segment_counts = np.zeros(count, dtype=np.int64)
+    last_horizontal = np.zeros(count, dtype=bool)
+    active = np.ones(count, dtype=bool)
+    while (active.any()):
+        routes = np.flatnonzero(active)
+        counts = segment_counts[routes]
+        start_x = vertices[routes, 2 * counts]
+        start_y = vertices[routes, 2 * counts + 1]
+        previous_horizontal = last_horizontal[routes]
+        axis_choice = generator.random(len(routes))
+        toward = generator.random(len(routes)) < direction_probability
+        length_choice = generator.random(len(routes))
+        orientation_x = end_x - start_x
+        orientation_y = end_y - start_y
+        first = counts == 0
+
+        # first segment, toward the end point
+        first_x = np.where((orientation_x != 0) & (orientation_y != 0), axis_choice < 0.5, orientation_y == 0)
+        # first segment, random direction (right, left, down, up in the order of route())
+        first_right = ((axis_choice < 0.25) & (start_x != right_edge)) | ((axis_choice < 0.5) & (start_x == 0))
+        first_left = ~first_right & (axis_choice < 0.5)
+        first_down = ~first_right & ~first_left & (((axis_choice < 0.75) & (start_y != lower_edge)) | (start_y == 0))
+        # next segments, perpendicular to the previous one
+        toward_down = ((orientation_y > 0) | ((orientation_y == 0) & (axis_choice < 0.5) & (start_y != lower_edge))
+                       | (start_y == 0))
+        toward_right = ((orientation_x > 0) | ((orientation_x == 0) & (axis_choice < 0.5) & (start_x != right_edge))
+                        | (start_x == 0))
+        random_down = ((axis_choice < 0.5) & (start_y != lower_edge)) | (start_y == 0)
+        random_right = ((axis_choice < 0.5) & (start_x != right_edge)) | (start_x == 0)
+
+        horizontal = np.where(first, np.where(toward, first_x, first_right | first_left), ~previous_horizontal)
+        positive = np.where(horizontal,
+                            np.where(first, np.where(toward, orientation_x > 0, first_right),
+                                     np.where(toward, toward_right, random_right)),
+                            np.where(first, np.where(toward, orientation_y > 0, first_down),
+                                     np.where(toward, toward_down, random_down)))
+        # segments toward an end point on the same line are limited by the end point, others by the edge
+        to_end = toward & np.where(horizontal, orientation_y == 0, orientation_x == 0)
+        distance = np.where(to_end, np.where(horizontal, np.abs(orientation_x), np.abs(orientation_y)),
+                            np.where(horizontal, np.where(positive, right_edge - start_x, start_x),
+                                     np.where(positive, lower_edge - start_y, start_y)))
+        segment_length = 1 + (length_choice * distance).astype(np.int64)
+        signed_length = np.where(positive, segment_length, -segment_length)
+
+        # segment cap reached: go straight to the end point, or move the last corner onto it
+        capped = counts >= cap
+        capped_horizontal = ~previous_horizontal & (start_x != end_x)
+        capped_vertical = previous_horizontal & (start_y != end_y)
+        corner = capped & ~capped_horizontal & ~capped_vertical
+        horizontal = np.where(capped, capped_horizontal, horizontal)
+        signed_length = np.where(capped, np.where(capped_horizontal, orientation_x, orientation_y), signed_length)
+
+        moved = routes[~corner]
+        moved_counts = counts[~corner] + 1
+        moved_horizontal = horizontal[~corner]
+        vertices[moved, 2 * moved_counts] = start_x[~corner] + np.where(moved_horizontal, signed_length[~corner], 0)
+        vertices[moved, 2 * moved_counts + 1] = start_y[~corner] + np.where(moved_horizontal, 0,
+                                                                            signed_length[~corner])
+        segment_counts[moved] = moved_counts
+        last_horizontal[moved] = moved_horizontal
+
+        cornered = routes[corner]
+        corner_counts = counts[corner]
+        corner_horizontal = previous_horizontal[corner]
+        vertices[cornered[corner_horizontal], 2 * corner_counts[corner_horizontal]] = end_x
+        vertices[cornered[~corner_horizontal], 2 * corner_counts[~corner_horizontal] + 1] = end_y
+
+        finished = segment_counts[routes]
+        active[routes] = ~((vertices[routes, 2 * finished] == end_x) & (vertices[routes, 2 * finished + 1] == end_y))
+    return [row[:2 * segment_count + 2] for row, segment_count in zip(vertices.tolist(), segment_counts.tolist())]
+
+
+class FitnessCache:
+    # Bounded LRU map from Solution.canonical() to the fitness components (total length, segment count,
+    # intersection matrix). Components do not depend on the weights, so one cache serves any weights.
+    def __init__(self, max_size: int = 100_000):
+        if (max_size < 1):
+            raise ValueError('Fitness cache size has to be positive')
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple):
+        components = self.entries.get(key)
+        if (components is None):
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return components
+
+    def put(self, key: tuple, components: tuple):
+        self.entries[key] = components
+        self.entries.move_to_end(key)
+        if (len(self.entries) > self.max_size):
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __str__(self):
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0
+        return f'Fitness cache: {self.hits} hits, {self.misses} misses ({hit_rate:.1%}), {len(self)} entries'
+
 
 class Solution:
+    intersection_engine = 'indexed'
+    path_class = Path
+    fitness_cache = None
+    # a lab1_route_library.RouteLibrary of the board, random_solve and mutate_reroll then sample its routes,
+    # preferring ones that cross the other paths of the solution less
+    route_library = None
+
     def __init__(self):
         self.paths = []
         self.fitness = 0
+        self.total_length = 0
+        self.segment_count = 0
+        self.intersections = 0
+        self.intersection_matrix = []
 
     def setPaths(self,
                  paths: list,
                  length_weight: float = 1,
                  segment_weight: float = 20,
-                 intersection_weight: float = 1000):
+                 intersection_weight: float = 1000,
+                 evaluate: bool = True):
         self.paths = paths
-        self.fitness = self.calculate_fitness(length_weight, segment_weight, intersection_weight)
+        if (evaluate):
+            self.fitness = self.calculate_fitness(length_weight, segment_weight, intersection_weight)
 
     def random_solve(self,
                      board: Board,
                      length_weight: float = 1,
                      segment_weight: float = 20,
-                     intersection_weight: float = 1000):
+                     intersection_weight: float = 1000,
+                     evaluate: bool = True):
+        if (self.route_library is not None):
+            paths = []
+            for net in range(len(board.point_pairs)):
+                paths.append(self.route_library.sample(net, paths))
+            self.setPaths(paths, length_weight, segment_weight, intersection_weight, evaluate)
+            return
         paths = []
         for pair in board.point_pairs:
-            path = Path()
+            path = self.path_class()
             path.create_random(pair[0], pair[1], board)
             paths.append(path)
-        self.setPaths(paths, length_weight, segment_weight, intersection_weight)
-
-    def __intersect(self, S1: Segment, S2: Segment):
-        A, B = S1.start_point, S1.end_point
-        C, D = S2.start_point, S2.end_point
-        if (A.x == B.x == C.x == D.x):
-            min1 = min(A.y, B.y)
-            max1 = max(A.y, B.y)
-
-            min2 = min(C.y, D.y)
-            max2 = max(C.y, D.y)
-
-            minIntersection = max(min1, min2)
-            maxIntersection = min(max1, max2)
-
-            if (minIntersection <= maxIntersection):
-                return abs(minIntersection - maxIntersection) + 1
-            else:
-                return 0
-        elif (A.y == B.y == C.y == D.y):
-            min1 = min(A.x, B.x)
-            max1 = max(A.x, B.x)
-
-            min2 = min(C.x, D.x)
-            max2 = max(C.x, D.x)
-
-            minIntersection = max(min1, min2)
-            maxIntersection = min(max1, max2)
-
-            if (minIntersection <= maxIntersection):
-                return abs(minIntersection - maxIntersection) + 1
-            else:
-                return 0
+        self.setPaths(paths, length_weight, segment_weight, intersection_weight, evaluate)
+
+    def set_components(self, total_length: int, segment_count: int, intersection_matrix: list,
+                       length_weight: float, segment_weight: float, intersection_weight: float):
+        self.total_length = total_length
+        self.segment_count = segment_count
+        self.intersection_matrix = intersection_matrix
+        self.intersections = intersection_total(intersection_matrix)
+        self.__weigh(length_weight, segment_weight, intersection_weight)
+
+    def reweigh(self, length_weight: float, segment_weight: float, intersection_weight: float):
+        # fitness under other weights from the stored components, nothing is recalculated
+        self.__weigh(length_weight, segment_weight, intersection_weight)
+        return self.fitness
+
+    def __weigh(self, length_weight: float, segment_weight: float, intersection_weight: float):
+        self.fitness = (length_weight * self.total_length +
+                        segment_weight * self.segment_count +
+                        intersection_weight * self.intersections)
+
+    def __calculate_intersections(self, path_ids: list = None):
+        if (path_ids is None or len(self.intersection_matrix) != len(self.paths)):
+            self.intersection_matrix = INTERSECTION_ENGINES[self.intersection_engine](self.paths)
         else:
-            dx0 = B.x - A.x
-            dx1 = D.x - C.x
-            dy0 = B.y - A.y
-            dy1 = D.y - C.y
-
-            p0 = dy1 * (D.x - A.x) - dx1 * (D.y - A.y)
-            p1 = dy1 * (D.x - B.x) - dx1 * (D.y - B.y)
-            p2 = dy0 * (B.x - C.x) - dx0 * (B.y - C.y)
-            p3 = dy0 * (B.x - D.x) - dx0 * (B.y - D.y)
-
-            return int((p0 * p1 <= 0) & (p2 * p3 <= 0))
-
-    def __calculate_intersections(self):
-        intersections = 0
-        for i, pathA in enumerate(self.paths):
-            for pathB in self.paths[i+1:]:
-                for segmentA in pathA:
-                    for segmentB in pathB:
-                        intersections += self.__intersect(segmentA, segmentB)
-        for path in self.paths:
-            for j, segmentA in enumerate(path):
-                for segmentB in path.segments[j+3:]:
-                    intersections += self.__intersect(segmentA, segmentB)
-        return intersections
+            INTERSECTION_ENGINES[self.intersection_engine](self.paths, path_ids, self.intersection_matrix)
+        return intersection_total(self.intersection_matrix)
+
+    def __update_fitness(self, path_ids: list, length_weight: float, segment_weight: float,
+                         intersection_weight: float):
+        # only the intersections of the given (changed) paths are recalculated
+        if (self.fitness_cache is not None):
+            key = self.canonical()
+            components = self.fitness_cache.get(key)
+            if (components is not None):
+                self.set_components(components[0], components[1], [row[:] for row in components[2]],
+                                    length_weight, segment_weight, intersection_weight)
+                return
+        self.total_length = sum(path.length for path in self)
+        self.segment_count = sum(len(path) for path in self)
+        self.intersections = self.__calculate_intersections(path_ids)
+        self.__weigh(length_weight, segment_weight, intersection_weight)
+        if (self.fitness_cache is not None):
+            self.fitness_cache.put(key, (self.total_length, self.segment_count,
+                                         [row[:] for row in self.intersection_matrix]))
+
+    def __inherit(self, paths: list, parent: 'Solution', path_ids: list,
+                  length_weight: float, segment_weight: float, intersection_weight: float):
+        # paths not listed in path_ids are taken from parent, so their intersections are already known
+        self.paths = paths
+        self.intersection_matrix = [row[:] for row in parent.intersection_matrix]
+        self.__update_fitness(path_ids, length_weight, segment_weight, intersection_weight)
+
+    def copy(self):
+        # paths are shared, only the fitness components are copied
+        clone = Solution()
+        clone.paths = self.paths[:]
+        clone.fitness = self.fitness
+        clone.total_length = self.total_length
+        clone.segment_count = self.segment_count
+        clone.intersections = self.intersections
+        clone.intersection_matrix = [row[:] for row in self.intersection_matrix]
+        return clone
+
+    def pack(self):
+        # compact picklable form: vertices of every path and the fitness components
+        return ([array('h', path.to_vertices()) for path in self],
+                self.total_length, self.segment_count, self.intersection_matrix)
+
+    @staticmethod
+    def unpack(packed: tuple,
+               length_weight: float = 1,
+               segment_weight: float = 20,
+               intersection_weight: float = 1000):
+        vertices, total_length, segment_count, intersection_matrix = packed
+        solution = Solution()
+        solution.paths = [Solution.path_class.from_vertices(path_vertices) for path_vertices in vertices]
+        solution.set_components(total_length, segment_count, intersection_matrix,
+                                length_weight, segment_weight, intersection_weight)
+        return solution
+
+    def canonical(self):
+        return tuple(path.canonical() for path in self)
 
     def __iter__(self):
         for path in self.paths:
@@ -375,12 +1028,8 @@ class Solution:
         return self.paths == other.paths
 
     def calculate_fitness(self, length_weight: float, segment_weight: float, intersection_weight: float):
-        fitness = 0
-        for path in self:
-            fitness += segment_weight * len(path.segments)
-            fitness += length_weight * path.length
-        fitness += intersection_weight * self.__calculate_intersections()
-        return fitness
+        self.__update_fitness(None, length_weight, segment_weight, intersection_weight)
+        return self.fitness
 
     def crossover_with_random_genes(self,
                                     second_parent: 'Solution',
@@ -391,12 +1040,20 @@ class Solution:
             raise ValueError('Wrong sizes of crossover parents')
         child = Solution()
         new_paths = []
+        from_second_parent = []
         for i in range(len(self.paths)):
             if (random() < 0.5):
-                new_paths.append(deepcopy(self.paths[i]))
+                new_paths.append(self.paths[i])
             else:
-                new_paths.append(deepcopy(second_parent.paths[i]))
-        child.setPaths(new_paths, length_weight, segment_weight, intersection_weight)
+                new_paths.append(second_parent.paths[i])
+                from_second_parent.append(i)
+        if (len(from_second_parent) * 2 <= len(self.paths)):
+            child.__inherit(new_paths, self, from_second_parent,
+                            length_weight, segment_weight, intersection_weight)
+        else:
+            from_first_parent = [i for i in range(len(self.paths)) if i not in from_second_parent]
+            child.__inherit(new_paths, second_parent, from_first_parent,
+                            length_weight, segment_weight, intersection_weight)
         return child
 
     def crossover_with_even_genes_distribution(self,
@@ -407,97 +1064,64 @@ class Solution:
         if (len(self.paths) != len(second_parent.paths)):
             raise ValueError('Wrong sizes of crossover parents')
         child = Solution()
+        half = len(self.paths)//2
         if (random() < 0.5):
-            child.setPaths(deepcopy(self.paths[0:len(self.paths)//2]) +
-                           deepcopy(second_parent.paths[len(self.paths)//2:]),
-                           length_weight, segment_weight, intersection_weight)
+            child.__inherit(self.paths[0:half] + second_parent.paths[half:],
+                            second_parent, list(range(half)),
+                            length_weight, segment_weight, intersection_weight)
         else:
-            child.setPaths(deepcopy(second_parent.paths[0:len(self.paths)//2]) +
-                           deepcopy(self.paths[len(self.paths)//2:]),
-                           length_weight, segment_weight, intersection_weight)
+            child.__inherit(second_parent.paths[0:half] + self.paths[half:],
+                            self, list(range(half)),
+                            length_weight, segment_weight, intersection_weight)
         return child
 
-    def mutate_reroll(self, board: Board, given_path: list = None,
+    def mutate_reroll(self, board: Board, given_path: Path = None,
                       length_weight: float = 1, segment_weight: float = 20, intersection_weight: float = 1000):
-        path_to_mutate = given_path if given_path else self.paths[randrange(0, len(self.paths))]
-        mutation_start = randrange(0, len(path_to_mutate.segments))
-        segments_to_replace = path_to_mutate.segments[mutation_start:]
-        start_point = segments_to_replace[0].start_point
-        end_point = path_to_mutate.segments[len(path_to_mutate.segments) - 1].end_point
-        new_segments, new_length = pathfinding(start_point, end_point, board,
-                                               given_segments=path_to_mutate.segments[:mutation_start])
-        path_to_mutate.segments = new_segments
-        path_to_mutate.length = new_length
-        self.fitness = self.calculate_fitness(length_weight, segment_weight, intersection_weight)
+        if (given_path is None):
+            path_id = randrange(0, len(self.paths))
+        else:
+            path_id = next((i for i, path in enumerate(self.paths) if path is given_path), None)
+            if (path_id is None):
+                raise ValueError('given_path is not a path of this solution')
+        path_to_mutate = self.paths[path_id]
+        if (self.route_library is not None):
+            self.paths[path_id] = self.route_library.sample(path_id, self.paths)
+        else:
+            mutation_start = randrange(0, len(path_to_mutate))
+            self.paths[path_id] = path_to_mutate.rerolled(mutation_start, board)
+        self.__update_fitness([path_id], length_weight, segment_weight, intersection_weight)
+
+    def shift_path(self, path_id: int, segment_i: int, shift_x: int, shift_y: int,
+                   length_weight: float = 1, segment_weight: float = 20, intersection_weight: float = 1000):
+        self.paths[path_id] = self.paths[path_id].shifted(segment_i, shift_x, shift_y)
+        self.__update_fitness([path_id], length_weight, segment_weight, intersection_weight)
 
     def mutate_shift(self, board: Board, only_shift=False, segment_to_shift=None,
                      shift_length=None, shift_direction=None, reroll_prob: float = 0.15,
                      length_weight: float = 1, segment_weight: float = 20, intersection_weight: float = 1000):
-        path_to_mutate = self.paths[randrange(0, len(self.paths))]
+        path_id = randrange(0, len(self.paths))
+        path_to_mutate = self.paths[path_id]
         reroll = random() < reroll_prob
-        if (len(path_to_mutate.segments) >= 3 and (only_shift or not reroll)):
-            segment_i = randrange(1, len(path_to_mutate.segments) - 1) if segment_to_shift is None else segment_to_shift
-            segment_to_shift = path_to_mutate.segments[segment_i]
-            if (segment_to_shift.start_point.x == segment_to_shift.end_point.x):
-                left_edge = segment_to_shift.start_point.x
-                right_edge = board.width - 1 - segment_to_shift.start_point.x
+        if (len(path_to_mutate) >= 3 and (only_shift or not reroll)):
+            segment_i = randrange(1, len(path_to_mutate) - 1) if segment_to_shift is None else segment_to_shift
+            start_x, start_y, end_x, _ = path_to_mutate.coordinates()[segment_i]
+            if (start_x == end_x):
+                left_edge = start_x
+                right_edge = board.width - 1 - start_x
                 if (shift_direction == 0 or ((((random() < 0.5 and left_edge != 0) or right_edge == 0) and shift_direction != 1))):
-                    shift = randrange(1, left_edge + 1) if shift_length is None else shift_length
-                    segment_to_shift.start_point.x -= shift
-                    segment_to_shift.end_point.x -= shift
+                    shift_x = -(randrange(1, left_edge + 1) if shift_length is None else shift_length)
                 else:
-                    shift = randrange(1, right_edge + 1) if shift_length is None else shift_length
-                    segment_to_shift.start_point.x += shift
-                    segment_to_shift.end_point.x += shift
+                    shift_x = randrange(1, right_edge + 1) if shift_length is None else shift_length
+                shift_y = 0
             else:
-                upper_edge = segment_to_shift.start_point.y
-                lower_edge = board.height - 1 - segment_to_shift.start_point.y
+                upper_edge = start_y
+                lower_edge = board.height - 1 - start_y
                 if (shift_direction == 0 or ((((random() < 0.5 and upper_edge != 0) or lower_edge == 0) and shift_direction != 1))):
-                    shift = randrange(1, upper_edge + 1) if shift_length is None else shift_length
-                    segment_to_shift.start_point.y -= shift
-                    segment_to_shift.end_point.y -= shift
-                else:
-                    shift = randrange(1, lower_edge + 1) if shift_length is None else shift_length
-                    segment_to_shift.start_point.y += shift
-                    segment_to_shift.end_point.y += shift
-            previous_segment = path_to_mutate.segments[segment_i - 1]
-            next_segment = path_to_mutate.segments[segment_i + 1]
-            deletions = 0
-            if (previous_segment.start_point == previous_segment.end_point):
-                if (segment_i - 3 >= 0 and segment_to_shift.end_point == path_to_mutate.segments[segment_i - 3].end_point):
-                    path_to_mutate.segments[segment_i + 1].start_point = path_to_mutate.segments[segment_i - 3].start_point
-                    del path_to_mutate.segments[segment_i - 3:segment_i + 1]
-                    deletions = 4
-                elif (segment_i - 2 >= 0 and segment_to_shift.end_point == path_to_mutate.segments[segment_i - 2].start_point):
-                    path_to_mutate.segments[segment_i + 1].start_point = path_to_mutate.segments[segment_i - 2].start_point
-                    del path_to_mutate.segments[segment_i - 2:segment_i + 1]
-                    deletions = 3
-                elif (segment_i - 2 >= 0):
-                    segment_to_shift.start_point = path_to_mutate.segments[segment_i - 2].start_point
-                    del path_to_mutate.segments[segment_i - 2:segment_i]
-                    deletions = 2
-                else:
-                    del path_to_mutate.segments[segment_i - 1]
-                    deletions = 1
-
-            if (next_segment.start_point == next_segment.end_point):
-                segment_i -= deletions
-                if (segment_i + 3 < len(path_to_mutate.segments) and
-                        segment_to_shift.start_point == path_to_mutate.segments[segment_i + 3].start_point):
-                    path_to_mutate.segments[segment_i - 1].end_point = path_to_mutate.segments[segment_i + 3].end_point
-                    del path_to_mutate.segments[segment_i:segment_i + 4]
-                elif ((segment_i + 2 < len(path_to_mutate.segments)) and
-                        segment_to_shift.start_point == path_to_mutate.segments[segment_i + 2].end_point):
-                    path_to_mutate.segments[segment_i - 1].end_point = path_to_mutate.segments[segment_i + 2].end_point
-                    del path_to_mutate.segments[segment_i:segment_i + 3]
-                elif (segment_i + 2 < len(path_to_mutate.segments)):
-                    segment_to_shift.end_point = path_to_mutate.segments[segment_i + 2].end_point
-                    del path_to_mutate.segments[segment_i + 1:segment_i + 3]
+                    shift_y = -(randrange(1, upper_edge + 1) if shift_length is None else shift_length)
                 else:
-                    del path_to_mutate.segments[segment_i + 1]
-
-            path_to_mutate.length = path_to_mutate.calculate_length()
-            self.fitness = self.calculate_fitness(length_weight, segment_weight, intersection_weight)
+                    shift_y = randrange(1, lower_edge + 1) if shift_length is None else shift_length
+                shift_x = 0
+            self.shift_path(path_id, segment_i, shift_x, shift_y, length_weight, segment_weight, intersection_weight)
 
         elif reroll and not only_shift:
             self.mutate_reroll(board, path_to_mutate, length_weight, segment_weight, intersection_weight)
@@ -507,29 +1131,128 @@ class Population:
     def __init__(self, size: int = 300):
         self.solutions = []
         self.size = size
+        self.__selection = None
 
     def __iter__(self):
         for solution in self.solutions:
             yield solution
 
-    def initialize(self, board: Board):
-        for _ in range(self.size):
-            solution = Solution()
-            solution.random_solve(board)
-            self.solutions.append(solution)
+    def initialize(self, board: Board, batch_evaluation: bool = False,
+                   length_weight: float = 1, segment_weight: float = 20, intersection_weight: float = 1000,
+                   batch_routing: bool = False, routed_fraction: float = 0):
+        # batch_routing generates all routes of a net at once with numpy (seeded from the random module),
+        # routed_fraction of the specimens is routed with the maze router (lab1_maze_router) instead
+        routed_count = round(self.size * routed_fraction)
+        if (routed_count > 0):
+            from lab1_maze_router import routed_solution
+            rng = Random(randrange(2 ** 32))
+            self.solutions.extend(routed_solution(board, rng, length_weight=length_weight,
+                                                  segment_weight=segment_weight,
+                                                  intersection_weight=intersection_weight,
+                                                  evaluate=not batch_evaluation)
+                                  for _ in range(routed_count))
+        random_count = self.size - routed_count
+        if (batch_routing and np is not None):
+            generator = np.random.default_rng(randrange(2 ** 32))
+            # same direction probability as Path.create_random
+            routes = [batch_routes(start_point, end_point, board, random_count, generator, 0.75)
+                      for start_point, end_point in board.point_pairs]
+            for i in range(random_count):
+                solution = Solution()
+                solution.setPaths([Solution.path_class.from_vertices(net_routes[i]) for net_routes in routes],
+                                  length_weight, segment_weight, intersection_weight, evaluate=not batch_evaluation)
+                self.solutions.append(solution)
+        else:
+            for _ in range(random_count):
+                solution = Solution()
+                solution.random_solve(board, length_weight, segment_weight, intersection_weight,
+                                      evaluate=not batch_evaluation)
+                self.solutions.append(solution)
+        if (batch_evaluation):
+            self.evaluate_batch(length_weight, segment_weight, intersection_weight)
+
+    def evaluate_batch(self,
+                       length_weight: float = 1,
+                       segment_weight: float = 20,
+                       intersection_weight: float = 1000):
+        # recalculates the fitness of every solution at once, falls back to one by one without numpy
+        if (np is None):
+            for solution in self:
+                solution.calculate_fitness(length_weight, segment_weight, intersection_weight)
+            return
+        for solution, total_length, segment_count, matrix in zip(self.solutions,
+                                                                  *batch_fitness_components(self.solutions)):
+            solution.set_components(total_length, segment_count, matrix,
+                                    length_weight, segment_weight, intersection_weight)
+
+    def copy(self):
+        # solutions are copied, so their fitness can be reweighed without touching this population
+        population = Population(self.size)
+        population.solutions = [solution.copy() for solution in self]
+        return population
+
+    def reweigh(self, length_weight: float, segment_weight: float, intersection_weight: float):
+        for solution in self:
+            solution.reweigh(length_weight, segment_weight, intersection_weight)
+        self.__selection = None
+
+    def pack(self):
+        return pickle.dumps([solution.pack() for solution in self], pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def unpack(payload: bytes,
+               length_weight: float = 1,
+               segment_weight: float = 20,
+               intersection_weight: float = 1000):
+        packed_solutions = pickle.loads(payload)
+        population = Population(len(packed_solutions))
+        population.solutions = [Solution.unpack(packed, length_weight, segment_weight, intersection_weight)
+                                for packed in packed_solutions]
+        return population
 
     def evaluate(self):
         return sorted(self.solutions, key=lambda x: x.fitness)
 
+    def sort(self):
+        # sorts the solutions by fitness in place, the list object stays the same
+        self.solutions.sort(key=lambda x: x.fitness)
+        self.__selection = None
+
+    def replace(self, index: int, solution):
+        # removes the solution at index and inserts the new one at its sorted position, expects sorted solutions
+        del self.solutions[index]
+        insort(self.solutions, solution, key=lambda x: x.fitness)
+        self.__selection = None
+        return True
+
+    def __selection_weights(self):
+        # max fitness and cumulative roulette weights, computed once per list of solutions
+        if (self.__selection is None or self.__selection[0] is not self.solutions
+                or self.__selection[1] != len(self.solutions)):
+            max_fitness = max(solution.fitness for solution in self)
+            weights = [max_fitness - solution.fitness for solution in self]
+            self.__selection = (self.solutions, len(self.solutions), sum(weights), list(accumulate(weights)))
+        return self.__selection[2], self.__selection[3]
+
     def selection_roulette(self):
-        max_fitness = self.evaluate()[len(self.solutions) - 1].fitness
-        fitness_sum = sum([max_fitness - solution.fitness for solution in self])
+        fitness_sum, cumulative_weights = self.__selection_weights()
         pick = uniform(0, fitness_sum)
-        current = 0
-        for solution in self:
-            current += max_fitness - solution.fitness
-            if (current >= pick):
-                return solution
+        return self.solutions[min(bisect_left(cumulative_weights, pick), len(self.solutions) - 1)]
+
+    def selection_stochastic_universal(self, count: int):
+        # one spin with count evenly spaced pointers, the winners are returned in random order
+        fitness_sum, cumulative_weights = self.__selection_weights()
+        step = fitness_sum / count
+        pointer = uniform(0, step)
+        last = len(self.solutions) - 1
+        selected = []
+        position = 0
+        for _ in range(count):
+            position = bisect_left(cumulative_weights, pointer, position)
+            selected.append(self.solutions[min(position, last)])
+            pointer += step
+        shuffle(selected)
+        return selected
 
     def selection_tournament(self, tournament_size):
         tournament_members = []
@@ -544,6 +1267,72 @@ class Population:
         result = tournament_members[best_position]
         return result
 
+    def selection_tournament_batch(self, tournament_size: int, count: int):
+        # count tournaments drawn at once, the numpy generator is seeded from the random module
+        if (np is None):
+            return [self.selection_tournament(tournament_size) for _ in range(count)]
+        fitness = np.fromiter((solution.fitness for solution in self), dtype=float, count=len(self.solutions))
+        members = np.random.default_rng(randrange(2 ** 32)).integers(0, len(self.solutions),
+                                                                      (count, tournament_size))
+        winners = members[np.arange(count), fitness[members].argmin(axis=1)]
+        return [self.solutions[winner] for winner in winners.tolist()]
+
+
+class SteadyStateReplacement:
+    # Keeps the population sorted by fitness and puts offspring in place of the worst solution, or with
+    # loser_tournament_size > 0 in place of the worst of that many random solutions. The elite_count best
+    # solutions are never replaced and an offspring is only accepted when it is not worse than its loser.
+    # With reject_duplicates an offspring with the same paths as a solution already in the population is
+    # dropped.
+    def __init__(self, population: Population, elite_count: int = 1, loser_tournament_size: int = 0,
+                 reject_duplicates: bool = True):
+        if (elite_count >= len(population.solutions)):
+            raise ValueError('elite_count must be smaller than the population size')
+        self.population = population
+        self.elite_count = elite_count
+        self.loser_tournament_size = loser_tournament_size
+        self.reject_duplicates = reject_duplicates
+        self.keys = Counter(solution.canonical() for solution in population) if reject_duplicates else None
+        self.accepted = 0
+        self.rejected = 0
+        population.sort()
+
+    def __swap_keys(self, index: int, key: tuple):
+        loser_key = self.population.solutions[index].canonical()
+        self.keys[loser_key] -= 1
+        if (self.keys[loser_key] == 0):
+            del self.keys[loser_key]
+        self.keys[key] += 1
+
+    def loser(self):
+        solutions = self.population.solutions
+        if (self.loser_tournament_size <= 0):
+            return len(solutions) - 1
+        return max(randrange(self.elite_count, len(solutions)) for _ in range(self.loser_tournament_size))
+
+    def offer(self, offspring: Solution):
+        # returns True when the offspring entered the population
+        solutions = self.population.solutions
+        key = offspring.canonical() if self.reject_duplicates else None
+        index = self.loser()
+        if (offspring.fitness > solutions[index].fitness or (key is not None and self.keys[key] > 0)):
+            self.rejected += 1
+            return False
+        if (key is not None):
+            self.__swap_keys(index, key)
+        self.population.replace(index, offspring)
+        self.accepted += 1
+        return True
+
+    def replace(self, index: int, solution: Solution):
+        # puts an improved version of the solution at index back, unless it duplicates another solution
+        key = solution.canonical() if self.reject_duplicates else None
+        if (key is not None):
+            if (self.keys[key] > 0):
+                return False
+            self.__swap_keys(index, key)
+        return self.population.replace(index, solution)
+
 
 def random_color():
     r = randint(0, 255)
@@ -552,20 +1341,14 @@ def random_color():
     return f'#{r:02X}{g:02X}{b:02X}'
 
 
-def draw(canvas, point_scale, solution, board):
-    # colors = [random_color() for pair in board.point_pairs]
-    colors = ['#FF0000', '#FF00FF', '#00FF00', '#00FFFF', '#FFFF00',
-              '#0000FF', '#FF8800', '#88FF00', '#8800FF', '#0088FF']
-    flat_paths = []
-    for path in solution:
-        flat_path = []
-        for segment in path:
-            flat_path.extend([segment.start_point.x + 1,
-                              segment.start_point.y + 1,
-                              segment.end_point.x + 1,
-                              segment.end_point.y + 1])
-        flat_paths.append(flat_path)
+COLORS = ['#FF0000', '#FF00FF', '#00FF00', '#00FFFF', '#FFFF00',
+          '#0000FF', '#FF8800', '#88FF00', '#8800FF', '#0088FF']
 
+
+def draw_board(canvas, point_scale, board):
+    # grid points and the pads of every net, the part of the drawing that never changes
+    # colors = [random_color() for pair in board.point_pairs]
+    colors = COLORS
     for x in range(1, board.width + 1):
         for y in range(1, board.height + 1):
             canvas.create_oval(x * point_scale + point_scale // 4,
@@ -581,14 +1364,82 @@ def draw(canvas, point_scale, solution, board):
                                (point.y + 1) * point_scale + point_scale // 4,
                                (point.x + 1) * point_scale - point_scale // 4,
                                (point.y + 1) * point_scale - point_scale // 4,
-                               fill=colors[color_counter],
-                               outline=colors[color_counter])
+                               fill=colors[color_counter % len(colors)],
+                               outline=colors[color_counter % len(colors)])
         color_counter += 1
-    for i, path in enumerate(flat_paths):
-        canvas.create_line(*[coord * point_scale for coord in path], fill=colors[i], width=point_scale // 4)
+
+
+def path_coordinates(path, point_scale):
+    # canvas coordinates of the polyline of a path
+    return [(coordinate + 1) * point_scale for coordinate in path.to_vertices()]
+
+
+def draw(canvas, point_scale, solution, board):
+    # canvas only needs create_oval and create_line, so tkinter, SVG and PNG canvases all work
+    draw_board(canvas, point_scale, board)
+    for i, path in enumerate(solution):
+        canvas.create_line(*path_coordinates(path, point_scale), fill=COLORS[i % len(COLORS)],
+                           width=point_scale // 4)
+
+
+class SvgCanvas:
+    # collects draw() output as SVG elements
+    def __init__(self, width: int, height: int, background: str = '#2D2D2D'):
+        self.width = width
+        self.height = height
+        self.elements = [f'<rect width="{width}" height="{height}" fill="{background}"/>']
+
+    def create_oval(self, x1, y1, x2, y2, fill='', outline='#000000'):
+        self.elements.append(f'<ellipse cx="{(x1 + x2) / 2}" cy="{(y1 + y2) / 2}" rx="{abs(x2 - x1) / 2}" '
+                             f'ry="{abs(y2 - y1) / 2}" fill="{fill or "none"}" stroke="{outline}"/>')
+
+    def create_line(self, *coordinates, fill='#000000', width=1):
+        points = ' '.join(f'{coordinates[i]},{coordinates[i + 1]}' for i in range(0, len(coordinates), 2))
+        self.elements.append(f'<polyline points="{points}" fill="none" stroke="{fill}" stroke-width="{width}" '
+                             f'stroke-linejoin="round"/>')
+
+    def save(self, file_name: str):
+        with open(file_name, 'w') as file:
+            file.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}">\n')
+            file.write('\n'.join(self.elements))
+            file.write('\n</svg>\n')
+
+
+class PngCanvas:
+    # draw() output rendered with Pillow, which is only needed for PNG files
+    def __init__(self, width: int, height: int, background: str = '#2D2D2D'):
+        from PIL import Image, ImageDraw
+        self.image = Image.new('RGB', (width, height), background)
+        self.image_draw = ImageDraw.Draw(self.image)
+
+    def create_oval(self, x1, y1, x2, y2, fill='', outline='#000000'):
+        self.image_draw.ellipse((min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)),
+                                fill=fill or None, outline=outline)
+
+    def create_line(self, *coordinates, fill='#000000', width=1):
+        self.image_draw.line(coordinates, fill=fill, width=width, joint='curve')
+
+    def save(self, file_name: str):
+        self.image.save(file_name)
+
+
+def render(board: Board, solution: Solution, file_name: str, point_scale: int = 30):
+    # writes what visualisation would show to an .svg or .png file, without a display
+    height = (board.height + 1) * point_scale
+    width = (board.width + 1) * point_scale
+    if (file_name.lower().endswith('.svg')):
+        canvas = SvgCanvas(width, height)
+    elif (file_name.lower().endswith('.png')):
+        canvas = PngCanvas(width, height)
+    else:
+        raise ValueError('Only .svg and .png files are supported')
+    draw(canvas, point_scale, solution, board)
+    canvas.save(file_name)
 
 
 def visualisation(board: Board, path: Path, point_scale: int = 75):
+    # tkinter is imported here, so the rest of the module works without a display
+    import tkinter as tk
     window = tk.Tk()
     height = (board.height + 1) * point_scale
     width = (board.width + 1) * point_scale
@@ -596,16 +1447,542 @@ def visualisation(board: Board, path: Path, point_scale: int = 75):
     draw(canvas, point_scale, path, board)
     canvas.pack()
 
+    def redraw():
+        canvas.delete('all')
+        draw(canvas, point_scale, path, board)
+
     menu_bar = tk.Menu(window)
     menu = tk.Menu(menu_bar, tearoff=0)
-    menu.add_command(label='Redraw', command=(lambda: draw(canvas, point_scale, path, board)))
+    menu.add_command(label='Redraw', command=redraw)
     menu_bar.add_cascade(label='Options', menu=menu)
     window.config(menu=menu_bar)
 
-    window.protocol('WM_DELETE_WINDOW', exit)
+    window.protocol('WM_DELETE_WINDOW', window.destroy)
     window.mainloop()
 
 
+class AdaptivePursuit:
+    # Adaptive pursuit over a set of operators: every operator keeps a quality estimate (exponential
+    # average, with learning rate alpha, of its mean reward per generation) and once per generation the
+    # choice probability of the best one is moved by beta towards p_max while the others move towards p_min.
+    def __init__(self, names: tuple, probabilities: list, p_min: float = 0.05, alpha: float = 0.3,
+                 beta: float = 0.3):
+        self.names = names
+        self.p_min = p_min
+        self.p_max = 1 - (len(names) - 1) * p_min
+        self.alpha = alpha
+        self.beta = beta
+        self.probabilities = [min(max(probability, p_min), self.p_max) for probability in probabilities]
+        self.qualities = [0.0] * len(names)
+        # per operator: applications, improvements and the sum of rewards, since the start of the run
+        self.statistics = {name: [0, 0, 0.0] for name in names}
+        # per operator: applications and the sum of rewards in the current generation
+        self.generation = [[0, 0.0] for _ in names]
+
+    def choose(self):
+        pick = random() * sum(self.probabilities)
+        for arm, probability in enumerate(self.probabilities):
+            pick -= probability
+            if (pick < 0):
+                return arm
+        return len(self.probabilities) - 1
+
+    def record(self, arm: int, reward: float):
+        statistics = self.statistics[self.names[arm]]
+        statistics[0] += 1
+        statistics[1] += reward > 0
+        statistics[2] += reward
+        self.generation[arm][0] += 1
+        self.generation[arm][1] += reward
+
+    def step(self):
+        # one pursuit step from the rewards recorded since the last step, operators not applied keep
+        # their quality
+        if (not any(count for count, _ in self.generation)):
+            return
+        for arm, (count, reward_sum) in enumerate(self.generation):
+            if (count > 0):
+                self.qualities[arm] += self.alpha * (reward_sum / count - self.qualities[arm])
+        self.generation = [[0, 0.0] for _ in self.names]
+        best = max(range(len(self.qualities)), key=lambda i: self.qualities[i])
+        for i in range(len(self.probabilities)):
+            target = self.p_max if i == best else self.p_min
+            self.probabilities[i] += self.beta * (target - self.probabilities[i])
+
+
+class AdaptiveOperators:
+    # Chooses the crossover (none, random genes or even split) and the mutation (none, shift or reroll)
+    # of every offspring with adaptive pursuit, starting from the given fixed probabilities. Both
+    # operators of an offspring are rewarded with its relative improvement over the better parent, so
+    # "copy" and "no_mutation" get credit for what the other operator achieves with them. The
+    # probabilities change once per generation, in end_generation().
+    CROSSOVERS = ('copy', 'crossover_with_random_genes', 'crossover_with_even_genes_distribution')
+    MUTATIONS = ('no_mutation', 'mutate_shift', 'mutate_reroll')
+
+    def __init__(self, crossover_prob: float, mutation_prob: float, reroll_prob: float, p_min: float = 0.05,
+                 alpha: float = 0.3, beta: float = 0.1):
+        self.crossover = AdaptivePursuit(self.CROSSOVERS, [1 - crossover_prob, crossover_prob / 2, crossover_prob / 2],
+                                         p_min, alpha, beta)
+        self.mutation = AdaptivePursuit(self.MUTATIONS, [1 - mutation_prob, mutation_prob * (1 - reroll_prob),
+                                                         mutation_prob * reroll_prob], p_min, alpha, beta)
+
+    def produce(self, first_parent: Solution, second_parent, board: Board,
+                length_weight: float, segment_weight: float, intersection_weight: float):
+        # second_parent is called only when a crossover needs it
+        crossover = self.crossover.choose()
+        parent_fitness = first_parent.fitness
+        if (crossover == 0):
+            offspring = first_parent.copy()
+        else:
+            other_parent = second_parent()
+            parent_fitness = min(parent_fitness, other_parent.fitness)
+            if (crossover == 1):
+                offspring = first_parent.crossover_with_random_genes(other_parent, length_weight, segment_weight,
+                                                                     intersection_weight)
+            else:
+                offspring = first_parent.crossover_with_even_genes_distribution(other_parent, length_weight,
+                                                                                segment_weight, intersection_weight)
+        mutation = self.mutation.choose()
+        if (mutation == 1):
+            offspring.mutate_shift(board, only_shift=True, length_weight=length_weight,
+                                   segment_weight=segment_weight, intersection_weight=intersection_weight)
+        elif (mutation == 2):
+            offspring.mutate_reroll(board, None, length_weight, segment_weight, intersection_weight)
+        # relative fitness improvement, 0 when the offspring is not better
+        reward = max(parent_fitness - offspring.fitness, 0) / max(parent_fitness, 1)
+        self.crossover.record(crossover, reward)
+        self.mutation.record(mutation, reward)
+        return offspring
+
+    def end_generation(self):
+        self.crossover.step()
+        self.mutation.step()
+
+    def rates(self):
+        # the probabilities in the terms of genetic_algorithm's parameters
+        copy, random_genes, even_split = self.crossover.probabilities
+        no_mutation, shift, reroll = self.mutation.probabilities
+        return {'crossover_prob': random_genes + even_split,
+                'even_split_share': even_split / (random_genes + even_split),
+                'mutation_prob': shift + reroll,
+                'reroll_prob': reroll / (shift + reroll)}
+
+    def statistics(self):
+        # operator -> [applications, improvements, sum of relative improvements] since the start
+        return {**self.crossover.statistics, **self.mutation.statistics}
+
+
+def produce_offspring(population: Population,
+                      board: Board,
+                      offspring_count: int,
+                      crossover_prob: float,
+                      mutation_prob: float,
+                      selection_tournament: bool,
+                      reroll_prob: float,
+                      fitness_length_weight: float,
+                      fitness_segment_weight: float,
+                      fitness_intersection_weight: float,
+                      tournament_size: int = 0,
+                      batch_selection: bool = False,
+                      operators: AdaptiveOperators = None):
+    # operators (AdaptiveOperators) chooses the crossover and mutation of every offspring instead of the
+    # fixed probabilities.
+    # batch_selection draws every parent of the generation up front (stochastic universal sampling
+    # instead of roulette), the second parents are only used by offspring created with crossover
+    tournament = tournament_size > 0 and selection_tournament is True
+    if (batch_selection):
+        if (tournament):
+            parents = population.selection_tournament_batch(tournament_size, 2 * offspring_count)
+        else:
+            parents = population.selection_stochastic_universal(2 * offspring_count)
+    new_generation = []
+
+    def second_parent():
+        if (batch_selection):
+            return parents[2 * len(new_generation) + 1]
+        elif (tournament):
+            return population.selection_tournament(tournament_size)
+        return population.selection_roulette()
+
+    while (len(new_generation) < offspring_count):
+        if (batch_selection):
+            S1 = parents[2 * len(new_generation)]
+        elif (tournament):
+            S1 = population.selection_tournament(tournament_size)
+        else:
+            S1 = population.selection_roulette()
+        if (operators is not None):
+            new_generation.append(operators.produce(S1, second_parent, board, fitness_length_weight,
+                                                    fitness_segment_weight, fitness_intersection_weight))
+            continue
+        if (random() < crossover_prob):
+            S2 = second_parent()
+            offspring = S1.crossover_with_random_genes(S2, fitness_length_weight,
+                                                       fitness_segment_weight,
+                                                       fitness_intersection_weight)
+        else:
+            offspring = S1.copy()
+        if (random() < mutation_prob):
+            offspring.mutate_shift(board, reroll_prob=reroll_prob,
+                                   length_weight=fitness_length_weight,
+                                   segment_weight=fitness_segment_weight,
+                                   intersection_weight=fitness_intersection_weight)
+        new_generation.append(offspring)
+    return new_generation
+
+
+def init_worker(path_class, intersection_engine: str, fitness_cache_size: int = 0, route_library_board: Board = None,
+                length_weight: float = 1, segment_weight: float = 20):
+    # workers started with spawn do not see class attributes changed in the parent process
+    Solution.path_class = path_class
+    Solution.intersection_engine = intersection_engine
+    Solution.fitness_cache = FitnessCache(fitness_cache_size) if fitness_cache_size > 0 else None
+    if (route_library_board is not None):
+        from lab1_route_library import RouteLibrary
+        Solution.route_library = RouteLibrary(route_library_board, length_weight, segment_weight)
+
+
+def produce_offspring_chunk(payload: bytes, board: Board, offspring_count: int, chunk_seed: str, parameters: dict):
+    seed(chunk_seed)
+    population = Population.unpack(payload,
+                                   parameters['fitness_length_weight'],
+                                   parameters['fitness_segment_weight'],
+                                   parameters['fitness_intersection_weight'])
+    return [offspring.pack() for offspring in produce_offspring(population, board, offspring_count, **parameters)]
+
+
+# magic, version, generation, last improvement, elapsed time, random seed, has random seed, path count,
+# solution count (population and the best solution as the last one), gauss_next of the random state
+CHECKPOINT_HEADER = struct.Struct('<4sHIIdq?HId?')
+CHECKPOINT_MAGIC = b'GACP'
+CHECKPOINT_VERSION = 1
+
+
+class Checkpoint:
+    # State of a run needed to continue it exactly: population, best solution, generation counters and the
+    # state of the random module. Saved as a header followed by flat little-endian integer arrays:
+    # random state (uint32), total lengths and segment counts (int64), upper triangles of the symmetric
+    # intersection matrices (int32), vertex counts of every path (uint16) and all vertices (int16).
+    def __init__(self, population: Population, best_solution: Solution, generation: int,
+                 last_improvement: int = 0, elapsed: float = 0, random_seed: int = None, random_state=None):
+        self.population = population
+        self.best_solution = best_solution
+        self.generation = generation
+        self.last_improvement = last_improvement
+        self.elapsed = elapsed
+        self.random_seed = random_seed
+        self.random_state = getstate() if random_state is None else random_state
+
+    def save(self, file_name: str):
+        solutions = self.population.solutions + [self.best_solution]
+        path_count = len(self.best_solution.paths)
+        version, internal_state, gauss_next = self.random_state
+        components = array('q')
+        matrices = array('i')
+        vertex_counts = array('H')
+        vertices = array('h')
+        for solution in solutions:
+            components.append(solution.total_length)
+            components.append(solution.segment_count)
+            for i, row in enumerate(solution.intersection_matrix):
+                matrices.extend(row[i:])
+            for path in solution:
+                # canonical() is kept by the path, so paths shared between solutions are converted once
+                path_vertices = path.canonical()
+                vertex_counts.append(len(path_vertices))
+                vertices.extend(path_vertices)
+        header = CHECKPOINT_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, self.generation, self.last_improvement,
+                                        self.elapsed, self.random_seed or 0, self.random_seed is not None,
+                                        path_count, len(solutions), gauss_next or 0.0, gauss_next is not None)
+        # written next to the target first, so a crash while saving keeps the previous checkpoint
+        temporary_name = file_name + '.tmp'
+        with open(temporary_name, 'wb') as file:
+            file.write(header)
+            for values in (array('I', internal_state), components, matrices, vertex_counts, vertices):
+                if (sys.byteorder == 'big'):
+                    values.byteswap()
+                values.tofile(file)
+        os.replace(temporary_name, file_name)
+
+    @staticmethod
+    def load(file_name: str,
+             length_weight: float = 1,
+             segment_weight: float = 20,
+             intersection_weight: float = 1000):
+        with open(file_name, 'rb') as file:
+            data = file.read()
+        if (len(data) < CHECKPOINT_HEADER.size):
+            raise ValueError(f'{file_name} is not a checkpoint of this version')
+        (magic, version, generation, last_improvement, elapsed, random_seed, has_seed, path_count,
+         solution_count, gauss_next, has_gauss_next) = CHECKPOINT_HEADER.unpack_from(data)
+        if (magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION):
+            raise ValueError(f'{file_name} is not a checkpoint of this version')
+        offset = CHECKPOINT_HEADER.size
+
+        def read(typecode: str, count: int):
+            nonlocal offset
+            values = array(typecode)
+            end = offset + count * values.itemsize
+            if (end > len(data)):
+                raise ValueError(f'{file_name} is truncated')
+            values.frombytes(data[offset:end])
+            if (sys.byteorder == 'big'):
+                values.byteswap()
+            offset = end
+            return values
+
+        internal_state = read('I', 625)
+        components = read('q', 2 * solution_count)
+        triangle_size = path_count * (path_count + 1) // 2
+        matrices = read('i', solution_count * triangle_size)
+        vertex_counts = read('H', solution_count * path_count)
+        vertices = read('h', sum(vertex_counts))
+        solutions = []
+        position = 0
+        for i in range(solution_count):
+            paths = []
+            for count in vertex_counts[i * path_count:(i + 1) * path_count]:
+                paths.append(Solution.path_class.from_vertices(vertices[position:position + count]))
+                position += count
+            matrix = [[0] * path_count for _ in range(path_count)]
+            position_in_matrices = i * triangle_size
+            for row in range(path_count):
+                for column in range(row, path_count):
+                    matrix[row][column] = matrix[column][row] = matrices[position_in_matrices]
+                    position_in_matrices += 1
+            solution = Solution()
+            solution.paths = paths
+            solution.set_components(components[2 * i], components[2 * i + 1], matrix,
+                                    length_weight, segment_weight, intersection_weight)
+            solutions.append(solution)
+        population = Population(solution_count - 1)
+        population.solutions = solutions[:-1]
+        random_state = (3, tuple(internal_state), gauss_next if has_gauss_next else None)
+        return Checkpoint(population, solutions[-1], generation, last_improvement, elapsed,
+                          random_seed if has_seed else None, random_state)
+
+
+class Snapshot:
+    # state after one generation, yielded by evolve(); stop_reason is set on the last snapshot
+    # operator_rates are the current AdaptiveOperators.rates() of runs with adaptive_operators
+    __slots__ = ('generation', 'best_fitness', 'best_solution', 'elapsed', 'improved', 'population', 'stop_reason',
+                 'operator_rates')
+
+    def __init__(self, generation: int, best_solution: Solution, elapsed: float, improved: bool,
+                 population: Population, stop_reason: str = None, operator_rates: dict = None):
+        self.generation = generation
+        self.best_fitness = best_solution.fitness
+        self.best_solution = best_solution
+        self.elapsed = elapsed
+        self.improved = improved
+        self.population = population
+        self.stop_reason = stop_reason
+        self.operator_rates = operator_rates
+
+
+# defaults of evolve, main and random_search, also used by the other lab1 scripts; DEFAULT_PARAMETERS
+# are the keyword arguments shared with produce_offspring, the generation count is the one of main
+# (evolve runs until stopped by default)
+DEFAULT_PARAMETERS = {'crossover_prob': 0.6,
+                      'mutation_prob': 0.35,
+                      'selection_tournament': True,
+                      'reroll_prob': 0.6,
+                      'fitness_length_weight': 1,
+                      'fitness_segment_weight': 20,
+                      'fitness_intersection_weight': 1000,
+                      'tournament_size': 4}
+DEFAULT_POPULATION_SIZE = 300
+DEFAULT_ITERATION_COUNT = 75
+
+
+def evolve(board: Board,
+           crossover_prob: float = DEFAULT_PARAMETERS['crossover_prob'],
+           mutation_prob: float = DEFAULT_PARAMETERS['mutation_prob'],
+           population_size: int = DEFAULT_POPULATION_SIZE,
+           selection_tournament: bool = DEFAULT_PARAMETERS['selection_tournament'],
+           reroll_prob: float = DEFAULT_PARAMETERS['reroll_prob'],
+           fitness_length_weight: float = DEFAULT_PARAMETERS['fitness_length_weight'],
+           fitness_segment_weight: float = DEFAULT_PARAMETERS['fitness_segment_weight'],
+           fitness_intersection_weight: float = DEFAULT_PARAMETERS['fitness_intersection_weight'],
+           tournament_size: int = DEFAULT_PARAMETERS['tournament_size'],
+           iteration_count: int = None,
+           time_budget: float = None,
+           target_fitness: float = None,
+           stagnation_limit: int = None,
+           workers: int = 0,
+           random_seed: int = None,
+           batch_selection: bool = False,
+           fitness_cache: FitnessCache = None,
+           checkpoint_file: str = None,
+           checkpoint_interval: int = 10,
+           resume_from: str = None,
+           routed_fraction: float = 0,
+           steady_state: bool = False,
+           steady_state_batch: int = 10,
+           elite_count: int = 1,
+           loser_tournament_size: int = DEFAULT_PARAMETERS['tournament_size'],
+           reject_duplicates: bool = True,
+           local_search_interval: int = 0,
+           local_search_count: int = 1,
+           local_search_budget: float = 0.05,
+           best_improvement: bool = False,
+           initial_population: Population = None,
+           route_library: bool = False,
+           adaptive_operators: bool = False):
+    # Yields a Snapshot of the initial population (generation 0) and after every generation. It stops
+    # after iteration_count generations, time_budget seconds, reaching target_fitness or stagnation_limit
+    # generations without improvement, whichever comes first; without any of them it runs until closed.
+    # workers > 0 splits offspring production of every generation across that many processes,
+    # each chunk with its own random stream seeded from (random_seed, generation, chunk).
+    # Every checkpoint_interval generations the state is saved to checkpoint_file, resume_from continues
+    # a run from such a file (iteration_count and time_budget still count from the start of the run).
+    # routed_fraction of the initial population comes from the maze router instead of random pathfinding.
+    # steady_state keeps one population sorted by fitness and replaces its losers in place with batches of
+    # steady_state_batch offspring (see SteadyStateReplacement), a generation is then population_size offspring.
+    # Every local_search_interval generations the local_search_count best solutions are hill climbed with
+    # shift moves for at most local_search_budget seconds (see lab1_local_search).
+    # initial_population (evaluated with the same weights) is evolved instead of a new random one.
+    # route_library makes random solutions and reroll mutations sample the routes of a RouteLibrary
+    # (see lab1_route_library) built for the board once.
+    # adaptive_operators adapts the crossover, mutation and reroll probabilities during the run, starting
+    # from the given ones (see AdaptiveOperators); the adapted state is not part of checkpoints, so it cannot
+    # be combined with resume_from.
+    if (steady_state and workers > 0):
+        raise ValueError('steady_state does not support workers')
+    if (adaptive_operators and workers > 0):
+        raise ValueError('adaptive_operators does not support workers')
+    if (adaptive_operators and resume_from is not None):
+        raise ValueError('adaptive_operators does not support resume_from')
+    start = time.time()
+    if (resume_from is not None):
+        checkpoint = Checkpoint.load(resume_from, fitness_length_weight, fitness_segment_weight,
+                                     fitness_intersection_weight)
+        start -= checkpoint.elapsed
+        random_seed = checkpoint.random_seed
+        setstate(checkpoint.random_state)
+    elif (random_seed is not None):
+        seed(random_seed)
+    # a class-wide cache set by the caller is only replaced (and restored afterwards) when one is passed
+    previous_cache = Solution.fitness_cache
+    if (fitness_cache is not None):
+        Solution.fitness_cache = fitness_cache
+    previous_library = Solution.route_library
+    if (route_library):
+        from lab1_route_library import RouteLibrary
+        Solution.route_library = RouteLibrary(board, fitness_length_weight, fitness_segment_weight)
+    parameters = {'crossover_prob': crossover_prob,
+                  'mutation_prob': mutation_prob,
+                  'selection_tournament': selection_tournament,
+                  'reroll_prob': reroll_prob,
+                  'fitness_length_weight': fitness_length_weight,
+                  'fitness_segment_weight': fitness_segment_weight,
+                  'fitness_intersection_weight': fitness_intersection_weight,
+                  'tournament_size': tournament_size,
+                  'batch_selection': batch_selection}
+    operators = None
+    if (adaptive_operators):
+        operators = AdaptiveOperators(crossover_prob, mutation_prob, reroll_prob)
+        parameters['operators'] = operators
+    executor = None
+    try:
+        if (resume_from is not None):
+            population = checkpoint.population
+            best_solution = checkpoint.best_solution
+            i = checkpoint.generation
+            last_improvement = checkpoint.last_improvement
+        else:
+            if (initial_population is not None):
+                population = initial_population
+            else:
+                population = Population(population_size)
+                population.initialize(board, False, fitness_length_weight, fitness_segment_weight,
+                                      fitness_intersection_weight, routed_fraction=routed_fraction)
+            best_solution = population.evaluate()[0]
+            i = 0
+            last_improvement = 0
+        if (workers > 0):
+            from concurrent.futures import ProcessPoolExecutor
+            if (random_seed is None):
+                random_seed = randrange(2 ** 32)
+            executor = ProcessPoolExecutor(workers, initializer=init_worker,
+                                           initargs=(Solution.path_class, Solution.intersection_engine,
+                                                     0 if fitness_cache is None else fitness_cache.max_size,
+                                                     board if route_library else None,
+                                                     fitness_length_weight, fitness_segment_weight))
+            chunk_sizes = [population_size // workers + (chunk < population_size % workers)
+                           for chunk in range(workers)]
+        if (steady_state):
+            replacement = SteadyStateReplacement(population, elite_count, loser_tournament_size, reject_duplicates)
+        improved = resume_from is None or last_improvement == i
+        while True:
+            elapsed = time.time() - start
+            if (checkpoint_file is not None and i > 0 and i % checkpoint_interval == 0):
+                Checkpoint(population, best_solution, i, last_improvement, elapsed,
+                           random_seed).save(checkpoint_file)
+            stop_reason = None
+            if (iteration_count is not None and i >= iteration_count):
+                stop_reason = 'iteration_count'
+            elif (target_fitness is not None and best_solution.fitness <= target_fitness):
+                stop_reason = 'target_fitness'
+            elif (time_budget is not None and elapsed >= time_budget):
+                stop_reason = 'time_budget'
+            elif (stagnation_limit is not None and i - last_improvement >= stagnation_limit):
+                stop_reason = 'stagnation'
+            yield Snapshot(i, best_solution, elapsed, improved, population, stop_reason,
+                           operators.rates() if operators is not None else None)
+            if (stop_reason is not None):
+                return
+
+            i += 1
+            improved = False
+            if (steady_state):
+                produced = 0
+                while (produced < population_size):
+                    batch = produce_offspring(population, board, min(steady_state_batch, population_size - produced),
+                                              **parameters)
+                    produced += len(batch)
+                    for offspring in batch:
+                        if (replacement.offer(offspring) and offspring.fitness < best_solution.fitness):
+                            best_solution = offspring
+                            improved = True
+            else:
+                if (executor is None):
+                    new_generation = produce_offspring(population, board, population_size, **parameters)
+                else:
+                    payload = population.pack()
+                    futures = [executor.submit(produce_offspring_chunk, payload, board, chunk_size,
+                                               f'{random_seed}:{i}:{chunk}', parameters)
+                               for chunk, chunk_size in enumerate(chunk_sizes) if chunk_size > 0]
+                    new_generation = [Solution.unpack(packed, fitness_length_weight,
+                                                      fitness_segment_weight, fitness_intersection_weight)
+                                      for future in futures for packed in future.result()]
+                for offspring in new_generation:
+                    if (offspring.fitness < best_solution.fitness):
+                        best_solution = offspring
+                        improved = True
+                population = Population(population_size)
+                population.solutions = new_generation
+            if (operators is not None):
+                operators.end_generation()
+            if (local_search_interval > 0 and i % local_search_interval == 0):
+                from lab1_local_search import local_search
+                for solution in local_search(population, board, local_search_count, best_improvement,
+                                             local_search_budget, replacement.replace if steady_state else None,
+                                             fitness_length_weight, fitness_segment_weight,
+                                             fitness_intersection_weight):
+                    if (solution.fitness < best_solution.fitness):
+                        best_solution = solution
+                        improved = True
+            if (improved):
+                last_improvement = i
+    finally:
+        if (executor is not None):
+            executor.shutdown(cancel_futures=True)
+        if (fitness_cache is not None):
+            Solution.fitness_cache = previous_cache
+        Solution.route_library = previous_library
+
+
 def genetic_algorithm(board: Board,
                       crossover_prob: float,
                       mutation_prob: float,
@@ -616,79 +1993,111 @@ def genetic_algorithm(board: Board,
                       fitness_length_weight: float,
                       fitness_segment_weight: float,
                       fitness_intersection_weight: float,
-                      tournament_size: int = 0):
-    population = Population(population_size)
-    population.initialize(board)
-    best_solution = population.evaluate()[0]
+                      tournament_size: int = 0,
+                      workers: int = 0,
+                      random_seed: int = None,
+                      batch_selection: bool = False,
+                      fitness_cache_size: int = 0,
+                      verbose: bool = True,
+                      return_population: bool = False,
+                      time_budget: float = None,
+                      target_fitness: float = None,
+                      stagnation_limit: int = None,
+                      telemetry=None,
+                      checkpoint_file: str = None,
+                      checkpoint_interval: int = 10,
+                      resume_from: str = None,
+                      routed_fraction: float = 0,
+                      steady_state: bool = False,
+                      steady_state_batch: int = 10,
+                      elite_count: int = 1,
+                      loser_tournament_size: int = 0,
+                      reject_duplicates: bool = True,
+                      local_search_interval: int = 0,
+                      local_search_count: int = 1,
+                      local_search_budget: float = 0.05,
+                      best_improvement: bool = False,
+                      route_library: bool = False,
+                      adaptive_operators: bool = False):
+    # telemetry is a lab1_telemetry.Telemetry, started for the run and told about every generation
+    fitness_cache = FitnessCache(fitness_cache_size) if fitness_cache_size > 0 else None
+    if (telemetry is not None):
+        telemetry.start()
     start = time.time()
-    i = 0
+    snapshot = None
     j = 0
     try:
-        # while (time.time() - start < 25):
-        while (i < iteration_count):
-            i += 1
-            new_generation = []
-            while (len(new_generation) < population_size):
-                if (tournament_size > 0 and selection_tournament is True):
-                    S1 = population.selection_tournament(tournament_size)
-                else:
-                    S1 = population.selection_roulette()
-                if (random() < crossover_prob):
-                    if (tournament_size > 0 and selection_tournament is True):
-                        S2 = population.selection_tournament(tournament_size)
-                    else:
-                        S2 = population.selection_roulette()
-                    offspring = S1.crossover_with_random_genes(S2, fitness_length_weight,
-                                                               fitness_segment_weight,
-                                                               fitness_intersection_weight)
-                else:
-                    offspring = deepcopy(S1)
-                if (random() < mutation_prob):
-                    offspring.mutate_shift(board, reroll_prob=reroll_prob,
-                                           length_weight=fitness_length_weight,
-                                           segment_weight=fitness_segment_weight,
-                                           intersection_weight=fitness_intersection_weight)
-                new_generation.append(offspring)
-                if (offspring.fitness < best_solution.fitness):
-                    best_solution = offspring
-                    print('New best:', offspring.fitness, 'Number of generations: ', i)
-
-            population.solutions = new_generation
+        for snapshot in evolve(board, crossover_prob, mutation_prob, population_size, selection_tournament,
+                               reroll_prob, fitness_length_weight, fitness_segment_weight,
+                               fitness_intersection_weight, tournament_size, iteration_count, time_budget,
+                               target_fitness, stagnation_limit, workers, random_seed, batch_selection,
+                               fitness_cache, checkpoint_file, checkpoint_interval, resume_from,
+                               routed_fraction, steady_state, steady_state_batch, elite_count,
+                               loser_tournament_size, reject_duplicates, local_search_interval,
+                               local_search_count, local_search_budget, best_improvement, None, route_library,
+                               adaptive_operators):
+            if (telemetry is not None):
+                telemetry.on_generation(snapshot)
+            if (verbose and snapshot.improved and snapshot.generation > 0):
+                print('New best:', snapshot.best_fitness, 'Number of generations: ', snapshot.generation)
             if ((time.time() - start) // 5 > j):
-                print(f'{int(time.time() - start)}s')
+                if (verbose):
+                    print(f'{int(time.time() - start)}s')
                 j += 1
     except KeyboardInterrupt:
         print('Program execution interrupted')
-    print('---------------- Genetic algorithm finished ----------------')
-    print(f'Time: {time.time() - start}s')
-    print('Number of generations: ', i)
-    print('Best fitness:', best_solution.fitness)
-    # print(*[solution.fitness for solution in population.evaluate()])
-    return best_solution
+    finally:
+        if (telemetry is not None):
+            telemetry.stop()
+    if (snapshot is None):
+        raise RuntimeError('interrupted before the initial population was evaluated')
+    if (verbose):
+        print('---------------- Genetic algorithm finished ----------------')
+        print(f'Time: {time.time() - start}s')
+        print('Number of generations: ', snapshot.generation)
+        print('Best fitness:', snapshot.best_fitness)
+        if (fitness_cache is not None and workers == 0):
+            print(fitness_cache)
+        if (telemetry is not None):
+            print(telemetry)
+    # print(*[solution.fitness for solution in snapshot.population.evaluate()])
+    if (return_population):
+        return snapshot.best_solution, snapshot.population
+    return snapshot.best_solution
+
+
+def parse_board(lines):
+    # board in the format of lab1_test_problems: "width;height", then one "x1;y1;x2;y2" line per net
+    lines = iter(lines)
+    dimensions = next(lines).strip().split(sep=';')
+    width, height = dimensions[0], dimensions[1]
+    pairs = []
+    for line in lines:
+        if (not line.strip()):
+            continue
+        coordinates = line.strip().split(sep=';')
+        pair = (Point(int(coordinates[0]), int(coordinates[1])), Point(int(coordinates[2]), int(coordinates[3])))
+        pairs.append(pair)
+    return Board(int(width), int(height), pairs)
 
 
 def read_config(task_number: int):
     try:
         with open(f'./lab1_test_problems/zad{task_number}.txt') as file:
-            dimensions = file.readline().strip().split(sep=';')
-            width, height = dimensions[0], dimensions[1]
-            pairs = []
-            for line in file:
-                coordinates = line.strip().split(sep=';')
-                pair = (Point(int(coordinates[0]), int(coordinates[1])), Point(int(coordinates[2]), int(coordinates[3])))
-                pairs.append(pair)
-            return Board(int(width), int(height), pairs)
+            return parse_board(file)
     except FileNotFoundError:
         print('Config file with given name does not exist!')
         raise
 
 
 def random_search(task_number: int = 1,
-                  fitness_length_weight: float = 1,
-                  fitness_segment_weight: float = 20,
-                  fitness_intersection_weight: float = 1000,
-                  corresponding_population_size: int = 300,
-                  corresponding_iteration_count: int = 75):
+                  fitness_length_weight: float = DEFAULT_PARAMETERS['fitness_length_weight'],
+                  fitness_segment_weight: float = DEFAULT_PARAMETERS['fitness_segment_weight'],
+                  fitness_intersection_weight: float = DEFAULT_PARAMETERS['fitness_intersection_weight'],
+                  corresponding_population_size: int = DEFAULT_POPULATION_SIZE,
+                  corresponding_iteration_count: int = DEFAULT_ITERATION_COUNT,
+                  headless: bool = False,
+                  image_file: str = None):
     board = read_config(task_number)
     start = time.time()
     min_sol = None
@@ -703,20 +2112,31 @@ def random_search(task_number: int = 1,
 
     print(f'Time: {time.time() - start}s')
     print('Best fitness:', min_sol.fitness)
-    visualisation(board, min_sol, 30)
+    if (image_file is not None):
+        render(board, min_sol, image_file, 30)
+    if (not headless):
+        visualisation(board, min_sol, 30)
+    return min_sol
 
 
 def main(task_number: int = 1,
-         crossover_prob: float = 0.6,
-         mutation_prob: float = 0.35,
-         population_size: int = 300,
-         selection_tournament: bool = True,
-         reroll_prob: float = 0.6,
-         iteration_count: int = 75,
-         fitness_length_weight: float = 1,
-         fitness_segment_weight: float = 20,
-         fitness_intersection_weight: float = 1000,
-         tournament_size: int = 4):
+         crossover_prob: float = DEFAULT_PARAMETERS['crossover_prob'],
+         mutation_prob: float = DEFAULT_PARAMETERS['mutation_prob'],
+         population_size: int = DEFAULT_POPULATION_SIZE,
+         selection_tournament: bool = DEFAULT_PARAMETERS['selection_tournament'],
+         reroll_prob: float = DEFAULT_PARAMETERS['reroll_prob'],
+         iteration_count: int = DEFAULT_ITERATION_COUNT,
+         fitness_length_weight: float = DEFAULT_PARAMETERS['fitness_length_weight'],
+         fitness_segment_weight: float = DEFAULT_PARAMETERS['fitness_segment_weight'],
+         fitness_intersection_weight: float = DEFAULT_PARAMETERS['fitness_intersection_weight'],
+         tournament_size: int = DEFAULT_PARAMETERS['tournament_size'],
+         workers: int = 0,
+         random_seed: int = None,
+         batch_selection: bool = False,
+         fitness_cache_size: int = 0,
+         headless: bool = False,
+         image_file: str = None):
+    # headless skips the tkinter window, image_file (.svg or .png) saves the best solution instead
     board = read_config(task_number)
 
     best_solution = genetic_algorithm(board,
@@ -729,14 +2149,22 @@ def main(task_number: int = 1,
                                       fitness_length_weight,
                                       fitness_segment_weight,
                                       fitness_intersection_weight,
-                                      tournament_size)
+                                      tournament_size,
+                                      workers,
+                                      random_seed,
+                                      batch_selection,
+                                      fitness_cache_size)
 
     # for path in solution:
     #     print(path)
     #     print(path.length)
     #     print()
 
-    visualisation(board, best_solution, 30)
+    if (image_file is not None):
+        render(board, best_solution, image_file, 30)
+    if (not headless):
+        visualisation(board, best_solution, 30)
+    return best_solution
 
 
 if __name__ == '__main__':
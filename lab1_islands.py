@@ -0,0 +1,122 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from random import Random, seed
+from lab1_genetic_algorithm import (DEFAULT_ITERATION_COUNT, DEFAULT_PARAMETERS, DEFAULT_POPULATION_SIZE, Board,
+                                    Solution, Population, read_config, produce_offspring, init_worker,
+                                    visualisation)
+
+
+def evolve_island(payload: bytes, board: Board, population_size: int, generation_count: int,
+                  island_seed: str, parameters: dict):
+    # runs generation_count generations of one island, payload is None before the first epoch
+    seed(island_seed)
+    weights = (parameters['fitness_length_weight'],
+               parameters['fitness_segment_weight'],
+               parameters['fitness_intersection_weight'])
+    if (payload is None):
+        population = Population(population_size)
+        population.initialize(board, False, *weights)
+    else:
+        population = Population.unpack(payload, *weights)
+    best_solution = population.evaluate()[0]
+    for _ in range(generation_count):
+        population.solutions = produce_offspring(population, board, population_size, **parameters)
+        best_solution = min(best_solution, *population, key=lambda x: x.fitness)
+    return population.pack(), best_solution.pack()
+
+
+def migration_targets(island_count: int, topology: str, rng: Random):
+    # targets[i] is the island that receives the emigrants of island i
+    if (topology == 'ring'):
+        return [(i + 1) % island_count for i in range(island_count)]
+    if (topology == 'random'):
+        targets = list(range(island_count))
+        while (island_count > 1 and any(target == i for i, target in enumerate(targets))):
+            rng.shuffle(targets)
+        return targets
+    raise ValueError(f'Unknown migration topology: {topology}')
+
+
+def migrate(populations: list, migration_size: int, targets: list):
+    # the best migration_size solutions of every island replace the worst ones of its target island
+    emigrants = [population.evaluate()[:migration_size] for population in populations]
+    for source, target in enumerate(targets):
+        if (source == target):
+            continue
+        population = populations[target]
+        survivors = population.evaluate()[:len(population.solutions) - len(emigrants[source])]
+        population.solutions = survivors + [solution.copy() for solution in emigrants[source]]
+
+
+def island_model(board: Board,
+                 island_count: int = 4,
+                 population_size: int = DEFAULT_POPULATION_SIZE,
+                 iteration_count: int = DEFAULT_ITERATION_COUNT,
+                 migration_interval: int = 10,
+                 migration_size: int = 5,
+                 topology: str = 'ring',
+                 island_parameters: list = None,
+                 workers: int = None,
+                 random_seed: int = None,
+                 **parameters):
+    # population_size is per island, island_parameters holds one dict of overrides per island,
+    # e.g. [{'tournament_size': 2}, {'reroll_prob': 0.3}, ...]
+    if (island_parameters is not None and len(island_parameters) != island_count):
+        raise ValueError('island_parameters needs one entry per island')
+    parameters = [{**DEFAULT_PARAMETERS, **parameters, **(island_parameters[island] if island_parameters else {})}
+                  for island in range(island_count)]
+    weights = [(island['fitness_length_weight'],
+                island['fitness_segment_weight'],
+                island['fitness_intersection_weight']) for island in parameters]
+    rng = Random(random_seed)
+    if (random_seed is None):
+        random_seed = rng.randrange(2 ** 32)
+    payloads = [None] * island_count
+    best_solution = None
+    start = time.time()
+    i = 0
+    epoch = 0
+    executor = ProcessPoolExecutor(workers or island_count, initializer=init_worker,
+                                   initargs=(Solution.path_class, Solution.intersection_engine))
+    try:
+        while (i < iteration_count):
+            generation_count = min(migration_interval, iteration_count - i)
+            futures = [executor.submit(evolve_island, payloads[island], board, population_size, generation_count,
+                                       f'{random_seed}:{island}:{epoch}', parameters[island])
+                       for island in range(island_count)]
+            results = [future.result() for future in futures]
+            i += generation_count
+            epoch += 1
+            populations = [Population.unpack(payload, *weights[island])
+                           for island, (payload, _) in enumerate(results)]
+            for island, (_, best) in enumerate(results):
+                solution = Solution.unpack(best, *weights[island])
+                if (best_solution is None or solution.fitness < best_solution.fitness):
+                    best_solution = solution
+                    print('New best:', solution.fitness, 'Island:', island, 'Number of generations: ', i)
+            if (i < iteration_count and migration_size > 0):
+                migrate(populations, migration_size, migration_targets(island_count, topology, rng))
+            payloads = [population.pack() for population in populations]
+            print(f'{int(time.time() - start)}s')
+    except KeyboardInterrupt:
+        print('Program execution interrupted')
+    finally:
+        executor.shutdown(cancel_futures=True)
+    print('---------------- Island model finished ----------------')
+    print(f'Time: {time.time() - start}s')
+    print('Number of generations: ', i)
+    if (best_solution is not None):
+        print('Best fitness:', best_solution.fitness)
+    return best_solution
+
+
+if __name__ == '__main__':
+    board = read_config(1)
+    best_solution = island_model(board,
+                                 island_count=4,
+                                 population_size=300,
+                                 iteration_count=75,
+                                 migration_interval=10,
+                                 migration_size=5,
+                                 topology='ring')
+    visualisation(board, best_solution, 30)
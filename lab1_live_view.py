@@ -0,0 +1,94 @@
+import threading
+from lab1_genetic_algorithm import Board, Solution, COLORS, draw_board, evolve, path_coordinates, read_config
+
+
+class LiveView:
+    # Draws the grid and the pads once and keeps one line item per net. update() only moves the lines of
+    # the paths that changed since the last call (paths are immutable, so a changed path is a new object),
+    # the number of canvas items stays the same however often it is called.
+    def __init__(self, canvas, board: Board, point_scale: int = 30):
+        self.canvas = canvas
+        self.point_scale = point_scale
+        self.paths = [None] * len(board.point_pairs)
+        self.lines = [None] * len(board.point_pairs)
+        draw_board(canvas, point_scale, board)
+
+    def update(self, solution: Solution):
+        # returns the number of redrawn paths
+        redrawn = 0
+        for i, path in enumerate(solution):
+            if (path is self.paths[i]):
+                continue
+            coordinates = path_coordinates(path, self.point_scale)
+            if (self.lines[i] is None):
+                self.lines[i] = self.canvas.create_line(*coordinates, fill=COLORS[i % len(COLORS)],
+                                                        width=self.point_scale // 4)
+            else:
+                self.canvas.coords(self.lines[i], *coordinates)
+            self.paths[i] = path
+            redrawn += 1
+        return redrawn
+
+
+class SolverThread(threading.Thread):
+    # Runs evolve() in the background and keeps only its latest snapshot, the view picks it up at its
+    # own pace. stop() ends the run after the current generation.
+    def __init__(self, board: Board, **parameters):
+        super().__init__(daemon=True)
+        self.board = board
+        self.parameters = parameters
+        self.snapshot = None
+        self.stopping = threading.Event()
+
+    def run(self):
+        generations = evolve(self.board, **self.parameters)
+        try:
+            for snapshot in generations:
+                self.snapshot = snapshot
+                if (self.stopping.is_set()):
+                    break
+        finally:
+            generations.close()
+
+    def stop(self):
+        self.stopping.set()
+
+
+def live_genetic_algorithm(board: Board, point_scale: int = 30, frame_rate: float = 10, **parameters):
+    # Shows the best solution of a running evolve(board, **parameters) call, redrawn at most frame_rate
+    # times per second. Closing the window stops the solver. Returns the best solution found.
+    import tkinter as tk
+    window = tk.Tk()
+    canvas = tk.Canvas(window, bg='#2D2D2D', height=(board.height + 1) * point_scale,
+                       width=(board.width + 1) * point_scale)
+    canvas.pack()
+    view = LiveView(canvas, board, point_scale)
+    solver = SolverThread(board, **parameters)
+    shown = [None]
+
+    def refresh():
+        snapshot = solver.snapshot
+        if (snapshot is not None and snapshot is not shown[0]):
+            view.update(snapshot.best_solution)
+            status = 'finished' if snapshot.stop_reason is not None else 'running'
+            window.title(f'Generation {snapshot.generation}, best fitness {snapshot.best_fitness} ({status})')
+            shown[0] = snapshot
+        if (solver.is_alive() or solver.snapshot is not shown[0]):
+            window.after(int(1000 / frame_rate), refresh)
+
+    def close():
+        solver.stop()
+        window.destroy()
+
+    window.protocol('WM_DELETE_WINDOW', close)
+    solver.start()
+    window.after(0, refresh)
+    window.mainloop()
+    solver.stop()
+    solver.join()
+    return solver.snapshot.best_solution if solver.snapshot is not None else None
+
+
+if __name__ == '__main__':
+    live_genetic_algorithm(read_config(3), point_scale=30, frame_rate=10, population_size=300,
+                           iteration_count=200)
@@ -0,0 +1,99 @@
+import time
+from random import shuffle
+from lab1_genetic_algorithm import Board, Population, SegmentIndex, Solution, segment_intersection, shift_vertices
+
+
+def shift_moves(vertices: list, board: Board):
+    # (segment_i, shift_x, shift_y) of every shift of every interior segment that mutate_shift can make
+    moves = []
+    for segment_i in range(1, len(vertices) // 2 - 2):
+        start_x, start_y, end_x, _ = vertices[2 * segment_i:2 * segment_i + 4]
+        if (start_x == end_x):
+            moves.extend((segment_i, shift_x, 0) for shift_x in range(-start_x, board.width - start_x) if shift_x)
+        else:
+            moves.extend((segment_i, 0, shift_y) for shift_y in range(-start_y, board.height - start_y) if shift_y)
+    return moves
+
+
+def segment_index(solution: Solution):
+    index = SegmentIndex()
+    for path_id, path in enumerate(solution):
+        for segment_id, segment in enumerate(path.coordinates()):
+            index.insert(segment, path_id, segment_id)
+    return index
+
+
+def shift_delta(solution: Solution, path_id: int, vertices: list, move: tuple, index: SegmentIndex,
+                length_weight: float = 1, segment_weight: float = 20, intersection_weight: float = 1000):
+    # Fitness change of shifting a segment of path path_id, the solution itself is left untouched. Only
+    # the row of the shifted path in the intersection matrix changes: it is recounted against index
+    # (segment_index of the solution, hits of the old path itself are ignored) and the new path's own
+    # segments. vertices are the path's current vertices.
+    path = solution.paths[path_id]
+    shifted = shift_vertices(vertices[:], *move)
+    segments = [tuple(shifted[k:k + 4]) for k in range(0, len(shifted) - 2, 2)]
+    length = sum(abs(x2 - x1) + abs(y2 - y1) for x1, y1, x2, y2 in segments)
+    intersections = 0
+    for segment_id, segment in enumerate(segments):
+        for other_path_id, _, count in index.query(segment):
+            if (other_path_id != path_id):
+                intersections += count
+        for other in segments[segment_id + 3:]:
+            intersections += segment_intersection(segment, other)
+    return (length_weight * (length - path.length)
+            + segment_weight * (len(segments) - len(path))
+            + intersection_weight * (intersections - sum(solution.intersection_matrix[path_id])))
+
+
+def hill_climb(solution: Solution, board: Board, best_improvement: bool = False, deadline: float = None,
+               length_weight: float = 1, segment_weight: float = 20, intersection_weight: float = 1000):
+    # Improves the solution in place with shift moves until none of them helps or time.perf_counter()
+    # passes deadline. First-improvement applies the first move that lowers the fitness (paths are visited
+    # in random order), best-improvement scores every move of every path and applies the best one.
+    # Returns the number of applied moves.
+    applied = 0
+    while (deadline is None or time.perf_counter() < deadline):
+        index = segment_index(solution)
+        best = None
+        path_ids = list(range(len(solution.paths)))
+        shuffle(path_ids)
+        for path_id in path_ids:
+            vertices = solution.paths[path_id].to_vertices()
+            for move in shift_moves(vertices, board):
+                delta = shift_delta(solution, path_id, vertices, move, index,
+                                    length_weight, segment_weight, intersection_weight)
+                if (delta < 0 and (best is None or delta < best[0])):
+                    best = (delta, path_id, move)
+                    if (not best_improvement):
+                        break
+            if ((best is not None and not best_improvement)
+                    or (deadline is not None and time.perf_counter() >= deadline)):
+                break
+        if (best is None):
+            break
+        solution.shift_path(best[1], *best[2], length_weight, segment_weight, intersection_weight)
+        applied += 1
+    return applied
+
+
+def local_search(population: Population, board: Board, elite_count: int = 1, best_improvement: bool = False,
+                 time_budget: float = 0.05, replace=None,
+                 length_weight: float = 1, segment_weight: float = 20, intersection_weight: float = 1000):
+    # Hill climbs copies of the elite_count best solutions within time_budget seconds. An improved copy
+    # replaces its original through replace(index, solution) (Population.replace by default), which
+    # keeps the population sorted. Returns the improved solutions that entered the population.
+    deadline = time.perf_counter() + time_budget
+    population.sort()
+    replace = replace or population.replace
+    improved = []
+    for elite in population.solutions[:elite_count]:
+        if (time.perf_counter() >= deadline):
+            break
+        candidate = elite.copy()
+        if (hill_climb(candidate, board, best_improvement, deadline,
+                       length_weight, segment_weight, intersection_weight) == 0):
+            continue
+        index = next(i for i, solution in enumerate(population.solutions) if solution is elite)
+        if (replace(index, candidate)):
+            improved.append(candidate)
+    return improved
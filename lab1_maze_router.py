@@ -0,0 +1,114 @@
+from heapq import heappop, heappush
+from random import Random
+from lab1_genetic_algorithm import Board, Point, Solution
+
+# moves as (dx, dy, orientation), orientation 1 is horizontal and 2 is vertical (0 - no move yet)
+MOVES = ((1, 0, 1), (-1, 0, 1), (0, 1, 2), (0, -1, 2))
+
+
+def astar_route(board: Board, start_point: Point, end_point: Point, cell_costs: list, occupancy: list,
+                history: list, length_weight: float = 1, segment_weight: float = 20,
+                intersection_weight: float = 1000):
+    # Cheapest grid route between the points: every cell costs length_weight times its cell cost, every
+    # change of direction segment_weight and every cell used by other nets intersection_weight per net,
+    # multiplied by 1 + the number of earlier passes in which the cell was congested (history).
+    # Returns the list of visited cells (y * width + x) from start to end.
+    width, height = board.width, board.height
+    start = start_point.y * width + start_point.x
+    end = end_point.y * width + end_point.x
+    end_x, end_y = end_point.x, end_point.y
+
+    def heuristic(x, y, orientation):
+        bends = 0
+        # off the target's row and column, or on one of them but moving across it: one bend at least
+        if ((x != end_x and y != end_y) or (x != end_x and orientation == 2) or (y != end_y and orientation == 1)):
+            bends = 1
+        return (abs(x - end_x) + abs(y - end_y)) * length_weight + bends * segment_weight
+
+    best = {start * 3: 0}
+    previous = {}
+    queue = [(heuristic(start_point.x, start_point.y, 0), 0, start * 3)]
+    while (queue):
+        _, cost, state = heappop(queue)
+        if (cost > best[state]):
+            continue
+        cell, orientation = divmod(state, 3)
+        if (cell == end):
+            route = [cell]
+            while (state in previous):
+                state = previous[state]
+                route.append(state // 3)
+            route.reverse()
+            return route
+        y, x = divmod(cell, width)
+        for dx, dy, move_orientation in MOVES:
+            next_x, next_y = x + dx, y + dy
+            if (next_x < 0 or next_y < 0 or next_x >= width or next_y >= height):
+                continue
+            next_cell = next_y * width + next_x
+            next_cost = (cost + length_weight * cell_costs[next_cell]
+                         + intersection_weight * occupancy[next_cell] * (1 + history[next_cell])
+                         + (segment_weight if orientation != move_orientation and orientation != 0 else 0))
+            next_state = next_cell * 3 + move_orientation
+            if (next_cost < best.get(next_state, float('inf'))):
+                best[next_state] = next_cost
+                previous[next_state] = state
+                heappush(queue, (next_cost + heuristic(next_x, next_y, move_orientation), next_cost, next_state))
+    raise ValueError('No route between the given points')
+
+
+def cells_to_vertices(route: list, width: int):
+    # flat [x1, y1, x2, y2, ...] vertices of the corners of a cell route
+    points = [divmod(cell, width)[::-1] for cell in route]
+    vertices = list(points[0])
+    for i in range(1, len(points) - 1):
+        before, point, after = points[i - 1], points[i], points[i + 1]
+        if ((before[0] == point[0]) != (point[0] == after[0])):
+            vertices.extend(point)
+    vertices.extend(points[-1])
+    return vertices
+
+
+def routed_paths(board: Board, rng: Random, passes: int = 8, jitter: float = 0.5,
+                 length_weight: float = 1, segment_weight: float = 20, intersection_weight: float = 1000):
+    # Negotiated congestion routing: the first pass routes the nets one after another in random order, each
+    # avoiding the cells of the nets routed so far. Every next pass rips up and reroutes every net (again in
+    # random order) against all the others, with cells shared in earlier passes getting more expensive,
+    # until no cell is shared or passes run out; the pass with the fewest shared cells is kept. Random
+    # jitter of the cell costs makes every call return a different layout.
+    cell_costs = [1 + rng.random() * jitter for _ in range(board.width * board.height)]
+    occupancy = [0] * (board.width * board.height)
+    history = [0] * (board.width * board.height)
+    order = list(range(len(board.point_pairs)))
+    routes = [None] * len(order)
+    best_routes = None
+    best_congestion = None
+    for _ in range(passes):
+        rng.shuffle(order)
+        for net in order:
+            if (routes[net] is not None):
+                for cell in routes[net]:
+                    occupancy[cell] -= 1
+            start_point, end_point = board.point_pairs[net]
+            routes[net] = astar_route(board, start_point, end_point, cell_costs, occupancy, history,
+                                      length_weight, segment_weight, intersection_weight)
+            for cell in routes[net]:
+                occupancy[cell] += 1
+        congested = [cell for cell, count in enumerate(occupancy) if count > 1]
+        if (best_congestion is None or len(congested) < best_congestion):
+            best_routes = routes[:]
+            best_congestion = len(congested)
+        if (not congested):
+            break
+        for cell in congested:
+            history[cell] += 1
+    return [Solution.path_class.from_vertices(cells_to_vertices(route, board.width)) for route in best_routes]
+
+
+def routed_solution(board: Board, rng: Random, passes: int = 8, jitter: float = 0.5,
+                    length_weight: float = 1, segment_weight: float = 20, intersection_weight: float = 1000,
+                    evaluate: bool = True):
+    solution = Solution()
+    solution.setPaths(routed_paths(board, rng, passes, jitter, length_weight, segment_weight, intersection_weight),
+                      length_weight, segment_weight, intersection_weight, evaluate)
+    return solution
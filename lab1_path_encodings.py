@@ -0,0 +1,59 @@
+import time
+import tracemalloc
+from copy import deepcopy
+from random import seed
+from lab1_genetic_algorithm import Solution, Path, CompactPath, read_config
+
+
+def create_population(board, path_class, size):
+    previous_class = Solution.path_class
+    Solution.path_class = path_class
+    try:
+        population = []
+        for _ in range(size):
+            solution = Solution()
+            solution.random_solve(board)
+            population.append(solution)
+        return population
+    finally:
+        Solution.path_class = previous_class
+
+
+def measure(board, path_class, size: int = 300):
+    seed(0)
+    tracemalloc.start()
+    start = time.perf_counter()
+    population = create_population(board, path_class, size)
+    initialization_time = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    copies = deepcopy(population)
+    copy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for solution in copies:
+        solution.mutate_shift(board, reroll_prob=0.6)
+    mutation_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for solution in population:
+        solution.calculate_fitness(1, 20, 1000)
+    fitness_time = time.perf_counter() - start
+    return memory, initialization_time, copy_time, mutation_time, fitness_time
+
+
+def compare(task_numbers: tuple = (1, 2, 3), size: int = 300):
+    print('|Task|Encoding|Memory [kB]|Initialisation [ms]|Deepcopy [ms]|Mutation [ms]|Fitness [ms]|')
+    print('|---:|--------|----------:|------------------:|------------:|------------:|-----------:|')
+    for task_number in task_numbers:
+        board = read_config(task_number)
+        for path_class in (Path, CompactPath):
+            memory, *times = measure(board, path_class, size)
+            print(f'|{task_number}|{path_class.__name__}|{memory // 1024}|' +
+                  '|'.join(f'{1000 * value:.0f}' for value in times) + '|')
+
+
+if __name__ == '__main__':
+    compare()
@@ -0,0 +1,95 @@
+from bisect import bisect_left
+from itertools import accumulate
+from math import exp
+from random import random
+from lab1_genetic_algorithm import Board, SegmentIndex, Solution
+
+
+def candidate_vertices(board: Board, start_point, end_point):
+    # straight line, both L-shapes and every horizontal-vertical-horizontal route through a column and
+    # vertical-horizontal-vertical route through a row (Z-shapes between the points, U-shapes outside)
+    x1, y1, x2, y2 = start_point.x, start_point.y, end_point.x, end_point.y
+    candidates = []
+    if (x1 == x2 or y1 == y2):
+        candidates.append([x1, y1, x2, y2])
+    else:
+        candidates.append([x1, y1, x2, y1, x2, y2])
+        candidates.append([x1, y1, x1, y2, x2, y2])
+    if (y1 != y2):
+        candidates.extend([x1, y1, x, y1, x, y2, x2, y2] for x in range(board.width) if x != x1 and x != x2)
+    if (x1 != x2):
+        candidates.extend([x1, y1, x1, y, x2, y, x2, y2] for y in range(board.height) if y != y1 and y != y2)
+    return candidates
+
+
+class RouteLibrary:
+    # Low-bend candidate routes of every net, built once per board and sorted by
+    # length_weight * length + segment_weight * segments. The paths are shared by every solution using
+    # them (paths are never modified). sample() picks one of the top cheapest candidates of a net (all of
+    # them by default) with weight exp(-(cost - cheapest cost) / (temperature * cheapest cost)), so a
+    # route twice as expensive as the cheapest one is picked e^2 times less often with temperature 0.5.
+    # Given the paths of a solution, it draws tries candidates and keeps the one with the fewest
+    # intersections with the library routes among them (counted once per board, on first use).
+    def __init__(self, board: Board, length_weight: float = 1, segment_weight: float = 20, top: int = None,
+                 temperature: float = 0.5):
+        self.board = board
+        self.routes = []
+        self.positions = []
+        self.costs = []
+        self.cumulative_weights = []
+        for start_point, end_point in board.point_pairs:
+            paths = [Solution.path_class.from_vertices(vertices)
+                     for vertices in candidate_vertices(board, start_point, end_point)]
+            paths.sort(key=lambda path: length_weight * path.length + segment_weight * len(path))
+            costs = [length_weight * path.length + segment_weight * len(path) for path in paths]
+            limit = len(paths) if top is None else min(top, len(paths))
+            self.routes.append(paths)
+            self.positions.append({path.canonical(): i for i, path in enumerate(paths)})
+            self.costs.append(costs)
+            self.cumulative_weights.append(list(accumulate(
+                exp(-(cost - costs[0]) / (temperature * max(costs[0], 1))) for cost in costs[:limit])))
+        self.__conflicts = None
+
+    @property
+    def conflicts(self):
+        # conflicts[net][i] maps (other net, candidate) to the number of intersections of candidate i of
+        # net with that candidate, only pairs that intersect are stored; counted on first use
+        if (self.__conflicts is None):
+            self.__conflicts = self.__count_conflicts()
+        return self.__conflicts
+
+    def __count_conflicts(self):
+        index = SegmentIndex()
+        candidates = [(net, i) for net, paths in enumerate(self.routes) for i in range(len(paths))]
+        for candidate_id, (net, i) in enumerate(candidates):
+            for segment in self.routes[net][i].coordinates():
+                index.insert(segment, candidate_id, 0)
+        conflicts = [[{} for _ in paths] for paths in self.routes]
+        for net, i in candidates:
+            counts = conflicts[net][i]
+            for segment in self.routes[net][i].coordinates():
+                for candidate_id, _, count in index.query(segment):
+                    other = candidates[candidate_id]
+                    if (other[0] != net):
+                        counts[other] = counts.get(other, 0) + count
+        return conflicts
+
+    def conflict(self, net: int, i: int, other_net: int, j: int):
+        return self.conflicts[net][i].get((other_net, j), 0)
+
+    def sample(self, net: int, paths: list = None, tries: int = 2):
+        # paths are the current paths of a solution indexed by net (the ones of nets after net can be
+        # missing), routes that are not in the library are ignored
+        cumulative_weights = self.cumulative_weights[net]
+        candidates = [bisect_left(cumulative_weights, random() * cumulative_weights[-1])
+                      for _ in range(1 if paths is None else tries)]
+        if (paths is None):
+            return self.routes[net][candidates[0]]
+        others = [(other_net, self.positions[other_net].get(path.canonical()))
+                  for other_net, path in enumerate(paths) if other_net != net]
+        others = [(other_net, j) for other_net, j in others if j is not None]
+        best = min(candidates, key=lambda i: sum(self.conflict(net, i, other_net, j) for other_net, j in others))
+        return self.routes[net][best]
+
+    def __len__(self):
+        return sum(len(paths) for paths in self.routes)
@@ -0,0 +1,218 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from random import seed
+from urllib.parse import parse_qs, urlparse
+from lab1_genetic_algorithm import Board, Point, evolve, parse_board
+
+
+def board_from_json(record: dict):
+    # {"board": "<text format>"} or {"width": W, "height": H, "pairs": [[x1, y1, x2, y2], ...]}
+    if ('board' in record):
+        return parse_board(record['board'].splitlines())
+    return Board(int(record['width']), int(record['height']),
+                 [(Point(int(x1), int(y1)), Point(int(x2), int(y2))) for x1, y1, x2, y2 in record['pairs']])
+
+
+def solve_job(board: Board, time_budget: float, parameters: dict):
+    # runs in a worker process, the run stops after time_budget seconds unless parameters stop it earlier
+    start = time.perf_counter()
+    snapshot = None
+    for snapshot in evolve(board, time_budget=time_budget, **parameters):
+        pass
+    solution = snapshot.best_solution
+    return {'fitness': solution.fitness,
+            'total_length': solution.total_length,
+            'segment_count': solution.segment_count,
+            'intersections': solution.intersections,
+            'generations': snapshot.generation,
+            'time': time.perf_counter() - start,
+            'paths': [list(path.to_vertices()) for path in solution]}
+
+
+class Job:
+    def __init__(self, job_id, board: Board, time_budget: float, parameters: dict, results: queue.Queue):
+        self.job_id = job_id
+        self.board = board
+        self.time_budget = time_budget
+        self.parameters = parameters
+        self.results = results
+
+
+class SolverService:
+    # Jobs wait in one queue and are solved by a pool of worker processes started once, so every board
+    # only pays for its own run. One dispatcher thread per worker takes the next job and waits for it,
+    # which keeps the queue depth and the number of running jobs known.
+    def __init__(self, workers: int = 1, default_time_budget: float = 10):
+        self.workers = workers
+        self.default_time_budget = default_time_budget
+        self.executor = ProcessPoolExecutor(workers, initializer=seed)
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+        self.submitted = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+        self.solve_time = 0.0
+        self.dispatchers = [threading.Thread(target=self.__dispatch, daemon=True) for _ in range(workers)]
+        for dispatcher in self.dispatchers:
+            dispatcher.start()
+
+    def submit(self, job_id, board: Board, time_budget: float = None, parameters: dict = None,
+               results: queue.Queue = None):
+        # the result dict (or {'id': ..., 'error': ...}) is put into results when the job is done
+        results = queue.Queue() if results is None else results
+        with self.lock:
+            self.submitted += 1
+        self.queue.put(Job(job_id, board, self.default_time_budget if time_budget is None else time_budget,
+                           parameters or {}, results))
+        return results
+
+    def __dispatch(self):
+        while True:
+            job = self.queue.get()
+            if (job is None):
+                return
+            with self.lock:
+                self.running += 1
+                executor = self.executor
+            try:
+                result = {'id': job.job_id,
+                          **executor.submit(solve_job, job.board, job.time_budget, job.parameters).result()}
+                failed = False
+            except Exception as error:
+                if (isinstance(error, BrokenProcessPool)):
+                    self.__restart(executor)
+                result = {'id': job.job_id, 'error': f'{type(error).__name__}: {error}'}
+                failed = True
+            with self.lock:
+                self.running -= 1
+                self.completed += 1
+                self.failed += failed
+                self.solve_time += result.get('time', 0)
+            job.results.put(result)
+
+    def __restart(self, broken: ProcessPoolExecutor):
+        # a worker died (killed, out of memory), the job it ran fails and the pool is replaced once, no
+        # matter how many dispatchers noticed it
+        with self.lock:
+            if (self.executor is broken):
+                self.executor = ProcessPoolExecutor(self.workers, initializer=seed)
+                self.restarts += 1
+        broken.shutdown(wait=False)
+
+    def metrics(self):
+        with self.lock:
+            uptime = time.time() - self.start_time
+            return {'workers': self.workers,
+                    'uptime': uptime,
+                    'submitted': self.submitted,
+                    'queued': self.queue.qsize(),
+                    'running': self.running,
+                    'completed': self.completed,
+                    'failed': self.failed,
+                    'restarts': self.restarts,
+                    'throughput': self.completed / uptime if uptime > 0 else 0,
+                    'mean_solve_time': self.solve_time / (self.completed - self.failed)
+                    if self.completed > self.failed else 0}
+
+    def close(self):
+        for _ in self.dispatchers:
+            self.queue.put(None)
+        for dispatcher in self.dispatchers:
+            dispatcher.join()
+        self.executor.shutdown(cancel_futures=True)
+
+
+class SolverRequestHandler(BaseHTTPRequestHandler):
+    # POST /solve - a board in the text format (id and time_budget can be given in the query string) or,
+    #               with a JSON content type, one JSON job per line: {"id": ..., "board": ... or "width",
+    #               "height", "pairs", "time_budget": ..., "parameters": {evolve keyword arguments}}.
+    #               Results are streamed back as JSON lines in the order the jobs finish.
+    # GET /metrics - queue depth, running and completed jobs, pool restarts, throughput
+    service = None
+
+    def do_GET(self):
+        if (urlparse(self.path).path != '/metrics'):
+            self.send_error(404)
+            return
+        self.__send_json(200, self.service.metrics())
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if (url.path != '/solve'):
+            self.send_error(404)
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if (length < 0):
+                raise ValueError(f'negative Content-Length {length}')
+            body = self.rfile.read(length).decode()
+            jobs = self.__parse_jobs(body, parse_qs(url.query), 'json' in self.headers.get('Content-Type', ''))
+        except (ValueError, KeyError, IndexError, TypeError, StopIteration) as error:
+            self.__send_json(400, {'error': f'{type(error).__name__}: {error}'})
+            return
+        results = queue.Queue()
+        for job_id, board, time_budget, parameters in jobs:
+            self.service.submit(job_id, board, time_budget, parameters, results)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+        for _ in jobs:
+            self.wfile.write(json.dumps(results.get()).encode() + b'\n')
+            self.wfile.flush()
+
+    @staticmethod
+    def __parse_jobs(body: str, query: dict, json_lines: bool):
+        if (not json_lines):
+            time_budget = float(query['time_budget'][0]) if 'time_budget' in query else None
+            return [(query.get('id', [0])[0], parse_board(body.splitlines()), time_budget, {})]
+        jobs = []
+        for number, line in enumerate(line for line in body.splitlines() if line.strip()):
+            record = json.loads(line)
+            jobs.append((record.get('id', number), board_from_json(record), record.get('time_budget'),
+                         record.get('parameters', {})))
+        return jobs
+
+    def __send_json(self, status: int, content: dict):
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(service: SolverService, host: str = 'localhost', port: int = 8000):
+    handler = type('Handler', (SolverRequestHandler,), {'service': service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Solve boards sent over HTTP with a pool of worker processes.')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--time-budget', type=float, default=10, help='seconds per board unless a job sets it')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    arguments = parse_arguments()
+    service = SolverService(arguments.workers, arguments.time_budget)
+    server = make_server(service, arguments.host, arguments.port)
+    print(f'Listening on http://{arguments.host}:{server.server_address[1]}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print('Server stopped')
+    finally:
+        server.server_close()
+        service.close()
@@ -0,0 +1,138 @@
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+import lab1_genetic_algorithm as ga
+
+
+# phase name -> (owner, attribute) of every instrumented function
+PHASES = {'pathfinding': (ga, 'route'),
+          'selection_roulette': (ga.Population, 'selection_roulette'),
+          'selection_tournament': (ga.Population, 'selection_tournament'),
+          'selection_stochastic_universal': (ga.Population, 'selection_stochastic_universal'),
+          'selection_tournament_batch': (ga.Population, 'selection_tournament_batch'),
+          'crossover_with_random_genes': (ga.Solution, 'crossover_with_random_genes'),
+          'crossover_with_even_genes_distribution': (ga.Solution, 'crossover_with_even_genes_distribution'),
+          'copy': (ga.Solution, 'copy'),
+          'mutate_shift': (ga.Solution, 'mutate_shift'),
+          'mutate_reroll': (ga.Solution, 'mutate_reroll'),
+          'batch_fitness': (ga, 'batch_fitness_components')}
+
+
+class Telemetry:
+    # Cumulative timers and call counters per phase of the genetic algorithm. Functions are only wrapped
+    # between start() and stop(), so there is no overhead at all when telemetry is not used. Times are
+    # inclusive: a mutation includes the intersection counting it triggers. Phases running in worker
+    # processes (workers > 0) are not measured.
+    def __init__(self, sink: str = None, trace_memory: bool = False, profile_generations=(),
+                 profile_file: str = None):
+        self.sink = sink
+        self.trace_memory = trace_memory
+        self.profile_generations = set(profile_generations)
+        self.profile_file = profile_file
+        self.phases = {}
+        self.originals = []
+        self.file = None
+        self.profiler = None
+        self.last_phases = {}
+        self.last_time = None
+        self.started_tracing = False
+
+    def __timed(self, name: str, function):
+        counter = self.phases.setdefault(name, [0, 0.0])
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                counter[0] += 1
+                counter[1] += time.perf_counter() - start
+        return wrapper
+
+    def start(self):
+        for name, (owner, attribute) in PHASES.items():
+            original = owner.__dict__[attribute] if isinstance(owner, type) else getattr(owner, attribute)
+            self.originals.append((owner, attribute, original))
+            setattr(owner, attribute, self.__timed(name, getattr(owner, attribute)))
+        engines = dict(ga.INTERSECTION_ENGINES)
+        self.originals.append((ga, 'INTERSECTION_ENGINES', ga.INTERSECTION_ENGINES))
+        ga.INTERSECTION_ENGINES = {engine: self.__timed('intersections', function)
+                                   for engine, function in engines.items()}
+        # tracing started by the caller is left running after stop()
+        self.started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if (self.started_tracing):
+            tracemalloc.start()
+        if (self.sink is not None):
+            self.file = open(self.sink, 'a')
+        self.last_time = time.perf_counter()
+        return self
+
+    def stop(self):
+        for owner, attribute, original in reversed(self.originals):
+            setattr(owner, attribute, original)
+        self.originals = []
+        self.__stop_profile()
+        if (self.started_tracing):
+            tracemalloc.stop()
+            self.started_tracing = False
+        if (self.file is not None):
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def request_profile(self, generation: int):
+        # the given generation will run under cProfile
+        self.profile_generations.add(generation)
+
+    def __stop_profile(self):
+        if (self.profiler is None):
+            return
+        self.profiler.disable()
+        if (self.profile_file is not None):
+            self.profiler.dump_stats(self.profile_file)
+        else:
+            pstats.Stats(self.profiler).sort_stats('cumulative').print_stats(20)
+        self.profiler = None
+
+    def on_generation(self, snapshot):
+        # called with every snapshot of evolve(), measures the generation that produced it
+        now = time.perf_counter()
+        self.__stop_profile()
+        record = {'generation': snapshot.generation,
+                  'elapsed': snapshot.elapsed,
+                  'generation_time': now - self.last_time,
+                  'best_fitness': snapshot.best_fitness,
+                  'improved': snapshot.improved,
+                  'phases': {name: [calls - self.last_phases.get(name, (0, 0))[0],
+                                    seconds - self.last_phases.get(name, (0, 0))[1]]
+                             for name, (calls, seconds) in self.phases.items()}}
+        self.last_phases = {name: tuple(counter) for name, counter in self.phases.items()}
+        if (snapshot.operator_rates is not None):
+            record['operator_rates'] = snapshot.operator_rates
+        if (self.trace_memory):
+            record['memory_peak'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+        if (self.file is not None):
+            self.file.write(json.dumps(record) + '\n')
+        if (snapshot.generation + 1 in self.profile_generations):
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.last_time = time.perf_counter()
+        return record
+
+    def summary(self):
+        return {name: {'calls': calls, 'seconds': seconds} for name, (calls, seconds) in self.phases.items()}
+
+    def __str__(self):
+        lines = [f"{'phase':>40} {'calls':>9} {'total [s]':>10} {'per call [us]':>14}"]
+        for name, (calls, seconds) in sorted(self.phases.items(), key=lambda item: -item[1][1]):
+            if (calls > 0):
+                lines.append(f'{name:>40} {calls:9d} {seconds:10.3f} {seconds / calls * 1e6:14.1f}')
+        return '\n'.join(lines)
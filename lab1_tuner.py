@@ -0,0 +1,135 @@
+import argparse
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from random import Random
+from statistics import mean
+from lab1_genetic_algorithm import DEFAULT_POPULATION_SIZE, Board, evolve, read_config
+
+
+# values tried in the tables of readme.md
+SEARCH_SPACE = {'crossover_prob': [0.2, 0.4, 0.6, 0.8],
+                'mutation_prob': [0.1, 0.2, 0.35, 0.5],
+                'reroll_prob': [0.2, 0.4, 0.6, 0.8],
+                'tournament_size': [2, 4, 6, 8],
+                'population_size': [100, 200, 300]}
+
+# runs per configuration of the exhaustive approach of readme.md, each max_generations long
+EXHAUSTIVE_RUNS = 10
+
+
+def sample_configurations(count: int, rng: Random, space: dict = None):
+    # count distinct configurations drawn uniformly from the search space
+    space = space or SEARCH_SPACE
+    names = list(space)
+    combinations = list(product(*(space[name] for name in names)))
+    return [dict(zip(names, values)) for values in rng.sample(combinations, min(count, len(combinations)))]
+
+
+def rung_budgets(min_generations: int, max_generations: int, eta: int):
+    # generations every surviving configuration has run by the end of each rung
+    if (min_generations <= 0 or max_generations < min_generations):
+        raise ValueError(f'need 0 < min_generations <= max_generations, got {min_generations}, {max_generations}')
+    if (eta <= 1):
+        raise ValueError(f'eta must be greater than 1, got {eta}')
+    budgets = [min_generations]
+    while (budgets[-1] < max_generations):
+        budgets.append(min(budgets[-1] * eta, max_generations))
+    return budgets
+
+
+def population_size(record: dict):
+    return record['configuration'].get('population_size', DEFAULT_POPULATION_SIZE)
+
+
+def run_trial(board: Board, configuration: dict, random_seed: int, generation_count: int, checkpoint_file: str):
+    # Continues the run from checkpoint_file (if an earlier rung left one) up to generation_count
+    # generations and leaves a checkpoint for the next rung. Returns the best fitness.
+    resume_from = checkpoint_file if os.path.exists(checkpoint_file) else None
+    snapshot = None
+    for snapshot in evolve(board, **configuration, iteration_count=generation_count, random_seed=random_seed,
+                           checkpoint_file=checkpoint_file, checkpoint_interval=generation_count,
+                           resume_from=resume_from):
+        pass
+    return snapshot.best_fitness
+
+
+def tune(board: Board, configuration_count: int = 27, min_generations: int = 5, max_generations: int = 75,
+         eta: int = 3, seeds: int = 2, workers: int = None, random_seed: int = 0, space: dict = None,
+         verbose: bool = True):
+    # Successive halving: all configurations run min_generations generations on every seed, the best
+    # 1/eta of them (by mean best fitness) continue their runs eta times longer, and so on until
+    # max_generations. Returns one record per configuration, ranked by the rung it reached and its score,
+    # the number of offspring evaluated and the number EXHAUSTIVE_RUNS full runs of every configuration take.
+    budgets = rung_budgets(min_generations, max_generations, eta)
+    configurations = sample_configurations(configuration_count, Random(random_seed), space)
+    records = [{'number': number, 'configuration': configuration, 'rung': 0, 'generations': 0, 'score': None}
+               for number, configuration in enumerate(configurations)]
+    cost = 0
+    alive = records
+    with tempfile.TemporaryDirectory() as directory, ProcessPoolExecutor(workers) as executor:
+        for rung, budget in enumerate(budgets):
+            futures = {(record['number'], run_seed):
+                       executor.submit(run_trial, board, record['configuration'], run_seed, budget,
+                                       os.path.join(directory, f"{record['number']}-{run_seed}.bin"))
+                       for record in alive for run_seed in range(seeds)}
+            for record in alive:
+                record['score'] = mean(futures[(record['number'], run_seed)].result() for run_seed in range(seeds))
+                cost += (budget - record['generations']) * population_size(record) * seeds
+                record['rung'] = rung
+                record['generations'] = budget
+            alive.sort(key=lambda record: record['score'])
+            if (verbose):
+                print(f'Rung {rung}: {len(alive)} configurations x {budget} generations, best {alive[0]["score"]:.0f}')
+            alive = alive[:max(1, len(alive) // eta)]
+    exhaustive_cost = sum(population_size(record) for record in records) \
+        * max_generations * EXHAUSTIVE_RUNS
+    ranking = sorted(records, key=lambda record: (-record['rung'], record['score']))
+    return ranking, cost, exhaustive_cost
+
+
+def markdown_table(ranking: list):
+    names = list(ranking[0]['configuration'])
+    lines = ['|Rank|' + '|'.join(names) + '|Generations|Mean best|',
+             '|---:|' + '|'.join(':-:' for _ in names) + '|:-:|:-:|']
+    for rank, record in enumerate(ranking, 1):
+        lines.append(f'|{rank}|' + '|'.join(str(record['configuration'][name]) for name in names)
+                     + f"|{record['generations']}|{record['score']:.0f}|")
+    return '\n'.join(lines)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Rank genetic algorithm configurations for a board with '
+                                                 'successive halving.')
+    parser.add_argument('--task', type=int, default=1, help='number of lab1_test_problems/zad<N>.txt')
+    parser.add_argument('--configurations', type=int, default=27)
+    parser.add_argument('--min-generations', type=int, default=5)
+    parser.add_argument('--max-generations', type=int, default=75)
+    parser.add_argument('--eta', type=int, default=3, help='1/eta of the configurations survive every rung')
+    parser.add_argument('--seeds', type=int, default=2, help='runs per configuration')
+    parser.add_argument('--workers', type=int, default=None, help='process count, all cores by default')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the configuration sample')
+    parser.add_argument('--json', help='write the ranking to this file')
+    arguments = parser.parse_args()
+    try:
+        rung_budgets(arguments.min_generations, arguments.max_generations, arguments.eta)
+    except ValueError as error:
+        parser.error(str(error))
+    if (arguments.configurations <= 0 or arguments.seeds <= 0):
+        parser.error('--configurations and --seeds must be positive')
+    return arguments
+
+
+if __name__ == '__main__':
+    arguments = parse_arguments()
+    ranking, cost, exhaustive_cost = tune(read_config(arguments.task), arguments.configurations,
+                                          arguments.min_generations, arguments.max_generations, arguments.eta,
+                                          arguments.seeds, arguments.workers, arguments.seed)
+    print(markdown_table(ranking))
+    print(f'Offspring evaluated: {cost}, {cost / exhaustive_cost:.1%} of {EXHAUSTIVE_RUNS} full runs '
+          f'of every configuration')
+    if (arguments.json):
+        with open(arguments.json, 'w') as file:
+            json.dump({'ranking': ranking, 'cost': cost, 'exhaustive_cost': exhaustive_cost}, file, indent=2)
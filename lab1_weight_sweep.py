@@ -0,0 +1,100 @@
+import argparse
+import json
+from random import seed
+from lab1_genetic_algorithm import Board, FitnessCache, Population, evolve, read_config
+
+
+def components(solution):
+    return solution.total_length, solution.segment_count, solution.intersections
+
+
+def weighted(solution, weights: tuple):
+    # fitness under the given (length, segment, intersection) weights, from the stored components
+    return sum(weight * component for weight, component in zip(weights, components(solution)))
+
+
+def pareto_front(solutions):
+    # solutions not dominated in (total length, segment count, intersections), one per distinct triple,
+    # sorted by intersections, then segments, then length
+    distinct = {}
+    for solution in solutions:
+        distinct.setdefault(components(solution), solution)
+    front = []
+    for triple, solution in sorted(distinct.items(), key=lambda item: item[0][::-1]):
+        if (not any(all(a <= b for a, b in zip(other, triple)) for other, _ in front)):
+            front.append((triple, solution))
+    return [solution for _, solution in front]
+
+
+def sweep(board: Board, weight_vectors: list, population_size: int = 100, iteration_count: int = 30,
+          random_seed: int = 0, fitness_cache_size: int = 100_000, **parameters):
+    # Evolves one shared initial population once per weight vector. Initial components are calculated
+    # once and only reweighed, and all runs share one fitness cache, which stores components, so a
+    # solution met under any weights is not evaluated again. Every solution of every final population
+    # goes to the archive, which is scored under every weight vector without any recalculation.
+    seed(random_seed)
+    initial_population = Population(population_size)
+    initial_population.initialize(board)
+    fitness_cache = FitnessCache(fitness_cache_size) if fitness_cache_size > 0 else None
+    archive = {}
+    runs = []
+    for weights in weight_vectors:
+        population = initial_population.copy()
+        population.reweigh(*weights)
+        snapshot = None
+        for snapshot in evolve(board, population_size=population_size, fitness_length_weight=weights[0],
+                               fitness_segment_weight=weights[1], fitness_intersection_weight=weights[2],
+                               iteration_count=iteration_count, random_seed=random_seed,
+                               fitness_cache=fitness_cache, initial_population=population, **parameters):
+            pass
+        runs.append((weights, snapshot.best_solution))
+        for solution in [snapshot.best_solution, *snapshot.population]:
+            archive.setdefault(solution.canonical(), solution)
+    results = []
+    for weights, best_solution in runs:
+        archive_best = min(archive.values(), key=lambda solution: weighted(solution, weights))
+        results.append({'weights': list(weights),
+                        'run_best': weighted(best_solution, weights),
+                        'run_best_components': list(components(best_solution)),
+                        'archive_best': weighted(archive_best, weights),
+                        'archive_best_components': list(components(archive_best))})
+    return {'runs': results,
+            'pareto_front': [list(components(solution)) for solution in pareto_front(archive.values())],
+            'archive_size': len(archive),
+            'cache_hits': fitness_cache.hits if fitness_cache is not None else 0,
+            'cache_misses': fitness_cache.misses if fitness_cache is not None else 0}
+
+
+def parse_weights(value: str):
+    length_weight, segment_weight, intersection_weight = (float(weight) for weight in value.split(','))
+    return length_weight, segment_weight, intersection_weight
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Evolve one board under several fitness weightings and '
+                                                 'report the Pareto front of the components.')
+    parser.add_argument('--task', type=int, default=1, help='number of lab1_test_problems/zad<N>.txt')
+    parser.add_argument('--weights', type=parse_weights, action='append', metavar='LENGTH,SEGMENT,INTERSECTION',
+                        help='may be given several times, 1,20,1000 by default')
+    parser.add_argument('--population-size', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='write the report to this file')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    arguments = parse_arguments()
+    report = sweep(read_config(arguments.task), arguments.weights or [(1, 20, 1000)], arguments.population_size,
+                   arguments.iterations, arguments.seed)
+    print('|Weights|Run best|Archive best|Length|Segments|Intersections|')
+    print('|------:|:------:|:----------:|:----:|:------:|:-----------:|')
+    for run in report['runs']:
+        print(f"|{'/'.join(f'{weight:g}' for weight in run['weights'])}|{run['run_best']:.0f}"
+              f"|{run['archive_best']:.0f}|" + '|'.join(str(c) for c in run['archive_best_components']) + '|')
+    print('Pareto front (length, segments, intersections):', *map(tuple, report['pareto_front']))
+    print(f"Archive: {report['archive_size']} solutions, cache hits: {report['cache_hits']}, "
+          f"misses: {report['cache_misses']}")
+    if (arguments.json):
+        with open(arguments.json, 'w') as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,93 @@
+from lab1_genetic_algorithm import (AdaptiveOperators, AdaptivePursuit, Population, produce_offspring, read_config,
+                                    evolve)
+from lab1_telemetry import Telemetry
+from random import seed
+import json
+import os
+import pytest
+
+
+def test_pursuit_moves_to_best_operator():
+    pursuit = AdaptivePursuit(('a', 'b', 'c'), [0.2, 0.4, 0.4], p_min=0.1)
+    for _ in range(50):
+        pursuit.record(0, 0.5)
+        pursuit.record(1, 0)
+        pursuit.step()
+    assert pursuit.probabilities[0] == pytest.approx(0.8)
+    assert pursuit.probabilities[1] == pytest.approx(0.1)
+    assert sum(pursuit.probabilities) == pytest.approx(1)
+    assert pursuit.statistics == {'a': [50, 50, 25.0], 'b': [50, 0, 0.0], 'c': [0, 0, 0.0]}
+
+
+def test_pursuit_steps_once_per_generation():
+    pursuit = AdaptivePursuit(('a', 'b'), [0.5, 0.5], p_min=0.1, beta=0.1)
+    for _ in range(100):
+        pursuit.record(0, 0.5)
+    assert pursuit.probabilities == [0.5, 0.5]
+    pursuit.step()
+    assert pursuit.probabilities[0] == pytest.approx(0.54)
+    pursuit.step()
+    assert pursuit.probabilities[0] == pytest.approx(0.54)
+
+
+def test_rates_do_not_saturate():
+    rates = [snapshot.operator_rates for snapshot in evolve(read_config(1), population_size=100, iteration_count=10,
+                                                            random_seed=0, adaptive_operators=True)]
+    for previous, current in zip(rates, rates[1:]):
+        assert abs(current['crossover_prob'] - previous['crossover_prob']) <= 0.1
+        assert abs(current['mutation_prob'] - previous['mutation_prob']) <= 0.1
+    assert rates[1]['crossover_prob'] < 0.95 and rates[1]['mutation_prob'] < 0.95
+    assert not all(rate['crossover_prob'] == pytest.approx(0.95) and rate['mutation_prob'] == pytest.approx(0.95)
+                   for rate in rates[1:])
+
+
+def test_initial_rates():
+    rates = AdaptiveOperators(0.6, 0.35, 0.6).rates()
+    assert rates['crossover_prob'] == pytest.approx(0.6)
+    assert rates['even_split_share'] == pytest.approx(0.5)
+    assert rates['mutation_prob'] == pytest.approx(0.35)
+    assert rates['reroll_prob'] == pytest.approx(0.6)
+
+
+def test_produce_offspring():
+    board = read_config(1)
+    seed(0)
+    population = Population(20)
+    population.initialize(board)
+    operators = AdaptiveOperators(0.6, 0.35, 0.6)
+    offspring = produce_offspring(population, board, 50, 0.6, 0.35, True, 0.6, 1, 20, 1000, 4,
+                                  operators=operators)
+    assert operators.rates()['crossover_prob'] == pytest.approx(0.6)
+    operators.end_generation()
+    assert len(offspring) == 50
+    statistics = operators.statistics()
+    assert sum(statistics[name][0] for name in AdaptiveOperators.CROSSOVERS) > 0
+    assert sum(statistics[name][0] for name in AdaptiveOperators.MUTATIONS) > 0
+    for solution in offspring:
+        evaluated = solution.copy()
+        evaluated.calculate_fitness(1, 20, 1000)
+        assert evaluated.fitness == solution.fitness
+
+
+def test_rates_logged(tmp_path):
+    sink = os.path.join(tmp_path, 'telemetry.jsonl')
+    with Telemetry(sink) as telemetry:
+        for snapshot in evolve(read_config(1), population_size=20, iteration_count=3, random_seed=0,
+                               adaptive_operators=True):
+            telemetry.on_generation(snapshot)
+    with open(sink) as file:
+        records = [json.loads(line) for line in file]
+    assert len(records) == 4
+    assert all(set(record['operator_rates']) == {'crossover_prob', 'even_split_share', 'mutation_prob',
+                                                 'reroll_prob'} for record in records)
+    assert records[0]['operator_rates'] != records[-1]['operator_rates']
+
+
+def test_fixed_rates_not_logged():
+    assert next(evolve(read_config(1), population_size=10)).operator_rates is None
+
+
+def test_resume_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        next(evolve(read_config(1), population_size=10, adaptive_operators=True,
+                    resume_from=os.path.join(tmp_path, 'run.checkpoint')))
@@ -0,0 +1,50 @@
+from lab1_genetic_algorithm import (Point, Segment, Path, CompactPath, Solution, Population, read_config,
+                                    batch_fitness_components)
+from lab1_benchmarks import synthetic_board
+from random import seed
+import pytest
+
+pytest.importorskip('numpy')
+
+
+def make_path(points):
+    points = [Point(point[0], point[1]) for point in points]
+    return Path([Segment(points[i], points[i + 1]) for i in range(len(points) - 1)])
+
+
+@pytest.mark.parametrize('task_number', [0, 1, 2, 3])
+def test_batch_matches_scalar(task_number):
+    seed(task_number)
+    population = Population(60)
+    population.initialize(read_config(task_number))
+    expected = [(solution.fitness, solution.intersection_matrix) for solution in population]
+    population.evaluate_batch()
+    assert [(solution.fitness, solution.intersection_matrix) for solution in population] == expected
+    population.evaluate_batch(0.5, 7.25, 333.3)
+    for solution, (_, matrix) in zip(population, expected):
+        assert solution.intersection_matrix == matrix
+        assert solution.fitness == solution.calculate_fitness(0.5, 7.25, 333.3)
+
+
+def test_batch_irregular_segments():
+    solutions = []
+    for paths in ([[(0, 0), (4, 0), (4, 0), (4, 4)], [(4, 0), (8, 0)]],
+                  [[(0, 0), (0, 0)], [(1, 1), (1, 1)], [(0, 0), (0, 3), (3, 3)]],
+                  [[(0, 0), (4, 0), (4, 4), (2, 4), (2, 0)], [(3, 0), (3, 4)]]):
+        solution = Solution()
+        solution.setPaths([make_path(path) for path in paths])
+        solutions.append(solution)
+    solutions[2].setPaths([CompactPath.from_path(path) for path in solutions[2]])
+    total_lengths, segment_counts, matrices = batch_fitness_components(solutions)
+    assert total_lengths == [solution.total_length for solution in solutions]
+    assert segment_counts == [solution.segment_count for solution in solutions]
+    assert matrices == [solution.intersection_matrix for solution in solutions]
+
+
+def test_batch_large_board():
+    seed(0)
+    population = Population(20)
+    population.initialize(synthetic_board(64, 64, 50))
+    expected = [(solution.fitness, solution.intersection_matrix) for solution in population]
+    population.evaluate_batch()
+    assert [(solution.fitness, solution.intersection_matrix) for solution in population] == expected
@@ -0,0 +1,45 @@
+from lab1_genetic_algorithm import Population, read_config, batch_routes, route
+from random import seed
+import pytest
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.mark.parametrize('task_number', [0, 1, 2, 3])
+def test_routes_are_valid(task_number):
+    board = read_config(task_number)
+    generator = np.random.default_rng(task_number)
+    for start_point, end_point in board.point_pairs:
+        for vertices in batch_routes(start_point, end_point, board, 500, generator, 0.75):
+            assert vertices[:2] == [start_point.x, start_point.y]
+            assert vertices[-2:] == [end_point.x, end_point.y]
+            assert len(vertices) // 2 - 1 <= 15
+            for i in range(0, len(vertices) - 2, 2):
+                assert vertices[i] == vertices[i + 2] or vertices[i + 1] == vertices[i + 3]
+            for i in range(0, len(vertices), 2):
+                assert 0 <= vertices[i] < board.width and 0 <= vertices[i + 1] < board.height
+
+
+def test_same_distribution_as_route():
+    board = read_config(1)
+    start_point, end_point = board.point_pairs[0]
+    count = 20000
+    seed(0)
+    expected = [route(start_point, end_point, board, 0.75)[0] for _ in range(count)]
+    batch = batch_routes(start_point, end_point, board, count, np.random.default_rng(0), 0.75)
+    for statistic in [lambda vertices: len(vertices) // 2 - 1, lambda vertices: vertices[2] - vertices[0]]:
+        assert abs(sum(map(statistic, batch)) - sum(map(statistic, expected))) / count < 0.1
+
+
+def test_initialize_with_batch_routing():
+    board = read_config(3)
+    populations = []
+    for _ in range(2):
+        seed(0)
+        population = Population(30)
+        population.initialize(board, batch_routing=True)
+        populations.append(population)
+    assert populations[0].solutions == populations[1].solutions
+    for solution in populations[0]:
+        fitness = solution.fitness
+        assert solution.calculate_fitness(1, 20, 1000) == fitness
@@ -0,0 +1,23 @@
+from lab1_benchmarks import synthetic_board, compare
+import pytest
+
+
+@pytest.mark.parametrize('style', ['random', 'bus'])
+def test_synthetic_board(style):
+    board = synthetic_board(64, 64, 50, style)
+    assert len(board.point_pairs) == 50
+    points = [(point.x, point.y) for pair in board.point_pairs for point in pair]
+    assert len(set(points)) == len(points)
+    assert all(0 <= x < board.width and 0 <= y < board.height for x, y in points)
+    assert synthetic_board(64, 64, 50, style).point_pairs == board.point_pairs
+
+
+def test_synthetic_board_too_small():
+    with pytest.raises(ValueError):
+        synthetic_board(4, 4, 9)
+
+
+def test_compare_reports_regressions():
+    baseline = {'zad1': {'pathfinding': 1.0, 'generation': 2.0}}
+    current = {'zad1': {'pathfinding': 1.2, 'generation': 3.0, 'copy': 1.0}}
+    assert compare(baseline, current, 0.25) == [('zad1', 'generation', 2.0, 3.0)]
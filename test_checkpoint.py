@@ -0,0 +1,76 @@
+from lab1_genetic_algorithm import (CHECKPOINT_HEADER, Solution, CompactPath, Checkpoint, Population, read_config,
+                                    evolve)
+from random import random, seed, setstate
+import struct
+import pytest
+
+
+@pytest.mark.parametrize('path_class', [Solution.path_class, CompactPath])
+def test_round_trip(path_class, tmp_path, monkeypatch):
+    monkeypatch.setattr(Solution, 'path_class', path_class)
+    seed(0)
+    population = Population(20)
+    population.initialize(read_config(1))
+    best_solution = population.evaluate()[0]
+    file_name = str(tmp_path / 'run.checkpoint')
+    Checkpoint(population, best_solution, 7, 3, 1.5, 42).save(file_name)
+    expected = random()
+    seed(1)
+    checkpoint = Checkpoint.load(file_name)
+    assert (checkpoint.generation, checkpoint.last_improvement, checkpoint.elapsed, checkpoint.random_seed) == \
+           (7, 3, 1.5, 42)
+    assert checkpoint.best_solution == best_solution
+    for solution, loaded in zip(population, checkpoint.population):
+        assert loaded == solution
+        assert loaded.fitness == solution.fitness
+        assert loaded.intersection_matrix == solution.intersection_matrix
+    setstate(checkpoint.random_state)
+    assert random() == expected
+
+
+def test_resume_continues_exactly(tmp_path):
+    board = read_config(3)
+    file_name = str(tmp_path / 'run.checkpoint')
+    uninterrupted = list(evolve(board, population_size=40, iteration_count=6, random_seed=5))
+    run = evolve(board, population_size=40, iteration_count=6, random_seed=5,
+                 checkpoint_file=file_name, checkpoint_interval=3)
+    for snapshot in run:
+        if (snapshot.generation == 4):
+            break
+    run.close()
+    resumed = list(evolve(board, population_size=40, iteration_count=6, resume_from=file_name))
+    assert [snapshot.generation for snapshot in resumed] == [3, 4, 5, 6]
+    assert resumed[-1].best_solution == uninterrupted[-1].best_solution
+    assert resumed[-1].population.solutions == uninterrupted[-1].population.solutions
+
+
+def test_load_rejects_other_files(tmp_path):
+    file_name = tmp_path / 'other.bin'
+    file_name.write_bytes(b'\0' * 100)
+    with pytest.raises(ValueError):
+        Checkpoint.load(str(file_name))
+
+
+def test_little_endian_layout(tmp_path):
+    seed(0)
+    population = Population(5)
+    population.initialize(read_config(1))
+    file_name = tmp_path / 'run.checkpoint'
+    checkpoint = Checkpoint(population, population.evaluate()[0], 1)
+    checkpoint.save(str(file_name))
+    data = file_name.read_bytes()
+    assert struct.unpack_from('<625I', data, CHECKPOINT_HEADER.size) == checkpoint.random_state[1]
+    total_length, segment_count = struct.unpack_from('<2q', data, CHECKPOINT_HEADER.size + 625 * 4)
+    assert (total_length, segment_count) == (population.solutions[0].total_length,
+                                             population.solutions[0].segment_count)
+
+
+def test_load_rejects_truncated_files(tmp_path):
+    seed(0)
+    population = Population(5)
+    population.initialize(read_config(1))
+    file_name = tmp_path / 'run.checkpoint'
+    Checkpoint(population, population.evaluate()[0], 1).save(str(file_name))
+    file_name.write_bytes(file_name.read_bytes()[:-2])
+    with pytest.raises(ValueError):
+        Checkpoint.load(str(file_name))
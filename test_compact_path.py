@@ -0,0 +1,53 @@
+from lab1_genetic_algorithm import CompactPath, Path, Solution, Board, read_config, pathfinding
+from lab1_path_encodings import create_population
+from random import seed
+import pytest
+
+
+@pytest.mark.parametrize('path_before, path_after, segment_to_shift, shift_length, shift_direction',
+                         [([(0, 0), (4, 0), (4, 4), (8, 4), (8, 8)],
+                           [(0, 0), (8, 0), (8, 8)], 1, 4, 1),
+                          ([(0, 4), (4, 4), (4, 8), (8, 8), (8, 4), (12, 4)],
+                           [(0, 4), (12, 4)], 2, 4, 0),
+                          ([(6, 0), (6, 10), (5, 10), (5, 11), (6, 11)],
+                           [(6, 0), (6, 11)], 1, 1, 1),
+                          ([(0, 6), (0, 3), (3, 3), (3, 0), (6, 0), (6, 3), (4, 3), (4, 5)],
+                           [(0, 6), (0, 3), (3, 3), (3, 0), (4, 0), (4, 5)], 5, 3, 0)])
+def test_compact_mutation_shift(path_before, path_after, segment_to_shift, shift_length, shift_direction):
+    solution = Solution()
+    solution.setPaths([CompactPath([coordinate for point in path_before for coordinate in point])])
+    solution.mutate_shift(Board(20, 20, []), True, segment_to_shift, shift_length, shift_direction)
+    assert solution.paths[0] == CompactPath([coordinate for point in path_after for coordinate in point])
+
+
+@pytest.mark.parametrize('task_number', [1, 3])
+def test_compact_path_matches_path(task_number):
+    board = read_config(task_number)
+    for i in range(20):
+        start_point, end_point = board.point_pairs[i % len(board.point_pairs)]
+        seed(i)
+        segments, length = pathfinding(start_point, end_point, board, 0.75)
+        seed(i)
+        compact_path = CompactPath()
+        compact_path.create_random(start_point, end_point, board)
+        assert compact_path.coordinates() == Path(segments).coordinates()
+        assert compact_path.length == length == compact_path.calculate_length()
+
+
+def test_compact_solution_fitness():
+    board = read_config(1)
+    seed(0)
+    solution = Solution()
+    solution.random_solve(board)
+    compact_solution = Solution()
+    compact_solution.setPaths([CompactPath.from_path(path) for path in solution])
+    assert compact_solution.fitness == solution.fitness
+    assert compact_solution.intersection_matrix == solution.intersection_matrix
+
+
+def test_create_population_restores_path_class(monkeypatch):
+    monkeypatch.setattr(Solution, 'path_class', CompactPath)
+    seed(0)
+    population = create_population(read_config(1), Path, 3)
+    assert all(isinstance(path, Path) for solution in population for path in solution)
+    assert Solution.path_class is CompactPath
@@ -0,0 +1,63 @@
+from lab1_genetic_algorithm import Solution, FitnessCache, read_config, evolve, genetic_algorithm
+import lab1_genetic_algorithm as ga
+from itertools import islice
+import pytest
+
+
+@pytest.fixture
+def board():
+    return read_config(1)
+
+
+def test_snapshots(board):
+    snapshots = list(evolve(board, population_size=30, iteration_count=4, random_seed=0))
+    assert [snapshot.generation for snapshot in snapshots] == [0, 1, 2, 3, 4]
+    assert [snapshot.stop_reason for snapshot in snapshots] == [None] * 4 + ['iteration_count']
+    fitness = [snapshot.best_fitness for snapshot in snapshots]
+    assert fitness == sorted(fitness, reverse=True)
+    assert all(snapshot.best_solution.fitness == snapshot.best_fitness for snapshot in snapshots)
+    assert snapshots[-1].best_solution == genetic_algorithm(board, 0.6, 0.35, 30, True, 0.6, 4, 1, 20, 1000, 4,
+                                                            random_seed=0, verbose=False)
+
+
+@pytest.mark.parametrize('criteria, stop_reason', [({'target_fitness': float('inf')}, 'target_fitness'),
+                                                   ({'time_budget': 0}, 'time_budget'),
+                                                   ({'stagnation_limit': 0}, 'stagnation')])
+def test_stopping_criteria(board, criteria, stop_reason):
+    snapshots = list(evolve(board, population_size=10, random_seed=0, **criteria))
+    assert len(snapshots) == 1
+    assert snapshots[0].stop_reason == stop_reason
+
+
+def test_stagnation(board):
+    snapshots = list(evolve(board, population_size=10, mutation_prob=0, crossover_prob=0, stagnation_limit=3,
+                            random_seed=0))
+    assert snapshots[-1].stop_reason == 'stagnation'
+    assert snapshots[-1].generation == 3
+
+
+def test_closing_restores_cache(board):
+    cache = FitnessCache(100)
+    for snapshot in islice(evolve(board, population_size=10, fitness_cache=cache), 2):
+        assert Solution.fitness_cache is cache
+    assert Solution.fitness_cache is None
+    assert cache.misses > 0
+
+
+def test_class_cache_kept(board, monkeypatch):
+    cache = FitnessCache(100)
+    monkeypatch.setattr(Solution, 'fitness_cache', cache)
+    for snapshot in evolve(board, population_size=10, iteration_count=2, random_seed=0):
+        assert Solution.fitness_cache is cache
+    assert Solution.fitness_cache is cache
+    assert cache.misses > 0
+
+
+def test_interrupted_before_first_generation(board, monkeypatch):
+    def interrupted(*args):
+        raise KeyboardInterrupt
+        yield
+
+    monkeypatch.setattr(ga, 'evolve', interrupted)
+    with pytest.raises(RuntimeError):
+        genetic_algorithm(board, 0.6, 0.35, 10, True, 0.6, 4, 1, 20, 1000, verbose=False)
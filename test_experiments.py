@@ -0,0 +1,18 @@
+from lab1_experiments import run_experiment, summarize, markdown_row
+
+
+def test_experiment_is_reproducible():
+    parameters = {'population_size': 30, 'iteration_count': 3}
+    first = run_experiment(1, parameters, range(2), workers=2)
+    second = run_experiment(1, parameters, range(2), workers=1)
+    assert [record['best'] for record in first] == [record['best'] for record in second]
+    assert [record['seed'] for record in first] == [0, 1]
+
+
+def test_summary():
+    records = [{'best': fitness, 'survived': survived, 'time': 2, 'time_per_generation': 0.5}
+               for fitness, survived in [(100, True), (200, False), (300, True), (400, True)]]
+    summary = summarize(records)
+    assert (summary['Best'], summary['Worst'], summary['Average']) == (100, 400, 250)
+    assert summary['Survivability'] == 0.75
+    assert markdown_row(4, summary) == '|4|100|400|250|129|75%|'
@@ -0,0 +1,52 @@
+from lab1_genetic_algorithm import Solution, CompactPath, FitnessCache, read_config
+from random import seed
+import pytest
+
+
+def test_lru_eviction():
+    cache = FitnessCache(2)
+    cache.put((1,), 'a')
+    cache.put((2,), 'b')
+    assert cache.get((1,)) == 'a'
+    cache.put((3,), 'c')
+    assert cache.get((2,)) is None
+    assert cache.get((3,)) == 'c'
+    assert (len(cache), cache.hits, cache.misses) == (2, 2, 1)
+    with pytest.raises(ValueError):
+        FitnessCache(0)
+
+
+def test_canonical_form_independent_of_encoding():
+    seed(0)
+    solution = Solution()
+    solution.random_solve(read_config(1))
+    compact = Solution()
+    compact.setPaths([CompactPath.from_path(path) for path in solution])
+    assert solution.canonical() == compact.canonical()
+    assert hash(solution.paths[0]) == hash(compact.paths[0])
+
+
+@pytest.mark.parametrize('task_number', [1, 3])
+def test_cached_fitness_matches_evaluation(task_number, monkeypatch):
+    cache = FitnessCache(50)
+    monkeypatch.setattr(Solution, 'fitness_cache', cache)
+    seed(task_number)
+    board = read_config(task_number)
+    solutions = []
+    for _ in range(10):
+        solution = Solution()
+        solution.random_solve(board)
+        solutions.append(solution)
+    for i in range(200):
+        child = solutions[i % 10].crossover_with_random_genes(solutions[(i * 7) % 10], 1, 20, 1000)
+        child.mutate_shift(board, reroll_prob=0.3)
+        for weights in [(1, 20, 1000), (0.5, 3, 700)]:
+            child.setPaths(child.paths, *weights)
+            cached = (child.fitness, child.intersections, [row[:] for row in child.intersection_matrix])
+            Solution.fitness_cache = None
+            child.calculate_fitness(*weights)
+            Solution.fitness_cache = cache
+            assert cached == (child.fitness, child.intersections, child.intersection_matrix)
+        solutions[i % 10] = child
+    assert cache.hits > 0
+    assert len(cache) == 50
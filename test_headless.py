@@ -0,0 +1,59 @@
+from lab1_genetic_algorithm import Solution, read_config, render
+from random import seed
+from xml.dom import minidom
+import subprocess
+import sys
+import pytest
+
+# self import time of the core module in seconds (measured 33-40 ms, see readme.md), generous so slow
+# machines pass; the time of the modules it imports, numpy included, is not counted
+IMPORT_TIME_BUDGET = 0.25
+
+# modules the core only imports when a feature needs them, so a plain import stays cheap
+LAZY_MODULES = ['tkinter', 'PIL', 'concurrent.futures', 'multiprocessing', 'lab1_maze_router', 'lab1_route_library',
+                'lab1_local_search', 'pytest']
+
+
+def test_core_imports_without_gui_and_pytest():
+    code = f'import sys, lab1_genetic_algorithm; print(sorted(set({LAZY_MODULES!r}) & set(sys.modules)))'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_import_time_budget():
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import lab1_genetic_algorithm'],
+                            capture_output=True, text=True, check=True)
+    self_times = {}
+    for line in result.stderr.splitlines()[1:]:
+        own, _, name = line.split('|')
+        self_times[name.strip()] = int(own.split(':')[1])
+    assert self_times['lab1_genetic_algorithm'] / 1e6 < IMPORT_TIME_BUDGET
+
+
+@pytest.fixture
+def solution():
+    seed(0)
+    solution = Solution()
+    solution.random_solve(read_config(1))
+    return solution
+
+
+def test_render_svg(solution, tmp_path):
+    board = read_config(1)
+    file_name = str(tmp_path / 'solution.svg')
+    render(board, solution, file_name)
+    document = minidom.parse(file_name)
+    assert len(document.getElementsByTagName('polyline')) == len(solution.paths)
+    assert len(document.getElementsByTagName('ellipse')) == board.width * board.height + 2 * len(board.point_pairs)
+
+
+def test_render_png(solution, tmp_path):
+    pytest.importorskip('PIL')
+    file_name = tmp_path / 'solution.png'
+    render(read_config(1), solution, str(file_name))
+    assert file_name.read_bytes().startswith(b'\x89PNG')
+
+
+def test_render_unknown_format(solution, tmp_path):
+    with pytest.raises(ValueError):
+        render(read_config(1), solution, str(tmp_path / 'solution.bmp'))
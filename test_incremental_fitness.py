@@ -0,0 +1,51 @@
+from lab1_genetic_algorithm import Solution, read_config
+from copy import deepcopy
+from random import seed, random
+import pytest
+
+
+def assert_consistent(solution):
+    fresh = Solution()
+    fresh.setPaths(deepcopy(solution.paths))
+    assert solution.intersection_matrix == fresh.intersection_matrix
+    assert solution.total_length == fresh.total_length
+    assert solution.segment_count == fresh.segment_count
+    assert solution.fitness == fresh.fitness
+
+
+@pytest.mark.parametrize('task_number', [1, 2, 3])
+def test_components_follow_mutations_and_crossovers(task_number):
+    seed(task_number)
+    board = read_config(task_number)
+    solutions = []
+    for _ in range(10):
+        solution = Solution()
+        solution.random_solve(board)
+        solutions.append(solution)
+    for i in range(60):
+        first, second = solutions[i % 10], solutions[(i * 7 + 3) % 10]
+        if (random() < 0.5):
+            child = first.crossover_with_random_genes(second)
+        else:
+            child = first.crossover_with_even_genes_distribution(second)
+        assert_consistent(child)
+        parents = [str(path) for path in first], [str(path) for path in second]
+        child = child.copy()
+        child.mutate_shift(board, reroll_prob=0.5)
+        assert_consistent(child)
+        assert ([str(path) for path in first], [str(path) for path in second]) == parents
+        solutions[i % 10] = child
+
+
+def test_reroll_given_path():
+    seed(0)
+    board = read_config(1)
+    solution = Solution()
+    solution.random_solve(board)
+    other = solution.copy()
+    given_path = solution.paths[1]
+    solution.mutate_reroll(board, given_path)
+    assert solution.paths[0] is other.paths[0]
+    assert_consistent(solution)
+    with pytest.raises(ValueError):
+        solution.mutate_reroll(board, deepcopy(solution.paths[0]))
@@ -0,0 +1,35 @@
+from lab1_genetic_algorithm import (Point, Segment, Path, Solution, read_config,
+                                    pairwise_intersections, indexed_intersections)
+from random import seed
+import pytest
+
+
+def make_path(points):
+    points = [Point(point[0], point[1]) for point in points]
+    return Path([Segment(points[i], points[i + 1]) for i in range(len(points) - 1)])
+
+
+@pytest.mark.parametrize('paths, intersections',
+                         [([[(0, 2), (4, 2)], [(2, 0), (2, 4)]], 1),
+                          ([[(0, 2), (4, 2)], [(4, 0), (4, 4)]], 1),
+                          ([[(0, 2), (4, 2)], [(5, 0), (5, 4)]], 0),
+                          ([[(0, 2), (4, 2)], [(2, 2), (6, 2)]], 3),
+                          ([[(0, 0), (0, 5)], [(0, 5), (0, 9)]], 1),
+                          ([[(0, 0), (0, 5)], [(1, 0), (1, 5)]], 0),
+                          ([[(0, 0), (4, 0), (4, 4), (2, 4), (2, 0)]], 1),
+                          ([[(0, 0), (4, 0), (4, 4), (2, 4), (2, 0)], [(3, 0), (3, 4)]], 3),
+                          ([[(0, 0), (4, 0), (4, 0), (4, 4)], [(4, 0), (8, 0)]], 3)])
+def test_intersection_counts(paths, intersections):
+    paths = [make_path(path) for path in paths]
+    assert pairwise_intersections(paths) == intersections
+    assert indexed_intersections(paths) == intersections
+
+
+@pytest.mark.parametrize('task_number', [0, 1, 2, 3])
+def test_indexed_matches_pairwise(task_number):
+    seed(task_number)
+    board = read_config(task_number)
+    for _ in range(50):
+        solution = Solution()
+        solution.random_solve(board)
+        assert indexed_intersections(solution.paths) == pairwise_intersections(solution.paths)
@@ -0,0 +1,39 @@
+from lab1_genetic_algorithm import Population, read_config
+from lab1_islands import island_model, migrate, migration_targets
+from random import Random, seed
+import pytest
+
+
+@pytest.mark.parametrize('island_count', [2, 3, 5])
+def test_random_topology_has_no_self_migration(island_count):
+    targets = migration_targets(island_count, 'random', Random(0))
+    assert sorted(targets) == list(range(island_count))
+    assert all(target != island for island, target in enumerate(targets))
+
+
+def test_migration_replaces_worst():
+    seed(0)
+    board = read_config(1)
+    populations = []
+    for _ in range(2):
+        population = Population(10)
+        population.initialize(board)
+        populations.append(population)
+    best = populations[0].evaluate()[:3]
+    worst = populations[1].evaluate()[-3:]
+    migrate(populations, 3, migration_targets(2, 'ring', Random(0)))
+    assert len(populations[1].solutions) == 10
+    for solution in best:
+        assert any(solution == migrant for migrant in populations[1])
+    for solution in worst:
+        assert all(solution is not survivor for survivor in populations[1])
+
+
+def test_island_model_reproducible():
+    board = read_config(1)
+    results = [island_model(board, island_count=2, population_size=20, iteration_count=4,
+                            migration_interval=2, migration_size=2, topology='random', random_seed=3,
+                            island_parameters=[{'tournament_size': 2}, {'reroll_prob': 0.3}])
+               for _ in range(2)]
+    assert results[0] == results[1]
+    assert results[0].fitness == results[1].fitness
@@ -0,0 +1,68 @@
+from lab1_genetic_algorithm import Population, read_config, draw, SvgCanvas
+from lab1_live_view import LiveView, SolverThread
+from random import seed
+import pytest
+
+
+class RecordingCanvas(SvgCanvas):
+    # SvgCanvas with item ids and coords, like a tkinter canvas
+    def __init__(self):
+        super().__init__(100, 100)
+        self.moved = []
+
+    def create_line(self, *coordinates, fill='#000000', width=1):
+        super().create_line(*coordinates, fill=fill, width=width)
+        return len(self.elements) - 1
+
+    def coords(self, item, *coordinates):
+        self.moved.append((item, coordinates))
+
+
+@pytest.fixture
+def board():
+    return read_config(1)
+
+
+def test_only_changed_paths_redrawn(board):
+    seed(0)
+    population = Population(2)
+    population.initialize(board)
+    canvas = RecordingCanvas()
+    view = LiveView(canvas, board, 10)
+    assert view.update(population.solutions[0]) == len(board.point_pairs)
+    item_count = len(canvas.elements)
+    assert view.update(population.solutions[0]) == 0
+    solution = population.solutions[0].copy()
+    solution.mutate_reroll(board)
+    assert view.update(solution) == 1
+    assert len(canvas.elements) == item_count
+    assert len(canvas.moved) == 1
+
+
+def test_same_drawing_as_draw(board):
+    seed(0)
+    population = Population(1)
+    population.initialize(board)
+    live = RecordingCanvas()
+    LiveView(live, board, 10).update(population.solutions[0])
+    static = RecordingCanvas()
+    draw(static, 10, population.solutions[0], board)
+    assert live.elements == static.elements
+
+
+def test_solver_thread(board):
+    solver = SolverThread(board, population_size=10, iteration_count=3, random_seed=0)
+    solver.start()
+    solver.join(30)
+    assert not solver.is_alive()
+    assert solver.snapshot.generation == 3
+    assert solver.snapshot.stop_reason == 'iteration_count'
+
+
+def test_solver_thread_stop(board):
+    solver = SolverThread(board, population_size=10, random_seed=0)
+    solver.start()
+    solver.stop()
+    solver.join(30)
+    assert not solver.is_alive()
+    assert solver.snapshot is not None
@@ -0,0 +1,69 @@
+from lab1_genetic_algorithm import Population, Solution, CompactPath, Path, read_config, evolve
+from lab1_local_search import shift_moves, segment_index, shift_delta, hill_climb, local_search
+from random import seed
+import pytest
+
+
+@pytest.fixture(params=[Path, CompactPath])
+def population(request, monkeypatch):
+    monkeypatch.setattr(Solution, 'path_class', request.param)
+    seed(0)
+    population = Population(10)
+    population.initialize(read_config(1))
+    return population
+
+
+def test_shift_delta_matches_full_evaluation(population):
+    board = read_config(1)
+    solution = population.solutions[0]
+    fitness = solution.fitness
+    paths = solution.paths[:]
+    index = segment_index(solution)
+    for path_id, path in enumerate(paths):
+        vertices = path.to_vertices()
+        for move in shift_moves(vertices, board):
+            delta = shift_delta(solution, path_id, vertices, move, index)
+            shifted = solution.copy()
+            shifted.shift_path(path_id, *move)
+            assert shifted.fitness - fitness == delta
+    assert solution.paths == paths
+    assert solution.fitness == fitness
+
+
+@pytest.mark.parametrize('best_improvement', [False, True])
+def test_hill_climb(population, best_improvement):
+    board = read_config(1)
+    solution = population.solutions[0].copy()
+    assert hill_climb(solution, board, best_improvement) > 0
+    assert solution.fitness < population.solutions[0].fitness
+    index = segment_index(solution)
+    for path_id, path in enumerate(solution):
+        vertices = path.to_vertices()
+        assert all(shift_delta(solution, path_id, vertices, move, index) >= 0
+                   for move in shift_moves(vertices, board))
+    evaluated = solution.copy()
+    evaluated.calculate_fitness(1, 20, 1000)
+    assert evaluated.fitness == solution.fitness
+
+
+def test_local_search(population):
+    solutions = population.solutions
+    best_fitness = min(solution.fitness for solution in solutions)
+    improved = local_search(population, read_config(1), elite_count=2, time_budget=10)
+    assert improved
+    assert population.solutions is solutions
+    assert len(solutions) == 10
+    assert solutions[0].fitness < best_fitness
+    assert [solution.fitness for solution in solutions] == sorted(solution.fitness for solution in solutions)
+
+
+def test_zero_budget(population):
+    assert local_search(population, read_config(1), time_budget=0) == []
+
+
+@pytest.mark.parametrize('steady_state', [False, True])
+def test_evolve_with_local_search(steady_state):
+    snapshots = list(evolve(read_config(1), population_size=20, iteration_count=4, random_seed=0,
+                            steady_state=steady_state, local_search_interval=2, local_search_budget=0.5))
+    assert snapshots[-1].best_fitness <= min(solution.fitness for solution in snapshots[-1].population)
+    assert snapshots[-1].best_fitness < snapshots[0].best_fitness
@@ -0,0 +1,92 @@
+from lab1_genetic_algorithm import Board, Point, Population, read_config
+from lab1_maze_router import MOVES, astar_route, cells_to_vertices, routed_solution
+from random import Random, seed
+import pytest
+
+
+def test_cells_to_vertices():
+    width = 10
+    cells = [y * width + x for x, y in [(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (3, 2)]]
+    assert cells_to_vertices(cells, width) == [0, 0, 2, 0, 2, 2, 3, 2]
+
+
+@pytest.mark.parametrize('task_number', [0, 1, 2, 3])
+def test_routed_solutions(task_number):
+    board = read_config(task_number)
+    solution = routed_solution(board, Random(task_number))
+    for path, (start_point, end_point) in zip(solution, board.point_pairs):
+        vertices = path.to_vertices()
+        assert vertices[:2] == [start_point.x, start_point.y]
+        assert vertices[-2:] == [end_point.x, end_point.y]
+    assert solution.calculate_fitness(1, 20, 1000) == solution.fitness
+    if (task_number in (0, 2)):
+        assert solution.intersections == 0
+
+
+@pytest.mark.parametrize('task_number', [1, 3])
+def test_router_finds_layouts_without_intersections(task_number):
+    board = read_config(task_number)
+    assert any(routed_solution(board, Random(i)).intersections == 0 for i in range(10))
+
+
+def test_initialize_with_routed_fraction():
+    seed(0)
+    board = read_config(1)
+    population = Population(20)
+    population.initialize(board, routed_fraction=0.25)
+    assert len(population.solutions) == 20
+    assert min(solution.fitness for solution in population) < 1000
+
+
+def route_cost(route, width, cell_costs, occupancy, history, length_weight=1, segment_weight=20,
+               intersection_weight=1000):
+    cost = 0
+    previous_orientation = 0
+    for cell, next_cell in zip(route, route[1:]):
+        orientation = 1 if abs(next_cell - cell) == 1 else 2
+        cost += (length_weight * cell_costs[next_cell]
+                 + intersection_weight * occupancy[next_cell] * (1 + history[next_cell]))
+        if (previous_orientation not in (0, orientation)):
+            cost += segment_weight
+        previous_orientation = orientation
+    return cost
+
+
+def dijkstra_cost(board, start, end, cell_costs, occupancy, history, length_weight=1, segment_weight=20,
+                  intersection_weight=1000):
+    # same search as astar_route without the heuristic
+    from heapq import heappop, heappush
+    width = board.width
+    best = {(start.y * width + start.x, 0): 0}
+    queue = [(0, start.y * width + start.x, 0)]
+    while (queue):
+        cost, cell, orientation = heappop(queue)
+        if (cell == end.y * width + end.x):
+            return cost
+        if (cost > best[(cell, orientation)]):
+            continue
+        y, x = divmod(cell, width)
+        for dx, dy, move_orientation in MOVES:
+            if (not (0 <= x + dx < width and 0 <= y + dy < board.height)):
+                continue
+            next_cell = (y + dy) * width + x + dx
+            next_cost = (cost + length_weight * cell_costs[next_cell]
+                         + intersection_weight * occupancy[next_cell] * (1 + history[next_cell])
+                         + (segment_weight if orientation not in (0, move_orientation) else 0))
+            if (next_cost < best.get((next_cell, move_orientation), float('inf'))):
+                best[(next_cell, move_orientation)] = next_cost
+                heappush(queue, (next_cost, next_cell, move_orientation))
+
+
+def test_astar_routes_are_cheapest():
+    rng = Random(0)
+    for _ in range(300):
+        width, height = rng.randint(3, 12), rng.randint(3, 12)
+        board = Board(width, height, [])
+        start, end = [Point(cell % width, cell // width) for cell in rng.sample(range(width * height), 2)]
+        cell_costs = [1 + rng.random() * 0.5 for _ in range(width * height)]
+        occupancy = [int(rng.random() < 0.2) for _ in range(width * height)]
+        history = [rng.randrange(3) for _ in range(width * height)]
+        route = astar_route(board, start, end, cell_costs, occupancy, history)
+        assert route_cost(route, width, cell_costs, occupancy, history) == pytest.approx(
+            dijkstra_cost(board, start, end, cell_costs, occupancy, history))
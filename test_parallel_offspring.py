@@ -0,0 +1,32 @@
+from lab1_genetic_algorithm import Solution, CompactPath, Population, read_config, genetic_algorithm
+from random import seed
+import pytest
+
+
+@pytest.mark.parametrize('path_class', [Solution.path_class, CompactPath])
+def test_population_pack_round_trip(path_class, monkeypatch):
+    monkeypatch.setattr(Solution, 'path_class', path_class)
+    seed(0)
+    board = read_config(1)
+    population = Population(20)
+    population.initialize(board)
+    unpacked = Population.unpack(population.pack())
+    for solution, copy in zip(population, unpacked):
+        assert copy == solution
+        assert copy.fitness == solution.fitness
+        assert copy.intersection_matrix == solution.intersection_matrix
+
+
+def run(workers, random_seed):
+    return genetic_algorithm(read_config(1), 0.6, 0.35, 40, True, 0.6, 3, 1, 20, 1000, 4,
+                             workers=workers, random_seed=random_seed)
+
+
+def test_workers_reproducible():
+    first = run(2, 5)
+    second = run(2, 5)
+    assert first == second
+    assert first.fitness == second.fitness
+    fitness = first.fitness
+    first.calculate_fitness(1, 20, 1000)
+    assert first.fitness == fitness
@@ -0,0 +1,85 @@
+from lab1_genetic_algorithm import Solution, pairwise_intersection_matrix, read_config, evolve
+from lab1_route_library import RouteLibrary
+from random import Random, seed
+import pytest
+
+
+@pytest.fixture(params=[0, 1, 3])
+def board(request):
+    return read_config(request.param)
+
+
+def test_candidates(board):
+    library = RouteLibrary(board)
+    for (start_point, end_point), paths, costs in zip(board.point_pairs, library.routes, library.costs):
+        assert costs == sorted(costs)
+        assert len({path.canonical() for path in paths}) == len(paths)
+        for path in paths:
+            vertices = path.to_vertices()
+            assert vertices[:2] == [start_point.x, start_point.y]
+            assert vertices[-2:] == [end_point.x, end_point.y]
+            assert len(path) <= 3
+            assert all(0 <= x < board.width and 0 <= y < board.height
+                       for x, y in zip(vertices[::2], vertices[1::2]))
+            assert all((x1 == x2) != (y1 == y2) for x1, y1, x2, y2 in path.coordinates())
+
+
+def test_conflicts(board):
+    library = RouteLibrary(board)
+    rng = Random(0)
+    for _ in range(200):
+        net, other_net = rng.sample(range(len(board.point_pairs)), 2)
+        i = rng.randrange(len(library.routes[net]))
+        j = rng.randrange(len(library.routes[other_net]))
+        matrix = pairwise_intersection_matrix([library.routes[net][i], library.routes[other_net][j]])
+        assert library.conflict(net, i, other_net, j) == matrix[0][1]
+
+
+def test_sampling(board, monkeypatch):
+    library = RouteLibrary(board, top=2)
+    monkeypatch.setattr(Solution, 'route_library', library)
+    seed(0)
+    solution = Solution()
+    solution.random_solve(board)
+    assert all(path is library.routes[net][0] or path is library.routes[net][1]
+               for net, path in enumerate(solution))
+    solution.mutate_reroll(board)
+    assert all(any(path is route for route in library.routes[net]) for net, path in enumerate(solution))
+    evaluated = solution.copy()
+    evaluated.calculate_fitness(1, 20, 1000)
+    assert evaluated.fitness == solution.fitness
+
+
+def test_evolve_with_route_library():
+    board = read_config(1)
+    snapshots = list(evolve(board, population_size=20, iteration_count=3, random_seed=0, route_library=True))
+    assert Solution.route_library is None
+    assert snapshots[-1].best_fitness <= snapshots[0].best_fitness
+
+
+def test_sampling_avoids_conflicts(board):
+    library = RouteLibrary(board)
+    seed(0)
+    paths = [library.sample(net) for net in range(len(board.point_pairs))]
+    positions = [library.routes[net].index(path) for net, path in enumerate(paths)]
+
+    def conflicts(net, path):
+        i = library.routes[net].index(path)
+        return sum(library.conflict(net, i, other_net, j) for other_net, j in enumerate(positions) if other_net != net)
+
+    for net in range(len(board.point_pairs)):
+        plain = sum(conflicts(net, library.sample(net)) for _ in range(300))
+        avoiding = sum(conflicts(net, library.sample(net, paths, tries=4)) for _ in range(300))
+        assert avoiding <= plain
+
+
+def test_sampling_prefers_cheap_routes():
+    library = RouteLibrary(read_config(3))
+    seed(0)
+    for net, paths in enumerate(library.routes):
+        positions = {id(path): i for i, path in enumerate(paths)}
+        counts = [0] * len(paths)
+        for _ in range(2000):
+            counts[positions[id(library.sample(net))]] += 1
+        if (library.costs[net][0] < library.costs[net][-1]):
+            assert counts[0] > counts[-1]
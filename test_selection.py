@@ -0,0 +1,57 @@
+from lab1_genetic_algorithm import Population, read_config
+from random import seed, uniform
+import pytest
+
+
+@pytest.fixture
+def population():
+    seed(0)
+    population = Population(50)
+    population.initialize(read_config(1))
+    return population
+
+
+def linear_roulette(population):
+    max_fitness = max(solution.fitness for solution in population)
+    fitness_sum = sum([max_fitness - solution.fitness for solution in population])
+    pick = uniform(0, fitness_sum)
+    current = 0
+    for solution in population:
+        current += max_fitness - solution.fitness
+        if (current >= pick):
+            return solution
+
+
+def test_roulette_matches_linear_scan(population):
+    seed(1)
+    expected = [linear_roulette(population) for _ in range(200)]
+    seed(1)
+    assert all(population.selection_roulette() is solution for solution in expected)
+
+
+def test_roulette_follows_new_generation(population):
+    population.selection_roulette()
+    population.solutions = population.solutions[:1]
+    assert population.selection_roulette() is population.solutions[0]
+
+
+def test_stochastic_universal_sampling_counts(population):
+    count = 500
+    max_fitness = max(solution.fitness for solution in population)
+    fitness_sum = sum(max_fitness - solution.fitness for solution in population)
+    selected = population.selection_stochastic_universal(count)
+    assert len(selected) == count
+    for solution in population:
+        expected = count * (max_fitness - solution.fitness) / fitness_sum
+        picks = sum(1 for parent in selected if parent is solution)
+        assert expected - 1 < picks < expected + 1
+
+
+@pytest.mark.parametrize('tournament_size', [1, 4])
+def test_tournament_batch(population, tournament_size):
+    winners = population.selection_tournament_batch(tournament_size, 300)
+    assert len(winners) == 300
+    assert all(any(winner is solution for solution in population) for winner in winners)
+    if (tournament_size > 1):
+        worst = max(population, key=lambda x: x.fitness)
+        assert all(winner is not worst for winner in winners)
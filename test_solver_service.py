@@ -0,0 +1,100 @@
+from lab1_genetic_algorithm import parse_board, read_config
+from lab1_solver_service import SolverService, board_from_json, make_server
+from urllib.parse import urlparse
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+from http.client import HTTPConnection
+from concurrent.futures.process import BrokenProcessPool
+import json
+import os
+import threading
+import pytest
+
+BOARD = '6;6\n1;1;4;1\n1;3;4;3\n'
+PARAMETERS = {'population_size': 10, 'iteration_count': 3, 'random_seed': 0}
+
+
+@pytest.fixture(scope='module')
+def url():
+    service = SolverService(workers=1, default_time_budget=5)
+    server = make_server(service, 'localhost', 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://localhost:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def post(url: str, body: str, content_type: str = 'text/plain', query: str = ''):
+    request = Request(url + '/solve' + query, body.encode(), {'Content-Type': content_type})
+    with urlopen(request, timeout=60) as response:
+        return [json.loads(line) for line in response]
+
+
+def test_parse_board():
+    with open('./lab1_test_problems/zad1.txt') as file:
+        board = parse_board(file.read().splitlines())
+    expected = read_config(1)
+    assert (board.width, board.height) == (expected.width, expected.height)
+    assert board.point_pairs == expected.point_pairs
+
+
+def test_board_from_json():
+    board = board_from_json({'width': 6, 'height': 6, 'pairs': [[1, 1, 4, 1], [1, 3, 4, 3]]})
+    assert board.point_pairs == parse_board(BOARD.splitlines()).point_pairs
+
+
+def test_text_board(url):
+    [result] = post(url, BOARD, query='?id=a&time_budget=0.2')
+    assert result['id'] == 'a'
+    assert len(result['paths']) == 2
+    assert result['time'] < 5
+
+
+def test_json_lines(url):
+    jobs = [{'id': i, 'board': BOARD, 'parameters': PARAMETERS} for i in range(3)]
+    jobs.append({'id': 'grid', 'width': 6, 'height': 6, 'pairs': [[1, 1, 4, 1]], 'parameters': PARAMETERS})
+    jobs.append({'id': 'bad', 'board': BOARD, 'parameters': {'unknown': 1}})
+    results = post(url, '\n'.join(json.dumps(job) for job in jobs), 'application/x-ndjson')
+    by_id = {result['id']: result for result in results}
+    assert set(by_id) == {0, 1, 2, 'grid', 'bad'}
+    assert all(by_id[i]['generations'] == 3 for i in range(3))
+    assert by_id[0]['fitness'] == by_id[1]['fitness']
+    assert by_id['grid']['fitness'] == 23
+    assert 'error' in by_id['bad']
+    with urlopen(url + '/metrics', timeout=10) as response:
+        metrics = json.load(response)
+    assert metrics['completed'] >= 5
+    assert metrics['failed'] >= 1
+    assert metrics['queued'] == 0
+    assert metrics['running'] == 0
+
+
+def test_bad_request(url):
+    with pytest.raises(HTTPError) as error:
+        post(url, 'not a board')
+    assert error.value.code == 400
+
+
+def test_bad_content_length(url):
+    connection = HTTPConnection(urlparse(url).netloc, timeout=10)
+    connection.putrequest('POST', '/solve')
+    connection.putheader('Content-Length', 'many')
+    connection.endheaders()
+    assert connection.getresponse().status == 400
+    connection.close()
+
+
+def test_worker_killed():
+    service = SolverService(workers=1)
+    try:
+        # a task that exits its worker process breaks the pool like a crash would
+        assert isinstance(service.executor.submit(os._exit, 1).exception(timeout=30), BrokenProcessPool)
+        results = service.submit('broken', parse_board(BOARD.splitlines()), parameters=PARAMETERS)
+        assert 'BrokenProcessPool' in results.get(timeout=30)['error']
+        result = service.submit('next', parse_board(BOARD.splitlines()), parameters=PARAMETERS).get(timeout=30)
+        assert result['generations'] == 3
+        assert service.metrics()['restarts'] == 1
+    finally:
+        service.close()
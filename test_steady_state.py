@@ -0,0 +1,66 @@
+from lab1_genetic_algorithm import Population, SteadyStateReplacement, read_config, evolve
+from random import seed
+import pytest
+
+
+@pytest.fixture
+def population():
+    seed(0)
+    population = Population(20)
+    population.initialize(read_config(1))
+    return population
+
+
+def test_sorted_in_place(population):
+    solutions = population.solutions
+    replacement = SteadyStateReplacement(population, elite_count=2)
+    worst = solutions[-1]
+    offspring = solutions[0].copy()
+    offspring.mutate_shift(read_config(1), only_shift=True)
+    assert replacement.offer(offspring) == (offspring.fitness <= worst.fitness
+                                            and offspring.canonical() != solutions[0].canonical())
+    assert population.solutions is solutions
+    assert len(solutions) == 20
+    assert [solution.fitness for solution in solutions] == sorted(solution.fitness for solution in solutions)
+
+
+def test_duplicates_rejected(population):
+    replacement = SteadyStateReplacement(population)
+    assert not replacement.offer(population.solutions[0].copy())
+    assert replacement.rejected == 1
+
+
+def test_worse_offspring_rejected(population):
+    replacement = SteadyStateReplacement(population, reject_duplicates=False)
+    worst = population.solutions[-1].copy()
+    worst.fitness += 1
+    assert not replacement.offer(worst)
+
+
+def test_elites_kept(population):
+    replacement = SteadyStateReplacement(population, elite_count=5, loser_tournament_size=3,
+                                         reject_duplicates=False)
+    best = population.solutions[0]
+    elite_fitness = [solution.fitness for solution in population.solutions[:5]]
+    for _ in range(50):
+        replacement.offer(population.solutions[-1].copy())
+    assert population.solutions[0] is best
+    assert [solution.fitness for solution in population.solutions[:5]] == elite_fitness
+
+
+def test_steady_state_evolve():
+    snapshots = list(evolve(read_config(1), population_size=30, iteration_count=5, random_seed=0,
+                            steady_state=True, steady_state_batch=4, loser_tournament_size=3))
+    populations = {id(snapshot.population) for snapshot in snapshots}
+    assert len(populations) == 1
+    fitness = [snapshot.best_fitness for snapshot in snapshots]
+    assert fitness == sorted(fitness, reverse=True)
+    solutions = snapshots[-1].population.solutions
+    assert len(solutions) == 30
+    assert len({solution.canonical() for solution in solutions}) == 30
+    assert solutions[0].fitness == snapshots[-1].best_fitness
+
+
+def test_workers_unsupported():
+    with pytest.raises(ValueError):
+        next(evolve(read_config(1), population_size=10, workers=2, steady_state=True))
@@ -0,0 +1,42 @@
+from lab1_genetic_algorithm import Solution, Population, read_config, genetic_algorithm
+import lab1_genetic_algorithm as ga
+from lab1_telemetry import Telemetry
+import json
+import tracemalloc
+
+
+def run(telemetry=None):
+    return genetic_algorithm(read_config(1), 0.6, 0.35, 30, True, 0.6, 4, 1, 20, 1000, 4,
+                             random_seed=0, verbose=False, telemetry=telemetry)
+
+
+def test_telemetry_records_generations(tmp_path):
+    originals = (Solution.copy, Population.selection_tournament, ga.route, ga.INTERSECTION_ENGINES)
+    sink = tmp_path / 'run.jsonl'
+    profile_file = tmp_path / 'generation.prof'
+    telemetry = Telemetry(str(sink), trace_memory=True, profile_generations=[2], profile_file=str(profile_file))
+    assert run(telemetry) == run()
+    assert (Solution.copy, Population.selection_tournament, ga.route, ga.INTERSECTION_ENGINES) == originals
+
+    records = [json.loads(line) for line in sink.read_text().splitlines()]
+    assert [record['generation'] for record in records] == [0, 1, 2, 3, 4]
+    assert all(record['memory_peak'] > 0 for record in records)
+    summary = telemetry.summary()
+    assert summary['selection_tournament']['calls'] > 0
+    assert summary['intersections']['calls'] > 0
+    for name, counter in summary.items():
+        assert sum(record['phases'][name][0] for record in records) == counter['calls']
+    assert profile_file.stat().st_size > 0
+
+
+def test_caller_tracing_kept():
+    tracemalloc.start()
+    try:
+        with Telemetry(trace_memory=True):
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    with Telemetry(trace_memory=True):
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
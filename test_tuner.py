@@ -0,0 +1,56 @@
+from lab1_genetic_algorithm import evolve, read_config
+from lab1_tuner import SEARCH_SPACE, sample_configurations, rung_budgets, run_trial, tune
+from random import Random
+import os
+import pytest
+
+CONFIGURATION = {'crossover_prob': 0.6, 'mutation_prob': 0.35, 'reroll_prob': 0.6, 'tournament_size': 4,
+                 'population_size': 20}
+
+
+def test_sample_configurations():
+    configurations = sample_configurations(10, Random(0))
+    assert len(configurations) == 10
+    assert len({tuple(configuration.values()) for configuration in configurations}) == 10
+    assert all(configuration[name] in values for configuration in configurations
+               for name, values in SEARCH_SPACE.items())
+
+
+def test_rung_budgets():
+    assert rung_budgets(5, 75, 3) == [5, 15, 45, 75]
+    assert rung_budgets(3, 27, 3) == [3, 9, 27]
+
+
+@pytest.mark.parametrize('min_generations, max_generations, eta', [(0, 75, 3), (-1, 75, 3), (5, 75, 1),
+                                                                    (5, 75, 0), (10, 5, 3)])
+def test_invalid_rung_budgets(min_generations, max_generations, eta):
+    with pytest.raises(ValueError):
+        rung_budgets(min_generations, max_generations, eta)
+
+
+def test_trial_continues_from_checkpoint(tmp_path):
+    checkpoint_file = os.path.join(tmp_path, 'trial.bin')
+    run_trial(read_config(1), CONFIGURATION, 0, 3, checkpoint_file)
+    resumed = run_trial(read_config(1), CONFIGURATION, 0, 6, checkpoint_file)
+    *_, snapshot = evolve(read_config(1), **CONFIGURATION, iteration_count=6, random_seed=0)
+    assert resumed == snapshot.best_fitness
+
+
+def test_tune():
+    space = {**{name: [value] for name, value in CONFIGURATION.items()}, 'tournament_size': [2, 4, 6, 8]}
+    ranking, cost, exhaustive_cost = tune(read_config(1), 4, 2, 4, eta=2, seeds=1, workers=1, space=space,
+                                          verbose=False)
+    assert [record['rung'] for record in ranking] == [1, 1, 0, 0]
+    assert [record['generations'] for record in ranking] == [4, 4, 2, 2]
+    assert ranking[0]['score'] <= ranking[1]['score']
+    assert ranking[2]['score'] <= ranking[3]['score']
+    assert cost == (4 * 2 + 2 * 2) * 20
+    assert exhaustive_cost == 4 * 20 * 4 * 10
+
+
+def test_default_population_size():
+    space = {'tournament_size': [2, 4]}
+    ranking, cost, exhaustive_cost = tune(read_config(1), 2, 1, 1, eta=2, seeds=1, workers=1, space=space,
+                                          verbose=False)
+    assert cost == 2 * 300
+    assert exhaustive_cost == 2 * 300 * 10
@@ -0,0 +1,54 @@
+from lab1_genetic_algorithm import Population, read_config, evolve
+from lab1_weight_sweep import components, weighted, pareto_front, sweep
+from random import seed
+import pytest
+
+
+@pytest.fixture
+def population():
+    seed(0)
+    population = Population(20)
+    population.initialize(read_config(1))
+    return population
+
+
+def test_reweigh(population):
+    for solution in population:
+        evaluated = solution.copy()
+        evaluated.calculate_fitness(2, 5, 300)
+        assert solution.reweigh(2, 5, 300) == evaluated.fitness == weighted(solution, (2, 5, 300))
+
+
+def test_population_copy(population):
+    copy = population.copy()
+    copy.reweigh(1, 0, 0)
+    assert all(solution.fitness == solution.total_length for solution in copy)
+    assert all(original.fitness != solution.fitness for original, solution in zip(population, copy))
+
+
+def test_pareto_front(population):
+    front = pareto_front(population)
+    triples = [components(solution) for solution in front]
+    assert len(set(triples)) == len(triples)
+    for solution in population:
+        triple = components(solution)
+        dominated = any(all(a <= b for a, b in zip(other, triple)) and other != triple for other in triples)
+        assert dominated or triple in triples
+    for triple in triples:
+        assert not any(all(a <= b for a, b in zip(other, triple)) and other != triple for other in triples)
+
+
+def test_initial_population(population):
+    snapshot = next(evolve(read_config(1), population_size=20, initial_population=population))
+    assert snapshot.population is population
+    assert snapshot.best_fitness == min(solution.fitness for solution in population)
+
+
+def test_sweep():
+    weight_vectors = [(1, 20, 1000), (1, 5, 1000), (2, 20, 100)]
+    report = sweep(read_config(1), weight_vectors, population_size=20, iteration_count=5)
+    assert [run['weights'] for run in report['runs']] == [list(weights) for weights in weight_vectors]
+    for run in report['runs']:
+        assert run['archive_best'] <= run['run_best']
+    assert report['pareto_front']
+    assert report['cache_hits'] > 0